@@ -0,0 +1,248 @@
+"""
+Analytics over the accumulated `py_log_*.log` files.
+
+The log files are memory-mapped and split into newline-aligned byte ranges that are parsed in parallel by a process
+pool. Every worker returns a small mergeable aggregate: per-fact counters with a fixed-size response time histogram
+(for the median and p90) and per-operation daily counters (for the trend). Memory does not depend on the corpus size.
+
+Usage: python analytics.py LOG_FILE_OR_DIRECTORY... [--format csv|json] [--output PREFIX] [--workers N]
+"""
+import argparse
+import csv
+import glob
+import json
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# '2024-01-31 10:00:00,123 INFO 7 × 8 =  56 54 False 3.21', newer logs add the first keystroke latency and the think
+# time: '... 54 False 3.214562 1.030114 2.870412'. Any other non-empty line matches without groups and is counted as
+# invalid.
+LOG_LINE = re.compile(rb'^(?:(\d{4}-\d\d-\d\d) [\d:,]+ INFO (.+?) = +(\S+) (\S+) (True|False) (\S+?)(?: \S+ \S+)?\r?'
+                      rb'|.+)$', re.MULTILINE)
+OPERATION_SIGNS = {'+': '+', '-': '-', '×': '×', '*': '×', '÷': '÷', '/': '÷'}
+
+HISTOGRAM_STEP = 0.1  # seconds
+HISTOGRAM_SIZE = 600  # buckets up to 60 seconds, slower answers are counted in `FactStatistics.overflow`
+HISTOGRAM_LIMIT = HISTOGRAM_SIZE * HISTOGRAM_STEP
+BUCKETS_PER_SECOND = round(1 / HISTOGRAM_STEP)  # `12.5 / 0.1` is 124.99999999999999, `12.5 * 10` is 125.0
+RANGE_SIZE = 64 * 2 ** 20  # bytes of a log file parsed by one job
+
+
+class FactStatistics:
+    """Answers to one fact: counters, a response time histogram and the number of answers slower than its range."""
+    __slots__ = ('answers', 'errors', 'histogram', 'overflow')
+
+    def __init__(self):
+        self.answers = 0
+        self.errors = 0
+        self.histogram = [0] * HISTOGRAM_SIZE
+        self.overflow = 0
+
+    def add(self, correct: bool, time_elapsed: float):
+        self.answers += 1
+        if not correct:
+            self.errors += 1
+        bucket = int(time_elapsed * BUCKETS_PER_SECOND)
+        if bucket < HISTOGRAM_SIZE:
+            self.histogram[max(bucket, 0)] += 1
+        else:
+            self.overflow += 1
+
+    def merge(self, other):
+        self.answers += other.answers
+        self.errors += other.errors
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        self.overflow += other.overflow
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Response time quantile, interpolated linearly inside its histogram bucket.
+        :return: Seconds, None - the quantile is slower than `HISTOGRAM_LIMIT`
+        """
+        target = q * self.answers
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            if count and seen + count >= target:
+                return round((bucket + max(target - seen, 0) / count) * HISTOGRAM_STEP, 2)
+            seen += count
+        return None if self.overflow else 0.0
+
+
+class LogAggregate:
+    """Mergeable result of parsing any number of log lines."""
+
+    def __init__(self):
+        self.facts = {}  # (operation, fact) -> FactStatistics
+        self.trend = {}  # (operation, day) -> [answers, errors, total time]
+        self.invalid_lines = 0
+
+    def add(self, day: str, fact: str, correct: bool, time_elapsed: float):
+        operation = operationOf(fact)
+        key = (operation, fact)
+        statistics = self.facts.get(key)
+        if statistics is None:
+            statistics = self.facts[key] = FactStatistics()
+        statistics.add(correct, time_elapsed)
+
+        daily = self.trend.setdefault((operation, day), [0, 0, 0.0])
+        daily[0] += 1
+        daily[1] += not correct
+        daily[2] += time_elapsed
+
+    def merge(self, other):
+        for key, statistics in other.facts.items():
+            if key in self.facts:
+                self.facts[key].merge(statistics)
+            else:
+                self.facts[key] = statistics
+        for key, (answers, errors, total_time) in other.trend.items():
+            daily = self.trend.setdefault(key, [0, 0, 0.0])
+            daily[0] += answers
+            daily[1] += errors
+            daily[2] += total_time
+        self.invalid_lines += other.invalid_lines
+        return self
+
+    def factRows(self) -> list[dict]:
+        """The quantiles slower than `HISTOGRAM_LIMIT` are reported as '>60'."""
+        rows = []
+        for (operation, fact), statistics in sorted(self.facts.items()):
+            rows.append({'operation': operation,
+                         'fact': fact,
+                         'answers': statistics.answers,
+                         'errors': statistics.errors,
+                         'error_rate': round(statistics.errors / statistics.answers, 4),
+                         'median_time': quantileText(statistics.quantile(0.5)),
+                         'p90_time': quantileText(statistics.quantile(0.9)),
+                         'over_limit': statistics.overflow,
+                         })
+        return rows
+
+    def trendRows(self) -> list[dict]:
+        rows = []
+        for (operation, day), (answers, errors, total_time) in sorted(self.trend.items()):
+            rows.append({'operation': operation,
+                         'day': day,
+                         'answers': answers,
+                         'errors': errors,
+                         'error_rate': round(errors / answers, 4),
+                         'mean_time': round(total_time / answers, 2),
+                         })
+        return rows
+
+
+def quantileText(seconds: float | None) -> float | str:
+    return f'>{HISTOGRAM_LIMIT:g}' if seconds is None else seconds
+
+
+def operationOf(fact: str) -> str:
+    for character in fact.lstrip('-'):
+        if character in OPERATION_SIGNS:
+            return OPERATION_SIGNS[character]
+    return '?'
+
+
+def parseRange(path: str, start: int, end: int) -> LogAggregate:
+    """Parse the lines of a log file that start in the byte range [start, end) (runs in a worker process)."""
+    aggregate = LogAggregate()
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return aggregate
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if start > 0:  # the line crossing `start` belongs to the previous range
+                start = data.find(b'\n', start - 1) + 1 or end
+            if end < len(data):
+                end = data.find(b'\n', end - 1) + 1 or len(data)
+            for match in LOG_LINE.finditer(data, start, end):
+                day, fact, _, _, correct, time_elapsed = match.groups()
+                if day is None:
+                    aggregate.invalid_lines += 1
+                    continue
+                try:
+                    aggregate.add(day.decode(), fact.decode('utf-8').replace('*', '×').replace('/', '÷'),
+                                  correct == b'True', float(time_elapsed))
+                except ValueError:
+                    aggregate.invalid_lines += 1
+    return aggregate
+
+
+def findLogFiles(paths: list[str]) -> list[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '**', 'py_log_*.log'), recursive=True)))
+        else:
+            files.append(path)
+    return files
+
+
+def splitRanges(files: list[str], range_size=RANGE_SIZE):
+    for path in files:
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), range_size):
+            yield path, start, min(start + range_size, size)
+
+
+def analyze(paths: list[str], workers=None) -> LogAggregate:
+    """
+    Aggregate all log files.
+    :param paths: Log files and/or directories (searched recursively for `py_log_*.log`)
+    :param workers: Number of worker processes, None - number of CPUs
+    :return: LogAggregate
+    """
+    jobs = list(splitRanges(findLogFiles(paths)))
+    aggregate = LogAggregate()
+    if not jobs:
+        return aggregate
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(parseRange, *zip(*jobs), chunksize=max(1, len(jobs) // 256)):
+            aggregate.merge(partial)
+    return aggregate
+
+
+def writeReport(aggregate: LogAggregate, output_format: str, output: str | None):
+    """
+    :param output_format: 'csv' or 'json'
+    :param output: Output file prefix ('<prefix>_facts.csv' and '<prefix>_trend.csv' for CSV, '<prefix>.json' for
+    JSON), None - print to stdout
+    """
+    facts, trend = aggregate.factRows(), aggregate.trendRows()
+    if output_format == 'json':
+        report = json.dumps({'facts': facts, 'trend': trend, 'invalid_lines': aggregate.invalid_lines},
+                            ensure_ascii=False, indent=1)
+        if output is None:
+            print(report)
+        else:
+            with open(f'{output}.json', 'w', encoding='utf-8') as file:
+                file.write(report)
+        return
+
+    for name, rows in (('facts', facts), ('trend', trend)):
+        if not rows:
+            continue
+        if output is None:
+            file = sys.stdout
+        else:
+            file = open(f'{output}_{name}.csv', 'w', encoding='utf-8', newline='')
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        if file is not sys.stdout:
+            file.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Per-fact statistics over py_log_*.log files.')
+    parser.add_argument('paths', nargs='+', help='log files or directories')
+    parser.add_argument('--format', choices=('csv', 'json'), default='csv')
+    parser.add_argument('--output', default=None, help='output file prefix, default - stdout')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, default - number of CPUs')
+    args = parser.parse_args(argv)
+    writeReport(analyze(args.paths, args.workers), args.format, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Non-blocking logging of the exam answers.
+
+The calling (GUI) thread only puts the unformatted `LogRecord` into a queue. A background thread formats the records,
+writes them to the log file in batches and flushes the file once per batch.
+"""
+import logging
+import queue
+import threading
+
+from instrumentation import timed
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(message)s'
+
+_STOP = object()
+
+
+class DeferredQueueHandler(logging.Handler):
+    """
+    Handler that only queues the records and leaves all formatting to the writer thread. Like
+    `logging.handlers.QueueHandler` without `prepare()`; `logging.handlers` is not imported because it costs about
+    a third of the startup of `drill.py` (socket, pickle).
+    """
+
+    def __init__(self, pipeline):
+        super().__init__()
+        self.pipeline = pipeline
+
+    def emit(self, record):
+        # The log arguments are immutable values, so the record can be formatted later in the writer thread
+        self.pipeline.queue.put(record)
+
+    def flush(self):
+        self.pipeline.flush()
+
+
+class AnswerLogPipeline:
+    """Queue + background writer thread that appends log records to a file."""
+
+    def __init__(self, filename: str, log_format=LOG_FORMAT, batch_size=256):
+        """
+        :param filename: Log file, it is overwritten
+        :param log_format: `logging.Formatter` format string
+        :param batch_size: Maximum number of records written with one `write()`
+        """
+        self.filename = filename
+        self.formatter = logging.Formatter(log_format)
+        self.batch_size = batch_size
+        self.queue = queue.SimpleQueue()
+        self.handler = DeferredQueueHandler(self)
+        self._file = open(filename, 'w', encoding='utf-8')
+        self._thread = threading.Thread(target=self._run, name='answer-log-writer', daemon=True)
+
+    def start(self, level=logging.DEBUG):
+        """Start the writer thread and attach the pipeline to the root logger."""
+        self._thread.start()
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(self.handler)
+        return self
+
+    def flush(self, timeout=5.0):
+        """Block until every record queued so far is written to disk."""
+        if not self._thread.is_alive():
+            return
+        written = threading.Event()
+        self.queue.put(written)
+        written.wait(timeout)
+
+    def stop(self):
+        """Detach from the root logger, write the remaining records and close the file."""
+        logging.getLogger().removeHandler(self.handler)
+        if self._thread.is_alive():
+            self.queue.put(_STOP)
+            self._thread.join()
+        self._file.close()
+
+    @timed('AnswerLogPipeline.write')
+    def _write(self, lines: list[str]):
+        self._file.write(''.join(lines))
+        self._file.flush()
+
+    def _run(self):
+        while True:
+            items = [self.queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines, events, stop = [], [], False
+            for item in items:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    events.append(item)
+                else:
+                    lines.append(self.formatter.format(item) + '\n')
+            if lines:
+                self._write(lines)
+            for event in events:
+                event.set()
+            if stop:
+                return
+
+
+def flushLogs():
+    """Flush all handlers of the root logger (waits for the background writer)."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
@@ -0,0 +1,62 @@
+"""
+Startup benchmark of the terminal drill: time from process start to the first task prompt of `drill.py` (with the
+answer log), compared with the time to the first paint of the GUI, and the slowest imports of drill.py.
+
+Usage: python bench_drill.py [--runs 10] [--top-imports 10] [--no-gui]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_startup import CODE_DIRECTORY, importTimes, timeToFirstPaint
+
+DRILL = os.path.join(CODE_DIRECTORY, 'drill.py')
+PROMPT_END = b'= '
+
+
+def timeToFirstPrompt(runs: int) -> list[float]:
+    """ms from spawning `drill.py` to the first task prompt on its stdout, the drill is ended by closing its stdin."""
+    times = []
+    with tempfile.TemporaryDirectory() as directory:  # the py_log_*.log files
+        for _ in range(runs):
+            start = time.perf_counter()
+            process = subprocess.Popen([sys.executable, DRILL, 'multiplication'], cwd=directory,
+                                       stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            output = b''
+            while not output.endswith(PROMPT_END):
+                chunk = process.stdout.read1(4096)
+                if not chunk:
+                    raise RuntimeError(f'drill.py exited without a prompt: {output!r}')
+                output += chunk
+            times.append((time.perf_counter() - start) * 1000)
+            process.communicate()
+    return times
+
+
+def summary(times: list[float]) -> str:
+    return f'median {statistics.median(times):.1f}  min {min(times):.1f}  max {max(times):.1f}  ({len(times)} runs)'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Startup time of drill.py and of the GUI')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top-imports', type=int, default=10)
+    parser.add_argument('--no-gui', action='store_true', help='do not measure the GUI (e.g. PySide6 is missing)')
+    args = parser.parse_args(argv)
+
+    print(f'drill.py, time to first prompt, ms:  {summary(timeToFirstPrompt(args.runs))}')
+    if not args.no_gui:
+        print(f'gui.py, time to first paint, ms:     {summary(timeToFirstPaint(args.runs))}')
+
+    print('\nslowest imports of drill.py (python -X importtime):')
+    print(f'{"cumulative ms":>14} {"self ms":>8}  module')
+    for cumulative, own, name in importTimes('drill')[:args.top_imports]:
+        print(f'{cumulative / 1000:>14.1f} {own / 1000:>8.1f}  {name}')
+
+
+if __name__ == '__main__':
+    main()
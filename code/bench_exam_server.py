@@ -0,0 +1,107 @@
+"""
+Load test of the exam server: many concurrent clients pass full exams, the round-trip latency of every answer
+is measured and reported as percentiles.
+
+Usage: python bench_exam_server.py [--clients 1000] [--operation multiplication] [--host H --port P]
+Without --port a server subprocess is started on a free port.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from task import Task
+
+
+def solveDisplayed(task_text: str):
+    """Solve a task received from the server, e.g. '7 × 8 = '."""
+    return Task(task_text.rstrip(' =').replace('×', '*').replace('÷', '/').replace(',', '.')).solve()
+
+
+async def runClient(host: str, port: int, operation: str, error_rate: float, latencies: list):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def request(message: dict) -> dict:
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    response = await request({'command': 'start', 'operation': operation})
+    while not response.get('finished'):
+        answer = solveDisplayed(response['task'])
+        if random.random() < error_rate:
+            answer += 1
+        start = time.perf_counter_ns()
+        response = await request({'command': 'answer', 'value': answer})
+        latencies.append(time.perf_counter_ns() - start)
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+    writer.close()
+    await writer.wait_closed()
+
+
+async def loadTest(host: str, port: int, clients: int, operation: str, error_rate: float):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(runClient(host, port, operation, error_rate, latencies) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = [latency / 1e6 for latency in latencies]
+    percentiles = statistics.quantiles(latencies_ms, n=100, method='inclusive')
+    print(f'{clients:,} concurrent sessions, {len(latencies):,} answers in {elapsed:.2f} s '
+          f'({len(latencies) / elapsed:,.0f} answers/s)')
+    print(f'round-trip latency, ms: p50 {percentiles[49]:.3f}  p90 {percentiles[89]:.3f}  '
+          f'p99 {percentiles[98]:.3f}  max {max(latencies_ms):.3f}')
+
+
+def freePort() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def waitForServer(host: str, port: int, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test of exam_server.py')
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--operation', default='multiplication')
+    parser.add_argument('--error-rate', type=float, default=0.1)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help='existing server port, default - start a server')
+    args = parser.parse_args(argv)
+
+    server = None
+    port = args.port
+    if port is None:
+        port = freePort()
+        server_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exam_server.py')
+        server = subprocess.Popen([sys.executable, server_script, '--host', args.host, '--port', str(port)])
+    try:
+        asyncio.run(waitForServer(args.host, port))
+        asyncio.run(loadTest(args.host, port, args.clients, args.operation, args.error_rate))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
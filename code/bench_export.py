@@ -0,0 +1,26 @@
+"""
+Throughput benchmark of the bulk worksheet export.
+
+Usage: python bench_export.py [number_of_worksheets] [workers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from export import export, FORMATS
+
+
+def main(count=10_000, workers=None):
+    with tempfile.TemporaryDirectory() as output:
+        for formats in [(format_name,) for format_name in FORMATS] + [FORMATS]:
+            start = time.perf_counter()
+            paths = export('multiplication', count, output, formats=formats, workers=workers)
+            elapsed = time.perf_counter() - start
+            size = sum(os.path.getsize(path) for path in paths)
+            print(f'{"+".join(formats):<14} {count:,} worksheets in {elapsed:6.2f} s '
+                  f'({count / elapsed:>8,.0f} worksheets/s, {size / 2 ** 20:7.1f} MiB)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,96 @@
+"""
+Benchmark of `GenerateTasks.expressions` against a naive generate-and-filter generator.
+
+The naive generator writes every expression tree (all operand tuples, operation tuples and bracketings) with full
+brackets, parses it as a `Task` and checks the constraints on every node of the parsed tree. Both generators must
+give the same set of expressions, this is verified before the timings are printed.
+
+Usage: python bench_expressions.py [--operand-count 3] [--max-operand 10] [--max-result 100]
+"""
+import argparse
+import itertools
+import time
+
+from expression import OPERATORS
+from generate import GenerateTasks, PRECEDENCE, ATOM_PRECEDENCE
+from task import Task
+
+
+def bracketings(operands: list[str], operations: list[str]):
+    """Every fully bracketed expression of the operands and operations in the given order."""
+    if len(operands) == 1:
+        yield operands[0]
+        return
+    for split in range(1, len(operands)):
+        for left in bracketings(operands[:split], operations[:split - 1]):
+            for right in bracketings(operands[split:], operations[split:]):
+                yield f'({left} {operations[split - 1]} {right})'
+
+
+def checkedValue(node, low, high, top=True):
+    """Value of the parsed tree node if every intermediate result is a non-negative integer, otherwise None."""
+    if type(node) is not tuple:
+        return node
+    left, right = checkedValue(node[1], low, high, False), checkedValue(node[2], low, high, False)
+    if left is None or right is None or (node[0] == '/' and right == 0):
+        return None
+    value = OPERATORS[node[0]](left, right)
+    if value < 0 or value != int(value) or (top and not low <= value <= high):
+        return None
+    return int(value)
+
+
+def minimalString(node) -> tuple[str, int]:
+    """(string with the brackets `GenerateTasks.expressions` writes, precedence of the last operation)"""
+    if type(node) is not tuple:
+        return str(node), ATOM_PRECEDENCE
+    operation = node[0]
+    precedence = PRECEDENCE[operation]
+    (left, left_precedence), (right, right_precedence) = minimalString(node[1]), minimalString(node[2])
+    if left_precedence < precedence:
+        left = f'({left})'
+    if right_precedence < precedence or (right_precedence == precedence and operation in '-/'):
+        right = f'({right})'
+    return f'{left} {operation} {right}', precedence
+
+
+def naiveExpressions(operands, operand_count, operations, min_result, max_result) -> set[str]:
+    found = set()
+    for values in itertools.product([str(operand) for operand in operands], repeat=operand_count):
+        for chosen_operations in itertools.product(operations, repeat=operand_count - 1):
+            for string in bracketings(list(values), list(chosen_operations)):
+                tree = Task(string).expression.tree
+                if checkedValue(tree, min_result, max_result) is not None:
+                    found.add(minimalString(tree)[0])
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pruned expression generator vs generate-and-filter')
+    parser.add_argument('--operand-count', type=int, default=3)
+    parser.add_argument('--max-operand', type=int, default=10)
+    parser.add_argument('--max-result', type=int, default=100)
+    args = parser.parse_args(argv)
+    operands = list(range(1, args.max_operand + 1))
+
+    start = time.perf_counter()
+    tasks = GenerateTasks().expressions(operands, args.operand_count, max_result=args.max_result, shuffle=False)
+    pruned_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive = naiveExpressions(operands, args.operand_count, '+-*/', 0, args.max_result)
+    naive_time = time.perf_counter() - start
+
+    pruned = {task.task_string for task in tasks}
+    if pruned != naive or len(pruned) != len(tasks):
+        raise AssertionError(f'Different expressions: {len(pruned)} unique of {len(tasks)} pruned, {len(naive)} naive')
+
+    print(f'{len(tasks)} expressions of {args.operand_count} operands 1..{args.max_operand}, '
+          f'results 0..{args.max_result}')
+    for name, seconds in (('pruned', pruned_time), ('generate-and-filter', naive_time)):
+        print(f'{name:<20} {seconds:>8.3f} s {len(tasks) / seconds:>12,.0f} expressions/s')
+    print(f'speedup x{naive_time / pruned_time:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+End-to-end latency harness of the exam flow, running the real gui.py windows on the Qt offscreen platform.
+
+Scripted exams start with `MainWindow.startTheTest`, the answers are typed into the spin box and confirmed with Enter
+(`ExamWindow.keyPressEvent`), then `ResultsWindow` is closed. Measured:
+- Enter -> the next task label painted, and the number of layout passes of the exam window per task switch
+  (with the fixed label sizes a switch should only repaint),
+- the last Enter -> `ResultsWindow` painted,
+- peak memory (Python allocations and the process maximum resident set size).
+
+Usage: python bench_gui.py [--exams 5] [--operation multiplication] [--error-rate 0.1] [--pixmap-labels]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import QObject, QEvent, Qt  # noqa: E402
+from PySide6.QtTest import QTest  # noqa: E402
+from PySide6.QtWidgets import QApplication, QWidget  # noqa: E402
+
+import gui  # noqa: E402
+
+START_LABELS = {'sum': '? + ? = ', 'difference': '? - ? = ', 'multiplication': '? × ? = ', 'division': '? ÷ ? = '}
+PAINT_TIMEOUT = 5.0  # seconds
+
+
+class PaintWatcher(QObject):
+    """Remembers when the watched widget (or a widget accepted by `accept`) was painted last."""
+
+    def __init__(self, accept=None):
+        super().__init__()
+        self.accept = accept
+        self.painted_ns = None
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and (self.accept is None or self.accept(watched)):
+            self.painted_ns = time.perf_counter_ns()
+        return False
+
+    def waitForPaint(self, app: QApplication) -> int:
+        deadline = time.perf_counter() + PAINT_TIMEOUT
+        while self.painted_ns is None:
+            app.processEvents()
+            if time.perf_counter() > deadline:
+                raise TimeoutError('The widget was not painted')
+        return self.painted_ns
+
+
+class EventCounter(QObject):
+    """Counts the events of one type received by the watched object."""
+
+    def __init__(self, event_type: QEvent.Type):
+        super().__init__()
+        self.event_type = event_type
+        self.count = 0
+
+    def eventFilter(self, watched, event):
+        if event.type() == self.event_type:
+            self.count += 1
+        return False
+
+
+def percentiles(values_ms: list[float]) -> str:
+    if len(values_ms) < 2:
+        return f'n={len(values_ms)}  value {values_ms[0]:.2f}' if values_ms else 'n=0'
+    quantiles = statistics.quantiles(values_ms, n=100, method='inclusive')
+    return (f'n={len(values_ms)}  p50 {quantiles[49]:.2f}  p90 {quantiles[89]:.2f}  p99 {quantiles[98]:.2f}  '
+            f'max {max(values_ms):.2f}')
+
+
+def runExam(app: QApplication, window: gui.MainWindow, operation: str, error_rate: float, rng: random.Random):
+    """
+    :return: (list of Enter -> next task painted latencies in ms, last Enter -> results painted latency in ms,
+    layout passes of the exam window during the task switches)
+    """
+    window.startTheTest(operation, START_LABELS[operation], None)
+    exam_window = window.exam_window
+    app.processEvents()
+
+    task_latencies = []
+    label_watcher = PaintWatcher()
+    exam_window.task_label.installEventFilter(label_watcher)
+    layout_counter = EventCounter(QEvent.LayoutRequest)
+    exam_window.installEventFilter(layout_counter)
+
+    QTest.keyClick(exam_window.answer, Qt.Key_Return)  # the first Enter starts the exam
+    label_watcher.painted_ns = None
+    label_watcher.waitForPaint(app)
+    layout_counter.count = 0
+
+    while True:
+        task = exam_window.current_task
+        answer = task.solve() + (1 if rng.random() < error_rate else 0)
+        QTest.keyClicks(exam_window.answer, str(answer))
+        last_task = exam_window.current_task_number + 1 == exam_window.session.total
+
+        label_watcher.painted_ns = None
+        start = time.perf_counter_ns()
+        if last_task:
+            break
+        QTest.keyClick(exam_window.answer, Qt.Key_Return)
+        task_latencies.append((label_watcher.waitForPaint(app) - start) / 1e6)
+    exam_window.removeEventFilter(layout_counter)
+
+    # `ResultsWindow` does not exist before the last Enter, so paint events of the whole application are watched
+    results_watcher = PaintWatcher(accept=lambda widget: isinstance(widget, QWidget) and
+                                   isinstance(widget.window(), gui.ResultsWindow))
+    app.installEventFilter(results_watcher)
+    start = time.perf_counter_ns()
+    QTest.keyClick(exam_window.answer, Qt.Key_Return)
+    results_latency = (results_watcher.waitForPaint(app) - start) / 1e6
+    app.removeEventFilter(results_watcher)
+
+    exam_window.results_window.close()
+    app.processEvents()
+    return task_latencies, results_latency, layout_counter.count
+
+
+def maxRss() -> float:
+    """Maximum resident set size of the process in MiB (0 if unknown on this platform)."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2 ** 20 if sys.platform == 'darwin' else rss / 2 ** 10
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Offscreen end-to-end latency of the exam flow')
+    parser.add_argument('--exams', type=int, default=5)
+    parser.add_argument('--operation', choices=list(START_LABELS), default='multiplication')
+    parser.add_argument('--error-rate', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--pixmap-labels', action='store_true', help='pre-rendered task label pixmaps')
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication([])
+    tracemalloc.start()
+    window = gui.MainWindow(pixmap_labels=args.pixmap_labels)
+    window.show()
+    app.processEvents()
+
+    rng = random.Random(args.seed)
+    task_latencies, results_latencies, layout_passes = [], [], 0
+    for _ in range(args.exams):
+        latencies, results_latency, layouts = runExam(app, window, args.operation, args.error_rate, rng)
+        task_latencies += latencies
+        results_latencies.append(results_latency)
+        layout_passes += layouts
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    labels = 'pixmap' if args.pixmap_labels else 'text'
+    print(f'{args.exams} exams ({args.operation}, {labels} labels), Qt platform: {app.platformName()}')
+    print(f'Enter -> next task painted, ms:  {percentiles(task_latencies)}')
+    print(f'layout passes per task switch:   {layout_passes / max(len(task_latencies), 1):.2f}')
+    print(f'Enter -> results painted, ms:    {percentiles(results_latencies)}')
+    print(f'peak memory: Python {peak / 2 ** 20:.1f} MiB, process max RSS {maxRss():.1f} MiB')
+    window.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark of `LearnerStore`: insert throughput with one transaction per exam and with one transaction per answer,
+then the latency of the history queries on the filled database.
+
+Usage: python bench_learner_store.py [--rows 1000000] [--learners 10] [--path bench_learner.db]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from generate import generatePool
+from learner_store import LearnerStore
+
+DAY = 24 * 60 * 60
+
+
+def answeredPool(rng: random.Random) -> list:
+    tasks = generatePool('multiplication', rng=rng)
+    for task in tasks:
+        task.user_answer = task.solve() + (rng.random() < 0.1)
+        task.time_elapsed = rng.lognormvariate(1, 0.6)
+    return tasks
+
+
+def fill(stores: list[LearnerStore], rows: int, rng: random.Random) -> float:
+    """Insert `rows` answers, one `recordAnswers` call per exam. :return: seconds"""
+    tasks = answeredPool(rng)
+    start_time = time.time() - rows / len(tasks) * DAY / 10  # about ten exams a day
+    seconds = 0.0
+    for exam in range(rows // len(tasks)):
+        answers = [(task, start_time + exam * DAY / 10 + number) for number, task in enumerate(tasks)]
+        store = stores[exam % len(stores)]
+        start = time.perf_counter()
+        store.recordAnswers(answers)
+        seconds += time.perf_counter() - start
+    return seconds
+
+
+def rowByRow(store: LearnerStore, rows: int, rng: random.Random) -> float:
+    """Insert `rows` answers with one transaction per answer. :return: seconds"""
+    tasks = answeredPool(rng)
+    start = time.perf_counter()
+    for number in range(rows):
+        store.recordAnswers([(tasks[number % len(tasks)], time.time())])
+    return time.perf_counter() - start
+
+
+def queryLatencies(store: LearnerStore, repeat=20) -> dict:
+    """{query: median ms}"""
+    facts = list(store.factStatistics())
+    days = [day for day, *_ in store.dailySummary()]
+    queries = {'factStatistics()': store.factStatistics,
+               'factHistory(fact)': lambda: store.factHistory(random.choice(facts)),
+               'dailySummary(last 30 days)': lambda: store.dailySummary(days[-30]),
+               'dailySummary(all)': store.dailySummary,
+               'weakFacts()': store.weakFacts,
+               }
+    latencies = {}
+    for name, query in queries.items():
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            times.append((time.perf_counter() - start) * 1000)
+        latencies[name] = statistics.median(times)
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='LearnerStore insert and query benchmark')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--learners', type=int, default=10)
+    parser.add_argument('--path', help='database file (default: a temporary file)')
+    args = parser.parse_args(argv)
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.path or os.path.join(directory, 'bench_learner.db')
+        stores = [LearnerStore(path, f'learner {number}') for number in range(args.learners)]
+        seconds = fill(stores, args.rows, rng)
+        print(f'batched inserts (one transaction per exam): {args.rows / seconds:>12,.0f} rows/s '
+              f'({args.rows:,} rows, {args.learners} learners)')
+
+        single_rows = min(args.rows, 2_000)
+        single_store = LearnerStore(os.path.join(directory, 'row_by_row.db'))
+        single_rate = single_rows / rowByRow(single_store, single_rows, rng)
+        print(f'row-by-row inserts (one transaction per answer): {single_rate:>7,.0f} rows/s ({single_rows:,} rows)')
+        single_store.close()
+
+        print(f'\nquery latency of one learner ({args.rows // args.learners:,} rows), median ms:')
+        for name, milliseconds in queryLatencies(stores[0]).items():
+            print(f'  {name:<28} {milliseconds:>9.2f}')
+        print(f'database size: {os.path.getsize(path) / 2 ** 20:.1f} MiB')
+        for store in stores:
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Cost of logging one answer on the calling (GUI) thread: synchronous `logging.FileHandler` (the old
+`basicConfig` setup) versus the queue-based `AnswerLogPipeline`.
+
+Usage: python bench_logging.py [number_of_answers]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from answer_log import AnswerLogPipeline, LOG_FORMAT
+from exam import ExamSession
+from generate import generatePool
+
+
+def answerAll(answers: int) -> list[int]:
+    """Pass exams until `answers` answers are given, return the duration of every `ExamSession.answer` call."""
+    durations = []
+    while len(durations) < answers:
+        session = ExamSession(generatePool('multiplication'))
+        task = session.start()
+        while task is not None and len(durations) < answers:
+            start = time.perf_counter_ns()
+            task = session.answer(task.solve())
+            durations.append(time.perf_counter_ns() - start)
+    return durations
+
+
+def report(name: str, durations: list[int]):
+    durations = sorted(durations)
+    mean = sum(durations) / len(durations) / 1000
+    p99 = durations[int(len(durations) * 0.99)] / 1000
+    print(f'{name:<26} mean {mean:8.2f} µs   p99 {p99:8.2f} µs   max {durations[-1] / 1000:8.2f} µs')
+
+
+def main(answers=20_000):
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG)
+    with tempfile.TemporaryDirectory() as directory:
+        null_handler = logging.NullHandler()
+        root.addHandler(null_handler)
+        report('no log file', answerAll(answers))
+        root.removeHandler(null_handler)
+
+        handler = logging.FileHandler(os.path.join(directory, 'sync.log'), mode='w', encoding='utf-8')
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+        report('FileHandler (sync)', answerAll(answers))
+        root.removeHandler(handler)
+        handler.close()
+
+        pipeline = AnswerLogPipeline(os.path.join(directory, 'queue.log')).start()
+        durations = answerAll(answers)
+        start = time.perf_counter()
+        pipeline.stop()
+        report('AnswerLogPipeline (queue)', durations)
+        print(f'background writer drained the rest in {(time.perf_counter() - start) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
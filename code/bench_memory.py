@@ -0,0 +1,46 @@
+"""
+Memory benchmark: bytes used per 100k tasks by a list of `Task` objects and by a `TaskPool`.
+
+Usage: python bench_memory.py [number_of_tasks]
+"""
+import sys
+import tracemalloc
+
+from task import Task
+from task_pool import TaskPool
+
+
+def measure(build):
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del result
+    return used
+
+
+def build_tasks(count):
+    side = int(count ** 0.5) + 1
+    pairs = ((a, b) for a in range(1, side + 1) for b in range(1, side + 1))
+    return [Task(f'{a} * {b}') for a, b in (next(pairs) for _ in range(count))]
+
+
+def build_pool(count):
+    side = int(count ** 0.5) + 1
+    pairs = ((a, b) for a in range(1, side + 1) for b in range(1, side + 1))
+    pool = TaskPool()
+    for a, b in (next(pairs) for _ in range(count)):
+        pool.append(a, '*', b)
+    return pool
+
+
+def main(count=100_000):
+    for name, build in (('list[Task]', build_tasks), ('TaskPool', build_pool)):
+        used = measure(lambda: build(count))
+        print(f'{name:<12} {used / count * 100_000 / 2 ** 20:>8.2f} MiB per 100k tasks '
+              f'({used / count:>6.1f} bytes per task)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
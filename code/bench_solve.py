@@ -0,0 +1,49 @@
+"""
+Microbenchmark of `Task.solve()` and `Task.isCorrect()` throughput.
+
+The "before" numbers come from the previous implementation (validation + `eval()` on every call),
+the "after" numbers from the parsed and memoized `Task`.
+
+Usage: python bench_solve.py [repeats]
+"""
+import string
+import sys
+import timeit
+
+from generate import GenerateTasks
+
+ALLOWED_CHARACTERS = string.digits + '+-*/() ' + '.,'
+
+
+def legacy_solve(task_string):
+    unallowed_characters = [task_sub_str for task_sub_str in task_string if task_sub_str not in ALLOWED_CHARACTERS]
+    assert unallowed_characters == [], f'The task contain unallowed characters: {unallowed_characters}'
+    result = eval(task_string)
+    if float(result) == int(result):
+        return int(result)
+    return result
+
+
+def legacy_is_correct(task_string, user_answer):
+    return user_answer == legacy_solve(task_string)
+
+
+def main(repeats=5):
+    tasks = GenerateTasks().multiplication(list(range(2, 10)), shuffle=False)
+    for task in tasks:
+        task.user_answer = task.solve()
+    calls = len(tasks)
+
+    cases = {'solve (before)': lambda: [legacy_solve(task.task_string) for task in tasks],
+             'solve (after)': lambda: [task.solve() for task in tasks],
+             'isCorrect (before)': lambda: [legacy_is_correct(task.task_string, task.user_answer) for task in tasks],
+             'isCorrect (after)': lambda: [task.isCorrect() for task in tasks],
+             }
+
+    for name, function in cases.items():
+        best = min(timeit.repeat(function, number=100, repeat=repeats)) / 100
+        print(f'{name:<20} {calls / best:>14,.0f} calls/s')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
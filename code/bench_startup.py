@@ -0,0 +1,87 @@
+"""
+Startup benchmark of the GUI: time from process start to the first paint of `MainWindow`, and the slowest imports
+reported by `python -X importtime`.
+
+Usage: python bench_startup.py [runs] [top_imports]
+Set QT_QPA_PLATFORM=offscreen to run it on a machine without a display (the default if DISPLAY is not set).
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+CODE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# Runs in a fresh interpreter: `START_NS` is the wall clock time just before the process was spawned
+FIRST_PAINT_SCRIPT = '''
+import os, sys, time
+start_ns = int(os.environ['START_NS'])
+from PySide6.QtCore import QObject, QEvent, QTimer
+from PySide6.QtWidgets import QApplication
+import gui
+
+class FirstPaint(QObject):
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            print((time.time_ns() - start_ns) / 1e6, flush=True)
+            QTimer.singleShot(0, QApplication.instance().quit)
+            watched.removeEventFilter(self)
+        return False
+
+app = QApplication([])
+window = gui.MainWindow()
+first_paint = FirstPaint()
+window.installEventFilter(first_paint)
+window.show()
+app.exec()
+'''
+
+
+def childEnvironment() -> dict:
+    environment = dict(os.environ)
+    if 'DISPLAY' not in environment and 'WAYLAND_DISPLAY' not in environment and sys.platform.startswith('linux'):
+        environment.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return environment
+
+
+def timeToFirstPaint(runs: int) -> list[float]:
+    times = []
+    for _ in range(runs):
+        environment = childEnvironment()
+        environment['START_NS'] = str(time.time_ns())
+        output = subprocess.run([sys.executable, '-c', FIRST_PAINT_SCRIPT], cwd=CODE_DIRECTORY, env=environment,
+                                capture_output=True, text=True, check=True).stdout
+        times.append(float(output.split()[0]))
+    return times
+
+
+def importTimes(module='gui') -> list[tuple[int, int, str]]:
+    """
+    :return: [(cumulative µs, self µs, module name)] of every import, the slowest first
+    """
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=CODE_DIRECTORY,
+                            env=childEnvironment(), capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)', line)
+        if match:
+            rows.append((int(match.group(2)), int(match.group(1)), match.group(3)[1:] + match.group(4)))
+    rows.sort(reverse=True)
+    return rows
+
+
+def main(runs=5, top_imports=15):
+    times = timeToFirstPaint(runs)
+    print(f'time to first paint, ms: median {statistics.median(times):.1f}  min {min(times):.1f}  '
+          f'max {max(times):.1f}  ({runs} runs)')
+
+    print('\nslowest imports of gui.py (python -X importtime):')
+    print(f'{"cumulative ms":>14} {"self ms":>8}  module')
+    for cumulative, own, name in importTimes()[:top_imports]:
+        print(f'{cumulative / 1000:>14.1f} {own / 1000:>8.1f}  {name}')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,35 @@
+"""
+Benchmark of batch generation and grading: `GenerateTasks` + per-task `isCorrect()` versus `TaskArray`.
+
+Usage: python bench_task_array.py [max_operand]
+"""
+import sys
+import time
+
+from generate import GenerateTasks
+from task_array import TaskArray
+
+
+def main(max_operand=300):
+    values = list(range(1, max_operand + 1))
+
+    start = time.perf_counter()
+    tasks = GenerateTasks().multiplication(values)
+    for task in tasks:
+        task.user_answer = task.solve()
+    correct = sum(task.isCorrect() for task in tasks)
+    objects_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    task_array = TaskArray.multiplication(values)
+    vectorized_correct = int(task_array.grade(task_array.answers()).sum())
+    vectorized_time = time.perf_counter() - start
+
+    assert correct == vectorized_correct == len(tasks)
+    print(f'{len(tasks):,} tasks generated and graded')
+    print(f'GenerateTasks + Task.isCorrect {objects_time:8.3f} s')
+    print(f'TaskArray                      {vectorized_time:8.3f} s')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,168 @@
+"""
+Microbenchmark suite for the hot paths of generate.py and task.py.
+
+    python benchmark.py run [--output results.json] [--quick]
+    python benchmark.py compare baseline.json results.json [--threshold 0.10]
+
+`run` prints a table and optionally saves it as JSON. Generators are measured for several range sizes, both the time
+and the peak memory, which gives the scaling curves. `compare` prints the relative change of every benchmark and exits
+with code 1 if any of them got slower than the threshold.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+
+from generate import GenerateTasks
+from task import Task
+
+RANGE_SIZES = (10, 30, 100, 300)
+QUICK_RANGE_SIZES = (10, 30)
+
+
+def _values(size: int) -> list[int]:
+    return list(range(1, size + 1))
+
+
+def _answeredTasks(size: int) -> list[Task]:
+    tasks = GenerateTasks().multiplication(_values(size))
+    for task in tasks:
+        task.user_answer = task.solve()
+    return tasks
+
+
+def benchmarkCases(range_sizes):
+    """
+    :return: [(benchmark name, range size or None, function to measure)]
+    """
+    generate = GenerateTasks()
+    cases = []
+    for size in range_sizes:
+        values = _values(size)
+        cases += [('GenerateTasks.sum', size, lambda values=values: generate.sum(values, shuffle=False)),
+                  ('GenerateTasks.difference', size, lambda values=values: generate.difference(values, shuffle=False)),
+                  ('GenerateTasks.multiplication', size,
+                   lambda values=values: generate.multiplication(values, shuffle=False)),
+                  ('GenerateTasks.division', size, lambda values=values: generate.division(values, shuffle=False)),
+                  ('GenerateTasks._generate_uniq_permutations', size,
+                   lambda values=values: GenerateTasks._generate_uniq_permutations(values, values)),
+                  ]
+
+    tasks = _answeredTasks(30)
+    strings = [task.task_string for task in tasks]
+    shuffled = tasks.copy()
+    random.Random(0).shuffle(shuffled)
+    cases += [('Task() + solve', len(tasks), lambda: [Task(string).solve() for string in strings]),
+              ('Task.solve', len(tasks), lambda: [task.solve() for task in tasks]),
+              ('Task.isCorrect', len(tasks), lambda: [task.isCorrect() for task in tasks]),
+              ('Task.__str__', len(tasks), lambda: [str(task) for task in tasks]),
+              ('Task.__lt__ sort', len(tasks), lambda: sorted(shuffled)),
+              ('GenerateTasks.russian_syllables', None, lambda: generate.russian_syllables(shuffle=False)),
+              ]
+    return cases
+
+
+def measureTime(function, min_time=0.2, repeat=5) -> float:
+    """Best time of one call in seconds."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def measurePeakMemory(function) -> int:
+    """Peak memory allocated during one call in bytes."""
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run(range_sizes=RANGE_SIZES, min_time=0.2) -> dict:
+    results = {}
+    for name, size, function in benchmarkCases(range_sizes):
+        key = name if size is None else f'{name}[{size}]'
+        results[key] = {'name': name,
+                        'size': size,
+                        'seconds': measureTime(function, min_time),
+                        'peak_bytes': measurePeakMemory(function),
+                        }
+        print(f'{key:<48} {results[key]["seconds"] * 1e6:>12.1f} µs {results[key]["peak_bytes"] / 1024:>10.1f} KiB',
+              flush=True)
+    return {'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'results': results,
+            }
+
+
+def printScaling(report: dict):
+    """Time and memory growth of every benchmark measured for several range sizes."""
+    curves = {}
+    for result in report['results'].values():
+        if result['size'] is not None and result['name'].startswith('GenerateTasks'):
+            curves.setdefault(result['name'], []).append(result)
+    for name, points in curves.items():
+        if len(points) < 2:
+            continue
+        print(f'\n{name}')
+        first = points[0]
+        for point in points:
+            time_growth = point['seconds'] / first['seconds']
+            memory_growth = point['peak_bytes'] / max(first['peak_bytes'], 1)
+            print(f'  range {point["size"]:>5}: {point["seconds"] * 1e3:>10.3f} ms (x{time_growth:>8.1f}) '
+                  f'{point["peak_bytes"] / 2 ** 20:>9.2f} MiB (x{memory_growth:>8.1f})')
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """
+    Print the relative change of every benchmark present in both reports.
+    :return: True - no benchmark got slower by more than `threshold`
+    """
+    ok = True
+    for key, result in current['results'].items():
+        if key not in baseline['results']:
+            continue
+        before, after = baseline['results'][key]['seconds'], result['seconds']
+        change = after / before - 1
+        regression = change > threshold
+        ok = ok and not regression
+        print(f'{key:<48} {before * 1e6:>12.1f} µs -> {after * 1e6:>12.1f} µs {change:>+8.1%}'
+              f'{"  REGRESSION" if regression else ""}')
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Microbenchmarks of generate.py and task.py')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run')
+    run_parser.add_argument('--output', help='save the results as JSON')
+    run_parser.add_argument('--quick', action='store_true', help='small ranges and short measurements only')
+    compare_parser = subparsers.add_parser('compare')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help='allowed slowdown, 0.10 = 10%%')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run(QUICK_RANGE_SIZES if args.quick else RANGE_SIZES, 0.05 if args.quick else 0.2)
+        printScaling(report)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=1, ensure_ascii=False)
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)
+    with open(args.current, encoding='utf-8') as file:
+        current = json.load(file)
+    return 0 if compare(baseline, current, args.threshold) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
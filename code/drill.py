@@ -0,0 +1,130 @@
+"""
+Terminal drill: the exam of gui.py without Qt, for machines where the GUI starts slowly.
+
+The tasks of a pool are asked one by one in the terminal (`Task.request_answer`) and answered through `ExamSession`,
+so the answers are written to the same `py_log_*.log` file lines as in the GUI. At the end the summary of
+`ResultsWindow` is printed: wrong and correct answers, fast/medium/slow answers and the results sorted like the
+results window. Ctrl+D (Ctrl+Z Enter on Windows) or Ctrl+C ends the exam early.
+
+Usage: python drill.py [sum|difference|multiplication|division|mixed] [--tasks 10] [--seed 42] [--show errors]
+                       [--learner NAME] [--no-log]
+"""
+import argparse
+import logging
+import random
+import sys
+from datetime import datetime
+
+from answer_log import AnswerLogPipeline
+from exam import ExamSession, TIME_RANGES, timeRange
+from generate import TASK_POOLS, generatePool, unseenFirst
+
+ANSI_COLORS = {'green': '\033[32m', 'orange': '\033[33m', 'red': '\033[31m'}
+ANSI_RESET = '\033[0m'
+SHOW = {'all': lambda task: True,
+        'errors': lambda task: not task.isCorrect(),
+        'slow': lambda task: timeRange(task.time_elapsed) == 'slow',
+        }
+
+
+def drillTasks(pool_name: str, count: int = None, rng=random, coverage=None) -> list:
+    """
+    :param pool_name: One of `TASK_POOLS` or 'mixed' - all of them
+    :param count: Number of tasks, None - the whole pool
+    :param coverage: `FactCoverage` of the learner, the facts not seen yet are asked first
+    """
+    if pool_name == 'mixed':
+        tasks = [task for name in TASK_POOLS for task in generatePool(name, shuffle=False, rng=rng)]
+        rng.shuffle(tasks)
+        if coverage is not None:
+            unseenFirst(tasks, coverage)
+    else:
+        tasks = generatePool(pool_name, rng=rng, coverage=coverage)
+    return tasks if count is None else tasks[:count]
+
+
+def colored(text: str, color: str | None, use_colors: bool) -> str:
+    if not use_colors or color not in ANSI_COLORS:
+        return text
+    return f'{ANSI_COLORS[color]}{text}{ANSI_RESET}'
+
+
+def runDrill(session: ExamSession, read=input) -> bool:
+    """
+    Ask the tasks of the session until it is finished.
+    :param read: Function that shows the prompt and returns the typed line, see `Task.request_answer`
+    :return: False - the input ended before the last task
+    """
+    session.start()
+    while not session.finished:
+        task = session.current_task
+        try:
+            user_answer = task.request_answer(validate=False, read=read)
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return False
+        session.answer(user_answer)
+        print('✅' if task.isCorrect() else f'❌ {task.solve()}')
+    return True
+
+
+def formatResults(session: ExamSession, show='all', use_colors=False) -> list[str]:
+    """Lines of the summary and of the answered tasks, like `ResultsWindow`."""
+    summary = session.summary()
+    lines = ['   '.join([f"❌ {summary['incorrect']}", f"✅ {summary['correct']}",
+                         *(colored(f'⌛ {summary[key]}', color, use_colors) for key, (*_, color) in TIME_RANGES.items())])]
+    for task in session.sortedTasks():
+        if task.time_elapsed is None or not SHOW[show](task):
+            continue
+        results_color = 'green' if task.isCorrect() else 'red'
+        time_color = TIME_RANGES[timeRange(task.time_elapsed)][2]
+        lines.append(f'{task}{task.solve()} {colored(f"({task.user_answer})", results_color, use_colors)} '
+                     f'{colored(f"⌛ {task.time_elapsed:.2f}", time_color, use_colors)}')
+    errors = session.taskIndex().errorsByFirstOperand()
+    if errors:
+        lines.append('❌ by first operand: ' + ', '.join(f'{operand}: {count}' for operand, count in errors.items()))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Arithmetic drill in the terminal')
+    parser.add_argument('pool', nargs='?', choices=[*TASK_POOLS, 'mixed'], default='multiplication')
+    parser.add_argument('--tasks', type=int, help='number of tasks (default: the whole pool)')
+    parser.add_argument('--seed', type=int, help='seed of the task order, the same seed gives the same drill')
+    parser.add_argument('--show', choices=list(SHOW), default='all', help='answers listed in the results')
+    parser.add_argument('--learner', help='save the answers to the learner profile (see learner_store.py)')
+    parser.add_argument('--store', default='learner.db', help='SQLite database of the learner profiles')
+    parser.add_argument('--no-log', action='store_true', help='do not write the py_log_*.log file')
+    args = parser.parse_args(argv)
+
+    rng = random if args.seed is None else random.Random(args.seed)
+    store = None
+    if args.learner is not None:
+        from learner_store import LearnerStore  # sqlite3 is imported only when the answers are kept
+        store = LearnerStore(args.store, args.learner)
+    session = ExamSession(drillTasks(args.pool, args.tasks, rng, None if store is None else store.coverage()))
+
+    root = logging.getLogger()
+    null_handler = logging.NullHandler()  # without a handler `logging.info()` would configure a stderr handler
+    root.addHandler(null_handler)
+    pipeline = None
+    if not args.no_log:
+        time_stamp = datetime.now().strftime('%Y.%m.%d_%H-%M-%S')
+        pipeline = AnswerLogPipeline(f'py_log_{time_stamp}.log').start(level=logging.DEBUG)
+    try:
+        runDrill(session)
+    finally:
+        if pipeline is not None:
+            pipeline.stop()
+        root.removeHandler(null_handler)
+
+    print('\n'.join(formatResults(session, args.show, sys.stdout.isatty())))
+    if store is not None:
+        store.recordAnswers(session.answered)
+        print(f'facts seen by {args.learner}: {store.coverage().count()}')
+        store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+import logging
+import time
+
+from task import Task
+from task_index import TaskIndex
+
+# Response time ranges: name -> [from seconds, to seconds, color]
+TIME_RANGES = {'fast': [0, 5, 'green'],
+               'medium': [5, 10, 'orange'],
+               'slow': [10, float('inf'), 'red'],
+               }
+
+# One log line per answer: task, correct answer, user answer, is correct, elapsed time, first keystroke latency and
+# think time (seconds, 'None' if no keystrokes were recorded)
+LOG_MESSAGE = '%s %s %s %s %s %s %s'
+
+
+class ExamSession:
+    """
+    UI-free state of one exam: the current task, the timer and the given answers.
+
+    The GUI (`ExamWindow`) and the network server both drive the exam through this class.
+    """
+
+    def __init__(self, tasks: list[Task]):
+        """
+        :param tasks: Tasks in the order they will be asked
+        """
+        self.tasks = tasks
+        self.current_task_number = None
+        self.current_task = None
+        self.finished = False
+        self.answered = []  # [(task, unix time of the answer)] in the order of the answers
+        self._task_index = None
+
+    @property
+    def started(self):
+        return self.current_task is not None
+
+    @property
+    def total(self):
+        """Number of tasks in the exam (the upper bound for adaptive exams)."""
+        return len(self.tasks)
+
+    def start(self) -> Task:
+        """Show the first task and start its timer."""
+        self.current_task_number = 0
+        self.current_task = self._nextTask()
+        self.current_task.startTimer()
+        return self.current_task
+
+    def answer(self, user_answer) -> Task | None:
+        """
+        Record the answer to the current task and move on to the next one.
+        :param user_answer: The answer given by the user
+        :return: The next task or None if it was the last task
+        """
+        task = self.current_task
+        task.stopTimer()
+        task.user_answer = user_answer
+        self.answered.append((task, time.time()))
+        logging.info(LOG_MESSAGE, *self.logValues(task))  # formatted later, see `answer_log`
+        self._answered(task)
+
+        next_task = self._nextTask()
+        if next_task is None:
+            self.finished = True
+            return None
+        self.current_task_number += 1
+        self.current_task = next_task
+        self.current_task.startTimer()
+        return self.current_task
+
+    def keyPressed(self):
+        """A key of the answer to the current task was pressed."""
+        if self.current_task is not None and not self.finished:
+            self.current_task.keyPressed()
+
+    def _answered(self, task: Task):
+        """Called for every answered task before moving on."""
+
+    def save(self):
+        """Persist the learning state of the session, also called when an exam is interrupted."""
+
+    def _nextTask(self) -> Task | None:
+        """The task after the current one, None - the exam is over."""
+        number = 0 if self.current_task_number is None or self.current_task is None else self.current_task_number + 1
+        if number == len(self.tasks):
+            return None
+        return self.tasks[number]
+
+    @staticmethod
+    def logValues(task: Task) -> tuple:
+        """Immutable values of the `LOG_MESSAGE` line of the answered task."""
+        return (str(task), task.solve(), task.user_answer, task.isCorrect(), task.time_elapsed, task.first_key_latency,
+                task.think_time)
+
+    @staticmethod
+    def formatLogLine(task: Task) -> str:
+        return LOG_MESSAGE % ExamSession.logValues(task)
+
+    def taskIndex(self) -> TaskIndex:
+        """Indexes of the tasks asked so far, built again only when a task was added (`AdaptiveExamSession`)."""
+        if self._task_index is None or len(self._task_index) != len(self.tasks):
+            self._task_index = TaskIndex(list(self.tasks))
+        return self._task_index
+
+    def sortedTasks(self) -> list[Task]:
+        return self.taskIndex().ordered
+
+    def answeredTasks(self) -> list[Task]:
+        return [task for task in self.tasks if task.time_elapsed is not None]
+
+    def summary(self) -> dict:
+        """
+        Count correct/incorrect answers and answers in every `TIME_RANGES` range.
+        :return: {'correct': int, 'incorrect': int, 'fast': int, 'medium': int, 'slow': int}
+        """
+        return summarize(self.answeredTasks())
+
+
+def summarize(tasks: list[Task]) -> dict:
+    """
+    Count correct/incorrect answers and answers in every `TIME_RANGES` range.
+    :param tasks: Answered tasks
+    :return: {'correct': int, 'incorrect': int, 'fast': int, 'medium': int, 'slow': int}
+    """
+    summary = {'correct': 0, 'incorrect': 0}
+    summary.update({key: 0 for key in TIME_RANGES})
+    for task in tasks:
+        summary['correct' if task.isCorrect() else 'incorrect'] += 1
+        summary[timeRange(task.time_elapsed)] += 1
+    return summary
+
+
+def timeRange(time_elapsed: float) -> str:
+    """Name of the `TIME_RANGES` range the elapsed time belongs to."""
+    for key, (range_start, range_end, _) in TIME_RANGES.items():
+        if range_start <= time_elapsed <= range_end:
+            return key
+    raise ValueError(f'Strange `time_elapsed` value={time_elapsed}')
+
+
+class AdaptiveExamSession(ExamSession):
+    """
+    Exam that asks tasks in the order chosen by a `SpacedRepetitionScheduler` until every fact is learned
+    or `max_tasks` answers are given. `tasks` contains the tasks asked so far, a fact can be asked several times.
+    """
+
+    def __init__(self, scheduler, max_tasks: int):
+        """
+        :param scheduler: `SpacedRepetitionScheduler`
+        :param max_tasks: Maximum number of answers in one exam
+        """
+        super().__init__([])
+        self.scheduler = scheduler
+        self.max_tasks = max_tasks
+
+    @property
+    def total(self):
+        return self.max_tasks
+
+    def _answered(self, task: Task):
+        self.scheduler.record(task)
+
+    def save(self):
+        self.scheduler.save()
+
+    def _nextTask(self) -> Task | None:
+        if self.current_task is not None and (len(self.tasks) >= self.max_tasks or self.scheduler.isMastered()):
+            self.save()
+            return None
+        task = self.scheduler.nextTask()
+        self.tasks.append(task)
+        return task
+
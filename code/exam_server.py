@@ -0,0 +1,126 @@
+"""
+Headless exam server: many concurrent exams in one asyncio event loop.
+
+Every TCP connection is one `ExamSession`. The protocol is line-delimited JSON, one request and one response per line:
+
+    -> {"command": "start", "operation": "multiplication"}
+    <- {"task": "7 × 8 = ", "number": 1, "total": 36}
+    -> {"command": "answer", "value": 56}
+    <- {"correct": true, "task": "3 × 4 = ", "number": 2, "total": 36}
+    ...
+    <- {"correct": false, "finished": true, "summary": {"correct": 35, "incorrect": 1, "fast": 36, ...}}
+
+"start" takes an optional integer "seed", the same seed gives the same tasks in the same order.
+
+Usage: python exam_server.py [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+
+from exam import ExamSession
+from fact_matrix import useFactMatrix
+from generate import TASK_POOLS, generatePool
+
+
+STREAM_LIMIT = 2 ** 16  # maximum length of a request line, the asyncio default
+
+
+class ExamProtocolError(Exception):
+    pass
+
+
+class ExamConnection:
+    """Protocol state of one connection."""
+
+    def __init__(self):
+        self.session = None
+
+    def handle(self, request: dict) -> dict:
+        if not isinstance(request, dict):
+            raise ExamProtocolError('A request must be a JSON object')
+        command = request.get('command')
+        if command == 'start':
+            operation = request.get('operation', 'multiplication')
+            if not isinstance(operation, str) or operation not in TASK_POOLS:
+                raise ExamProtocolError(f'Unknown operation {operation!r}, expected one of {list(TASK_POOLS)}')
+            seed = request.get('seed')
+            if seed is not None and type(seed) is not int:
+                raise ExamProtocolError('"seed" must be an integer')
+            self.session = ExamSession(generatePool(operation, rng=random if seed is None else seed))
+            return self._taskResponse(self.session.start())
+        if command == 'answer':
+            if self.session is None or self.session.finished:
+                raise ExamProtocolError('No exam in progress, send "start" first')
+            task = self.session.current_task
+            value = request.get('value')
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):  # JSON true is an int to float()
+                raise ExamProtocolError('"answer" requires a numeric "value"')
+            try:
+                value = float(value)
+            except ValueError:
+                raise ExamProtocolError('"answer" requires a numeric "value"')
+            if not math.isfinite(value):
+                raise ExamProtocolError('"value" must be a finite number')
+            next_task = self.session.answer(int(value) if value.is_integer() else value)
+            if next_task is None:
+                return {'correct': task.isCorrect(), 'finished': True, 'summary': self.session.summary()}
+            response = self._taskResponse(next_task)
+            response['correct'] = task.isCorrect()
+            return response
+        if command == 'summary':
+            if self.session is None:
+                raise ExamProtocolError('No exam in progress, send "start" first')
+            return {'summary': self.session.summary()}
+        raise ExamProtocolError(f'Unknown command {command!r}')
+
+    def _taskResponse(self, task) -> dict:
+        return {'task': str(task), 'number': self.session.current_task_number + 1, 'total': self.session.total}
+
+
+async def handleClient(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    connection = ExamConnection()
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:  # longer than the stream limit, the rest of the line cannot be skipped reliably
+                writer.write(json.dumps({'error': f'Request line longer than {STREAM_LIMIT} bytes'}).encode() + b'\n')
+                await writer.drain()
+                break
+            if not line:
+                break
+            try:
+                response = connection.handle(json.loads(line))
+            except (ExamProtocolError, ValueError, TypeError) as error:  # ValueError: bad JSON or UTF-8
+                response = {'error': str(error)}
+            writer.write(json.dumps(response, ensure_ascii=False).encode() + b'\n')
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host='127.0.0.1', port=8765, backlog=4096):
+    server = await asyncio.start_server(handleClient, host, port, backlog=backlog, limit=STREAM_LIMIT)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve exams over TCP (line-delimited JSON).')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args(argv)
+    useFactMatrix()  # in memory, shared by all sessions
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""
+Bulk export of printable worksheets with answer keys.
+
+Worksheets are generated and rendered in chunks by a process pool, the main process streams every finished chunk
+to disk, so memory use stays flat whatever the number of worksheets.
+
+Usage example:
+    python export.py multiplication --count 10000 --tasks 20 --formats html csv pdf --output worksheets
+"""
+import argparse
+import csv
+import html
+import io
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from generate import TASK_POOLS, generatePool
+
+FORMATS = ('html', 'csv', 'pdf')
+
+HTML_HEADER = ('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>{title}</title>\n<style>\n'
+               'section {{page-break-after: always; font-family: Arial; font-size: 20pt;}}\n'
+               'ol {{columns: 2;}}\n'
+               '</style>\n</head>\n<body>\n')
+HTML_FOOTER = '</body>\n</html>\n'
+
+PDF_LINES_PER_PAGE = 45
+PDF_FONT_SIZE = 14
+
+
+def makeWorksheet(operation: str, number: int, tasks_per_sheet: int, seed: int):
+    """
+    Generate one worksheet. The same arguments always produce the same worksheet.
+    :param operation: One of `TASK_POOLS`
+    :param number: Worksheet number, every number gets its own shuffle
+    :param tasks_per_sheet: Maximum number of tasks on the worksheet
+    :param seed: Base seed of the whole export
+    :return: List of Tasks
+    """
+    tasks = generatePool(operation, rng=random.Random(seed * 1_000_003 + number))
+    return tasks[:tasks_per_sheet]
+
+
+def renderChunk(operation: str, numbers: range, tasks_per_sheet: int, seed: int, formats: tuple) -> dict:
+    """
+    Generate and render a chunk of worksheets (runs in a worker process).
+    :return: Dictionary {output name: rendered text or list of PDF page streams}
+    """
+    html_tasks, html_answers, pdf_pages = [], [], []
+    csv_buffer = io.StringIO()
+    csv_writer = csv.writer(csv_buffer)
+
+    for number in numbers:
+        tasks = makeWorksheet(operation, number, tasks_per_sheet, seed)
+        task_lines = [str(task) for task in tasks]
+        answer_lines = [f'{task}{task.solve()}' for task in tasks]
+        title = f'#{number + 1}'
+
+        if 'html' in formats:
+            html_tasks.append(_htmlSection(title, task_lines))
+            html_answers.append(_htmlSection(title, answer_lines))
+        if 'csv' in formats:
+            for position, task in enumerate(tasks, start=1):
+                csv_writer.writerow([number + 1, position, str(task).rstrip(' ='), task.solve()])
+        if 'pdf' in formats:
+            pdf_pages.extend(_pdfPages(title, task_lines))
+            pdf_pages.extend(_pdfPages(f'{title} (answers)', answer_lines))
+
+    return {'worksheets.html': ''.join(html_tasks),
+            'answers.html': ''.join(html_answers),
+            'worksheets.csv': csv_buffer.getvalue(),
+            'worksheets.pdf': pdf_pages,
+            }
+
+
+def _htmlSection(title: str, lines: list[str]) -> str:
+    items = ''.join(f'<li>{html.escape(line)}</li>' for line in lines)
+    return f'<section>\n<h1>{html.escape(title)}</h1>\n<ol>{items}</ol>\n</section>\n'
+
+
+def _pdfEscape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _pdfPages(title: str, lines: list[str]) -> list[bytes]:
+    """Content streams of the pages with the title and the numbered lines."""
+    pages = []
+    for start in range(0, max(len(lines), 1), PDF_LINES_PER_PAGE):
+        commands = [f'BT /F1 {PDF_FONT_SIZE + 6} Tf 50 800 Td ({_pdfEscape(title)}) Tj ET']
+        for row, line in enumerate(lines[start:start + PDF_LINES_PER_PAGE]):
+            y = 770 - row * (PDF_FONT_SIZE + 2)
+            commands.append(f'BT /F1 {PDF_FONT_SIZE} Tf 50 {y} Td ({start + row + 1}.  {_pdfEscape(line)}) Tj ET')
+        # × and ÷ are part of WinAnsiEncoding, which matches latin-1 for these characters
+        pages.append('\n'.join(commands).encode('latin-1'))
+    return pages
+
+
+class PdfStreamWriter:
+    """Minimal PDF writer that streams pages to disk and writes the page tree and xref table at the end."""
+    PAGES_OBJECT = 2
+    FONT_OBJECT = 3
+
+    def __init__(self, file):
+        self.file = file
+        self.offsets = {}
+        self.page_objects = []
+        self.next_object = 4
+        self.file.write(b'%PDF-1.4\n')
+        self._writeObject(self.FONT_OBJECT,
+                          b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+
+    def _writeObject(self, number: int, body: bytes):
+        self.offsets[number] = self.file.tell()
+        self.file.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+
+    def addPage(self, content: bytes):
+        content_object, page_object = self.next_object, self.next_object + 1
+        self.next_object += 2
+        self._writeObject(content_object, b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+        self._writeObject(page_object, b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] '
+                                       b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>'
+                          % (self.PAGES_OBJECT, self.FONT_OBJECT, content_object))
+        self.page_objects.append(page_object)
+
+    def close(self):
+        kids = b' '.join(b'%d 0 R' % number for number in self.page_objects)
+        self._writeObject(self.PAGES_OBJECT, b'<< /Type /Pages /Kids [%s] /Count %d >>'
+                          % (kids, len(self.page_objects)))
+        self._writeObject(1, b'<< /Type /Catalog /Pages %d 0 R >>' % self.PAGES_OBJECT)
+        xref_offset = self.file.tell()
+        self.file.write(b'xref\n0 %d\n0000000000 65535 f \n' % self.next_object)
+        for number in range(1, self.next_object):
+            self.file.write(b'%010d 00000 n \n' % self.offsets[number])
+        self.file.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                        % (self.next_object, xref_offset))
+
+
+def export(operation: str, count: int, output: str, tasks_per_sheet=20, formats=FORMATS, seed=0, workers=None,
+           chunk_size=100):
+    """
+    Export `count` worksheets with answer keys.
+    :param operation: One of `TASK_POOLS`
+    :param count: Number of worksheets
+    :param output: Output directory
+    :param tasks_per_sheet: Maximum number of tasks on one worksheet
+    :param formats: Any of `FORMATS`
+    :param seed: Base seed, the same seed gives the same worksheets
+    :param workers: Number of worker processes, None - number of CPUs
+    :param chunk_size: Worksheets rendered by one worker job
+    :return: List of written file paths
+    """
+    if operation not in TASK_POOLS:
+        raise ValueError(f'Unknown operation {operation!r}, expected one of {list(TASK_POOLS)}')
+    formats = tuple(formats)
+    os.makedirs(output, exist_ok=True)
+    paths = {}
+    if 'html' in formats:
+        paths['worksheets.html'] = os.path.join(output, 'worksheets.html')
+        paths['answers.html'] = os.path.join(output, 'answers.html')
+    if 'csv' in formats:
+        paths['worksheets.csv'] = os.path.join(output, 'worksheets.csv')
+    if 'pdf' in formats:
+        paths['worksheets.pdf'] = os.path.join(output, 'worksheets.pdf')
+
+    files = {name: _open(path) for name, path in paths.items()}
+    try:
+        for name in ('worksheets.html', 'answers.html'):
+            if name in files:
+                files[name].write(HTML_HEADER.format(title=f'{operation} ({name.split(".")[0]})'))
+        if 'worksheets.csv' in files:
+            csv.writer(files['worksheets.csv']).writerow(['worksheet', 'number', 'task', 'answer'])
+        pdf_writer = PdfStreamWriter(files['worksheets.pdf']) if 'worksheets.pdf' in files else None
+
+        chunks = [range(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+        for rendered in _orderedMap(chunks, operation, tasks_per_sheet, seed, formats, workers):
+            for name, file in files.items():
+                if name == 'worksheets.pdf':
+                    for page in rendered[name]:
+                        pdf_writer.addPage(page)
+                else:
+                    file.write(rendered[name])
+
+        for name in ('worksheets.html', 'answers.html'):
+            if name in files:
+                files[name].write(HTML_FOOTER)
+        if pdf_writer is not None:
+            pdf_writer.close()
+    finally:
+        for file in files.values():
+            file.close()
+    return list(paths.values())
+
+
+def _open(path: str):
+    if path.endswith('.pdf'):
+        return open(path, 'wb')
+    return open(path, 'w', encoding='utf-8', newline='' if path.endswith('.csv') else None)
+
+
+def _orderedMap(chunks: list, operation, tasks_per_sheet, seed, formats, workers):
+    """Render chunks in the pool, keeping only a bounded number of them in flight, and yield them in order."""
+    workers = workers or os.cpu_count() or 1
+    in_flight_limit = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for chunk in chunks:
+            futures.append(executor.submit(renderChunk, operation, chunk, tasks_per_sheet, seed, formats))
+            if len(futures) >= in_flight_limit:
+                yield futures.pop(0).result()
+        for future in futures:
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export printable worksheets with answer keys.')
+    parser.add_argument('operation', choices=list(TASK_POOLS))
+    parser.add_argument('--count', type=int, default=1, help='number of worksheets')
+    parser.add_argument('--tasks', type=int, default=20, help='tasks per worksheet')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--output', default='worksheets', help='output directory')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, default - number of CPUs')
+    parser.add_argument('--chunk-size', type=int, default=100, help='worksheets per worker job')
+    args = parser.parse_args(argv)
+
+    paths = export(args.operation, args.count, args.output, args.tasks, args.formats, args.seed, args.workers,
+                   args.chunk_size)
+    for path in paths:
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+import operator
+
+# Binary operators supported by the parser
+OPERATORS = {'+': operator.add,
+             '-': operator.sub,
+             '*': operator.mul,
+             '/': operator.truediv,
+             }
+
+
+class Expression:
+    """
+    Parsed arithmetic expression.
+
+    The string is parsed once into an operator tree: a leaf is an `int` or a `float`, a node is a tuple
+    `(operator, left, right)` for binary operators or `(operator, operand)` for unary plus and minus.
+    Evaluation walks the tree with the same Python operators `eval()` would use, so results are identical.
+    """
+    __slots__ = ('tree', 'operands', 'operators')
+
+    def __init__(self, expression_string: str):
+        """
+        :param expression_string: The string with the expression. Example: '(3 + 4) * 2'
+        """
+        self.operands = []
+        self.operators = []
+        tokens = self._tokenize(expression_string)
+        self.tree, position = self._parseSum(tokens, 0)
+        if position != len(tokens):
+            raise SyntaxError(f'Unexpected token {tokens[position]!r} in expression {expression_string!r}')
+
+    def evaluate(self):
+        return self._evaluate(self.tree)
+
+    def fact(self) -> tuple | None:
+        """(first, operator, second) if the expression is one binary operation on two integers, otherwise None."""
+        tree = self.tree
+        if type(tree) is tuple and len(tree) == 3 and type(tree[1]) is int and type(tree[2]) is int:
+            return tree[1], tree[0], tree[2]
+        return None
+
+    def _evaluate(self, node):
+        if type(node) is not tuple:
+            return node
+        if len(node) == 2:
+            value = self._evaluate(node[1])
+            return -value if node[0] == '-' else +value
+        return OPERATORS[node[0]](self._evaluate(node[1]), self._evaluate(node[2]))
+
+    def _tokenize(self, expression_string: str) -> list:
+        tokens = []
+        number = ''
+        for character in expression_string:
+            if character.isdigit():
+                number += character
+                continue
+            if character in '.,':  # comma is accepted as a decimal separator
+                number += '.'
+                continue
+            if number:
+                tokens.append(self._toNumber(number))
+                number = ''
+            if character == ' ':
+                continue
+            if character in OPERATORS or character in '()':
+                tokens.append(character)
+            else:
+                raise SyntaxError(f'Unsupported character {character!r} in expression {expression_string!r}')
+        if number:
+            tokens.append(self._toNumber(number))
+        return tokens
+
+    def _toNumber(self, number: str):
+        value = float(number) if '.' in number else int(number)
+        self.operands.append(value)
+        return value
+
+    def _parseSum(self, tokens: list, position: int):
+        left, position = self._parseProduct(tokens, position)
+        while position < len(tokens) and tokens[position] in ('+', '-'):
+            operator_symbol = tokens[position]
+            self.operators.append(operator_symbol)
+            right, position = self._parseProduct(tokens, position + 1)
+            left = (operator_symbol, left, right)
+        return left, position
+
+    def _parseProduct(self, tokens: list, position: int):
+        left, position = self._parseUnary(tokens, position)
+        while position < len(tokens) and tokens[position] in ('*', '/'):
+            operator_symbol = tokens[position]
+            self.operators.append(operator_symbol)
+            right, position = self._parseUnary(tokens, position + 1)
+            left = (operator_symbol, left, right)
+        return left, position
+
+    def _parseUnary(self, tokens: list, position: int):
+        if position < len(tokens) and tokens[position] in ('+', '-'):
+            operator_symbol = tokens[position]
+            operand, position = self._parseUnary(tokens, position + 1)
+            return (operator_symbol, operand), position
+        return self._parseAtom(tokens, position)
+
+    def _parseAtom(self, tokens: list, position: int):
+        if position >= len(tokens):
+            raise SyntaxError('Unexpected end of expression')
+        token = tokens[position]
+        if token == '(':
+            node, position = self._parseSum(tokens, position + 1)
+            if position >= len(tokens) or tokens[position] != ')':
+                raise SyntaxError('Missing closing parenthesis')
+            return node, position + 1
+        if isinstance(token, str):
+            raise SyntaxError(f'Unexpected token {token!r}')
+        return token, position + 1
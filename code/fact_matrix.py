@@ -0,0 +1,227 @@
+"""
+Precomputed arithmetic facts: the results of `first <operation> second` for +, -, *, / and every pair of operands of
+a configured range, stored as dense 2-D planes of float64 values (NaN for division by zero).
+
+Nothing is built at import or on the first `Task.solve()`: a frontend opts in with `useFactMatrix()`, in memory or
+with a cache file (gui.py uses `defaultCacheFile()`), then `Task.solve` and `MultiplicationTableWindow` look the
+facts up instead of computing them. A cache file is memory-mapped by later runs, so nothing is computed again.
+A result lookup is O(1). `FactCoverage` is a bitmap of the facts a learner has already seen, `LearnerStore` keeps
+it per learner and `generate.unseenFirst` asks the facts that were not seen yet first.
+"""
+import math
+import mmap
+import os
+import struct
+from array import array
+
+MIN_OPERAND = 0
+MAX_OPERAND = 100
+OPERATIONS = '+-*/'  # the order of the planes, the same as `task_pool.OPERATION_CODES`
+CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'multiplication_table')
+
+_HEADER = struct.Struct('<8sqq')  # magic, min operand, max operand
+_MAGIC = b'FACTS\x00\x00\x01'
+
+
+class FactMatrix:
+    """Results of all facts over `min_operand`..`max_operand` (inclusive) for every operation."""
+
+    def __init__(self, min_operand=MIN_OPERAND, max_operand=MAX_OPERAND, cache_file=None):
+        """
+        :param min_operand: Smallest operand
+        :param max_operand: Biggest operand
+        :param cache_file: File to memory-map, it is (re)built if it is missing or made for another range,
+        None - the matrix is computed and kept in memory only. If the file cannot be written the matrix is kept in
+        memory.
+        """
+        if min_operand > max_operand:
+            raise ValueError(f'Empty operand range {min_operand}..{max_operand}')
+        self.min_operand = min_operand
+        self.max_operand = max_operand
+        self.size = max_operand - min_operand + 1
+        self.cache_file = cache_file
+        self._answers = None  # {answer: [flat indexes]}, built on the first reverse lookup
+
+        self._buffer = None if cache_file is None else self._load()
+        if self._buffer is None:
+            values = self._compute()
+            if cache_file is not None:
+                try:
+                    self._save(values)
+                    self._buffer = self._load()
+                except OSError:
+                    pass
+            if self._buffer is None:
+                self._buffer = _HEADER.pack(_MAGIC, min_operand, max_operand) + values.tobytes()
+        self._values = memoryview(self._buffer)[_HEADER.size:].cast('d')
+
+    def _compute(self) -> array:
+        operands = range(self.min_operand, self.max_operand + 1)
+        values = array('d')
+        for operation in OPERATIONS:
+            for first in operands:
+                if operation == '+':
+                    values.extend(first + second for second in operands)
+                elif operation == '-':
+                    values.extend(first - second for second in operands)
+                elif operation == '*':
+                    values.extend(first * second for second in operands)
+                else:
+                    values.extend(math.nan if second == 0 else first / second for second in operands)
+        return values
+
+    def _load(self):
+        """Memory-map the cache file, None if it does not exist or does not match the range."""
+        expected_size = _HEADER.size + len(OPERATIONS) * self.size * self.size * 8
+        try:
+            with open(self.cache_file, 'rb') as file:
+                if os.fstat(file.fileno()).st_size != expected_size:
+                    return None
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if _HEADER.unpack_from(buffer) != (_MAGIC, self.min_operand, self.max_operand):
+            buffer.close()
+            return None
+        return buffer
+
+    def _save(self, values: array):
+        os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+        temporary_file = f'{self.cache_file}.{os.getpid()}.tmp'
+        with open(temporary_file, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, self.min_operand, self.max_operand))
+            values.tofile(file)
+        os.replace(temporary_file, self.cache_file)  # readers never see a half-written file
+
+    def index(self, first, operation: str, second) -> int | None:
+        """Flat index of the fact, None if an operand is not an integer of the range or the operation is unknown."""
+        if type(first) is not int or type(second) is not int:
+            return None
+        first -= self.min_operand
+        second -= self.min_operand
+        plane = OPERATIONS.find(operation)
+        if plane < 0 or not (0 <= first < self.size and 0 <= second < self.size):
+            return None
+        return (plane * self.size + first) * self.size + second
+
+    def fact(self, index: int) -> tuple:
+        """(first, operation, second) of the flat index."""
+        plane, rest = divmod(index, self.size * self.size)
+        first, second = divmod(rest, self.size)
+        return first + self.min_operand, OPERATIONS[plane], second + self.min_operand
+
+    def result(self, first, operation: str, second):
+        """
+        :return: The result (an `int` if it is integral, like `Task.solve()`), None if the fact is not in the matrix
+        or is a division by zero
+        """
+        index = self.index(first, operation, second)
+        if index is None:
+            return None
+        value = self._values[index]
+        if value != value:  # NaN
+            return None
+        return int(value) if value.is_integer() else value
+
+    def isCorrect(self, first, operation: str, second, answer) -> bool | None:
+        """True/False - the answer is (in)correct, None - the fact is not in the matrix."""
+        result = self.result(first, operation, second)
+        return None if result is None else result == answer
+
+    def factsWithAnswer(self, answer, operation: str = None) -> list[tuple]:
+        """
+        Reverse lookup.
+        :param answer: Result of the facts
+        :param operation: One of `OPERATIONS`, None - all operations
+        :return: [(first, operation, second)] in the plane order
+        """
+        if self._answers is None:
+            self._answers = {}
+            for index, value in enumerate(self._values):
+                if value == value:
+                    self._answers.setdefault(value, []).append(index)
+        facts = [self.fact(index) for index in self._answers.get(answer, ())]
+        if operation is not None:
+            facts = [fact for fact in facts if fact[1] == operation]
+        return facts
+
+    def __len__(self):
+        return len(self._values)
+
+
+class FactCoverage:
+    """Bitmap of the facts of a `FactMatrix` that have been seen, one bit per fact."""
+
+    def __init__(self, matrix: FactMatrix, bits: bytes = None):
+        """
+        :param matrix: Matrix that defines the fact indexes
+        :param bits: Saved bitmap (`bytes(coverage)`), None - nothing is seen yet
+        """
+        self.matrix = matrix
+        size = (len(matrix) + 7) // 8
+        self.bits = bytearray(size) if bits is None else bytearray(bits)
+        if len(self.bits) != size:
+            raise ValueError(f'The bitmap has {len(self.bits)} bytes, {size} expected')
+
+    def mark(self, first, operation: str, second) -> bool:
+        """
+        Mark the fact as seen.
+        :return: False - the fact is not in the matrix
+        """
+        index = self.matrix.index(first, operation, second)
+        if index is None:
+            return False
+        self.bits[index >> 3] |= 1 << (index & 7)
+        return True
+
+    def markTask(self, task) -> bool:
+        """Mark the fact of a two-operand `Task` as seen."""
+        fact = task.expression.fact()
+        return fact is not None and self.mark(*fact)
+
+    def seen(self, first, operation: str, second) -> bool:
+        index = self.matrix.index(first, operation, second)
+        return index is not None and bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def seenTask(self, task) -> bool:
+        """False also for tasks that are not a fact of the matrix."""
+        fact = task.expression.fact()
+        return fact is not None and self.seen(*fact)
+
+    def count(self) -> int:
+        """Number of the seen facts."""
+        return sum(byte.bit_count() for byte in self.bits)
+
+    def coverage(self, tasks) -> float:
+        """Share of the two-operand tasks (e.g. a task pool) that has been seen, 0..1."""
+        facts = [task.expression.fact() for task in tasks]
+        facts = [fact for fact in facts if fact is not None]
+        if not facts:
+            return 0.0
+        return sum(self.seen(*fact) for fact in facts) / len(facts)
+
+    def __bytes__(self):
+        return bytes(self.bits)
+
+
+_shared_matrix = None
+
+
+def defaultCacheFile(min_operand=MIN_OPERAND, max_operand=MAX_OPERAND) -> str:
+    return os.path.join(CACHE_DIRECTORY, f'facts_{min_operand}_{max_operand}.bin')
+
+
+def useFactMatrix(cache_file: str = None) -> FactMatrix:
+    """
+    Build the matrix of the default range and share it with the whole process, see `getFactMatrix`.
+    :param cache_file: File to memory-map and to save the matrix to, None - in memory only
+    """
+    global _shared_matrix
+    if _shared_matrix is None or _shared_matrix.cache_file != cache_file:
+        _shared_matrix = FactMatrix(cache_file=cache_file)
+    return _shared_matrix
+
+
+def getFactMatrix() -> FactMatrix | None:
+    """The shared matrix, None - no frontend called `useFactMatrix()`, the facts are computed."""
+    return _shared_matrix
@@ -1,11 +1,70 @@
-import itertools
+import math
 import random
+from bisect import bisect_left, bisect_right
+
 from task import Task
+from pairs import UniqPairs
+from syllables import SYLLABLE_INDEX
+from instrumentation import timed
+
+# Task pools offered by the main window: name -> (GenerateTasks method, args, kwargs)
+TASK_POOLS = {'sum': ('sum', [list(range(1, 11))], {'limit': 10}),  # summing in range 0-10 max answer 10
+              'difference': ('difference', [list(range(10, 1, -1))], {}),  # difference in rng 10-1, max minuend 10
+              'multiplication': ('multiplication', [list(range(2, 10))], {}),  # multiplying in range 2-9
+              'division': ('division', [list(range(9, 1, -1))], {}),  # division in range 9-2
+              }
+
+# Operation precedence in the expression strings, a single operand binds tighter than any operation
+PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2}
+ATOM_PRECEDENCE = 3
+
+
+@timed('generatePool')
+def generatePool(name: str, shuffle=True, rng=random, coverage=None) -> list[Task]:
+    """
+    Generate one of the `TASK_POOLS`
+    :param name: 'sum', 'difference', 'multiplication' or 'division'
+    :param shuffle: True - will shuffle list randomly, False - the list will be ordered
+    :param rng: Source of randomness, see `randomSource`
+    :param coverage: `fact_matrix.FactCoverage` of the learner, the facts not seen yet come first, see `unseenFirst`
+    :return: List of Tasks
+    """
+    method, args, kwargs = TASK_POOLS[name]
+    tasks = getattr(GenerateTasks(rng), method)(*args, shuffle=shuffle, **kwargs)
+    return tasks if coverage is None else unseenFirst(tasks, coverage)
+
+
+def unseenFirst(tasks: list[Task], coverage) -> list[Task]:
+    """
+    Move the facts the learner has not seen yet to the front, the order within the unseen and the seen facts is kept.
+    A lookup is one bit of the `FactCoverage` at the `FactMatrix` index of the fact.
+    :param tasks: Tasks, sorted in place
+    :param coverage: `fact_matrix.FactCoverage`, e.g. `LearnerStore.coverage()`
+    """
+    tasks.sort(key=coverage.seenTask)
+    return tasks
+
+
+def randomSource(rng=random):
+    """
+    :param rng: The `random` module (the global, unseeded state), a `random.Random` instance or an int seed
+    :return: The `random` module or a `random.Random` instance
+    """
+    if isinstance(rng, int):
+        return random.Random(rng)
+    return rng
 
 
 # noinspection PyMethodMayBeStatic
 class GenerateTasks:
 
+    def __init__(self, rng=random):
+        """
+        :param rng: Source of randomness of the shuffles and samples, see `randomSource`. The same seed gives the same
+        tasks in the same order.
+        """
+        self.rng = randomSource(rng)
+
     @staticmethod
     def _generate_uniq_permutations(list1: list, list2: list) -> list:
         """
@@ -15,17 +74,62 @@ class GenerateTasks:
         :param list2: Second list of values
         :return: List of permutations of the values without repeats
         """
-        permutations_list = []
-        for first_multiplier in list1:
-            for second_multiplier in list2:
-                multipliers = [first_multiplier, second_multiplier]
-                multipliers.sort()
-                permutations_list.append(multipliers)
+        return [list(pair) for pair in UniqPairs(list1, list2)]
+
+    def _iterate_uniq_permutations(self, list1: list, list2: list, sample=None, max_sum=None, distinct=False):
+        """
+        Lazy version of `_generate_uniq_permutations`.
+
+        :param list1: First list of values
+        :param list2: Second list of values
+        :param sample: None - yield all permutations in canonical order, otherwise yield the permutations in uniformly
+        random order (stopping is up to the caller, nothing is materialized)
+        :param max_sum: Skip permutations whose values sum up to more than `max_sum`, None - no limit
+        :param distinct: True - skip permutations of two equal values
+        :return: Generator of [smaller, bigger] permutations
+        """
+        pairs = UniqPairs(list1, list2, max_sum, distinct)
+        if sample is None:
+            for pair in pairs:
+                yield list(pair)
+        else:
+            for rank in pairs.randomRanks(self.rng):
+                yield list(pairs[rank])
+
+    @staticmethod
+    def _take(tasks, sample):
+        """Stop a task generator after `sample` tasks (None - no limit)."""
+        if sample is None:
+            yield from tasks
+            return
+        for number, task in enumerate(tasks):
+            if number >= sample:
+                return
+            yield task
+
+    def _shuffled(self, tasks, shuffle) -> list[Task]:
+        tasks = list(tasks)
+        if shuffle:
+            self.rng.shuffle(tasks)
+        return tasks
+
+    def iter_sum(self, summands: list[int], limit=None, sample=None):
+        """
+        Lazily generate sum `Task`s in canonical order, see `sum`.
+        :param sample: If set - yield exactly `sample` tasks (or all if there are fewer) chosen uniformly at random
+        from the tasks within the limit
+        :return: Generator of Tasks
+        """
+        tasks = self._iter_sum(summands, limit, sample)
+        return self._take(tasks, sample)
 
-        permutations_list.sort()
-        permutations_list_without_repeats = list(k for k, _ in itertools.groupby(permutations_list))
-        return permutations_list_without_repeats
+    def _iter_sum(self, summands, limit, sample):
+        # the limit is applied to the enumerated pairs, sums over the limit never become `Task`s
+        for permutation in self._iterate_uniq_permutations(summands, summands, sample, max_sum=limit):
+            permutation_as_string = [str(_) for _ in permutation]
+            yield Task(' + '.join(permutation_as_string))
 
+    @timed('GenerateTasks.sum')
     def sum(self, summands: list[int], limit=None, shuffle=True) -> list[Task]:
         """
         Generate list of sum `Task`s
@@ -35,21 +139,31 @@ class GenerateTasks:
         not be included in the generated sample. If None no values skipped.
         :return: List of Tasks
         """
-        tasks = []
-        permutations = self._generate_uniq_permutations(summands, summands)
-        for permutation in permutations:
-            permutation_as_string = [str(_) for _ in permutation]
-            task = Task(' + '.join(permutation_as_string))
+        return self._shuffled(self.iter_sum(summands, limit), shuffle)
+
+    def _constant_multipliers(self, multipliers: list[int]) -> list[int]:
+        if max(multipliers) > 9:
+            last_constant_multiplier = max(multipliers)
+        else:
+            last_constant_multiplier = 9
+        return list(range(2, last_constant_multiplier + 1))
 
-            if limit is None:
-                tasks.append(task)
-            elif task.solve() <= limit:
-                tasks.append(task)
+    def iter_multiplication(self, multipliers: list[int], sample=None):
+        """
+        Lazily generate multiplication `Task`s in canonical order, see `multiplication`.
+        :param sample: If set - yield exactly `sample` tasks (or all if there are fewer) chosen uniformly at random
+        :return: Generator of Tasks
+        """
+        tasks = self._iter_multiplication(multipliers, sample)
+        return self._take(tasks, sample)
 
-        if shuffle:
-            random.shuffle(tasks)
-        return tasks
+    def _iter_multiplication(self, multipliers, sample):
+        constant_multipliers = self._constant_multipliers(multipliers)
+        for permutation in self._iterate_uniq_permutations(constant_multipliers, multipliers, sample):
+            permutation_as_string = [str(_) for _ in permutation]
+            yield Task(' * '.join(permutation_as_string))
 
+    @timed('GenerateTasks.multiplication')
     def multiplication(self, multipliers: list[int], shuffle=True) -> list[Task]:
         """
         Generate list of multiplication `Task`s
@@ -57,23 +171,25 @@ class GenerateTasks:
         :param shuffle: True - will shuffle list randomly, False - the list will be ordered
         :return: List of Tasks
         """
-        tasks = []
+        return self._shuffled(self.iter_multiplication(multipliers), shuffle)
 
-        if max(multipliers) > 9:
-            last_constant_multiplier = max(multipliers)
-        else:
-            last_constant_multiplier = 9
-        constant_multipliers = list(range(2, last_constant_multiplier + 1))
+    def iter_difference(self, values: list[int], only_positive=False, skip_zero_answer=True, sample=None):
+        """
+        Lazily generate difference `Task`s in canonical order, see `difference`.
+        :param sample: If set - yield exactly `sample` tasks (or all if there are fewer) chosen uniformly at random
+        from the tasks meeting the constraints
+        :return: Generator of Tasks
+        """
+        tasks = self._iter_difference(values, only_positive, skip_zero_answer, sample)
+        return self._take(tasks, sample)
 
-        permutations = self._generate_uniq_permutations(constant_multipliers, multipliers)
-        for permutation in permutations:
-            permutation_as_string = [str(_) for _ in permutation]
-            task = Task(' * '.join(permutation_as_string))
-            tasks.append(task)
-        if shuffle:
-            random.shuffle(tasks)
-        return tasks
+    def _iter_difference(self, values, only_positive, skip_zero_answer, sample):
+        # The bigger value is always the minuend, so the answer is never negative (`only_positive` skips nothing)
+        # and it is zero only for two equal values, which the enumeration skips for `skip_zero_answer`
+        for permutation in self._iterate_uniq_permutations(values, values, sample, distinct=skip_zero_answer):
+            yield Task(f'{permutation[1]} - {permutation[0]}')
 
+    @timed('GenerateTasks.difference')
     def difference(self, values: list[int], only_positive=False, shuffle=True, skip_zero_answer=True) -> list[Task]:
         """
         Generate list of difference `Task`s
@@ -82,23 +198,25 @@ class GenerateTasks:
         :param only_positive: If True - negative results are skipped.
         :return: List of Tasks
         """
-        tasks = []
-        permutations = self._generate_uniq_permutations(values, values)
-        for permutation in permutations:
-            task = Task(f'{permutation[1]} - {permutation[0]}')
-            if only_positive:
-                if int(task.solve()) < 0:
-                    continue
-            if skip_zero_answer:
-                if int(task.solve()) == 0:
-                    continue
+        return self._shuffled(self.iter_difference(values, only_positive, skip_zero_answer), shuffle)
 
-            tasks.append(task)
+    def iter_division(self, multipliers: list[int], sample=None):
+        """
+        Lazily generate division `Task`s in canonical order, see `division`.
+        :param sample: If set - yield exactly `sample` tasks (or all if there are fewer) chosen uniformly at random
+        :return: Generator of Tasks
+        """
+        tasks = self._iter_division(multipliers, sample)
+        return self._take(tasks, sample)
 
-        if shuffle:
-            random.shuffle(tasks)
-        return tasks
+    def _iter_division(self, multipliers, sample):
+        for permutation in self._iterate_uniq_permutations(multipliers, multipliers, sample):
+            self.rng.shuffle(permutation)  # randomizes divisor and result
+            dividend = str(permutation[0] * permutation[1])
+            divisor = str(permutation[0])
+            yield Task(f'{dividend} / {divisor}')
 
+    @timed('GenerateTasks.division')
     def division(self, multipliers: list[int], shuffle=True) -> list[Task]:
         """
         Generate list of division `Task`s
@@ -106,83 +224,127 @@ class GenerateTasks:
         :param shuffle: True - will shuffle list randomly, False - the list will be ordered
         :return: List of Tasks
         """
-        tasks = []
-        permutations = self._generate_uniq_permutations(multipliers, multipliers)
-        for permutation in permutations:
-            random.shuffle(permutation)  # randomizes divisor and result
-            dividend = str(permutation[0] * permutation[1])
-            divisor = str(permutation[0])
-            task = Task(f'{dividend} / {divisor}')
-            tasks.append(task)
-        if shuffle:
-            random.shuffle(tasks)
-        return tasks
+        return self._shuffled(self.iter_division(multipliers), shuffle)
+
+    def iter_expressions(self, operands: list[int], operand_count=3, operations='+-*/', min_result=0, max_result=100,
+                         integer_only=True, only_positive=True):
+        """
+        Lazily generate multi-step expressions like '(3 + 4) * 2' or '18 / 3 - 2' in canonical order, see
+        `expressions`.
+
+        Sub-expressions are built bottom-up and grouped by value. A sub-expression that breaks a constraint is
+        dropped before it is combined any further, operations are combined value by value (not expression by
+        expression), and for the last operation the right values are narrowed by bisection to the ones that give
+        a result in the range. Expressions that differ only by the associativity of + or * are made once.
+        :return: Generator of Tasks
+        """
+        if operand_count < 2:
+            raise ValueError('An expression needs at least 2 operands')
+        low = 0 if only_positive else -math.inf
+        levels = self._subexpressions(operands, operand_count, operations, integer_only, only_positive)
+        for string, _, _ in self._combineLevels(levels, operand_count, operations, max(low, min_result), max_result,
+                                                integer_only, only_positive):
+            yield Task(string)
+
+    def expressions(self, operands: list[int], operand_count=3, operations='+-*/', min_result=0, max_result=100,
+                    integer_only=True, only_positive=True, shuffle=True) -> list[Task]:
+        """
+        Generate list of multi-step expression `Task`s
+        :param operands: Values of the single operands
+        :param operand_count: Number of operands in every expression (2 or more)
+        :param operations: Allowed operations, some of '+-*/'
+        :param min_result: Smallest allowed result
+        :param max_result: Biggest allowed result
+        :param integer_only: True - every intermediate result and the result are integers
+        :param only_positive: True - intermediate results and the result are never negative
+        :param shuffle: True - will shuffle list randomly, False - the list will be ordered
+        :return: List of Tasks
+        """
+        return self._shuffled(self.iter_expressions(operands, operand_count, operations, min_result, max_result,
+                                                    integer_only, only_positive), shuffle)
+
+    def _subexpressions(self, operands, operand_count, operations, integer_only, only_positive) -> list[dict]:
+        """
+        :return: levels[n] = {value: [(string, precedence)]} of the valid sub-expressions of n operands,
+        for n < `operand_count`
+        """
+        levels = [{}, {}]
+        for operand in sorted(set(operands)):
+            if not (only_positive and operand < 0):
+                levels[1][operand] = [(str(operand), ATOM_PRECEDENCE)]
+        low = 0 if only_positive else -math.inf
+        for size in range(2, operand_count):
+            level = {}
+            for string, precedence, value in self._combineLevels(levels, size, operations, low, math.inf,
+                                                                 integer_only, only_positive):
+                level.setdefault(value, []).append((string, precedence))
+            levels.append(level)
+        return levels
+
+    def _combineLevels(self, levels, size, operations, low, high, integer_only, only_positive):
+        """
+        Expressions of `size` operands made of two sub-expressions of `levels`, with a result within `low`..`high`.
+        :return: Generator of (string, precedence of the last operation, value)
+        """
+        for left_size in range(1, size):
+            left_level, right_level = levels[left_size], levels[size - left_size]
+            right_values = sorted(right_level)
+            for operation in operations:
+                precedence = PRECEDENCE[operation]
+                for left_value, right_value, value in self._combineValues(left_level, right_values, operation, low,
+                                                                          high, integer_only, only_positive):
+                    for left_string, left_precedence in left_level[left_value]:
+                        if left_precedence < precedence:
+                            left_string = f'({left_string})'
+                        for right_string, right_precedence in right_level[right_value]:
+                            if right_precedence == precedence and operation in '+*':
+                                continue  # a + (b + c) is made as a + b + c
+                            if right_precedence <= precedence:
+                                right_string = f'({right_string})'
+                            yield f'{left_string} {operation} {right_string}', precedence, value
+
+    @staticmethod
+    def _combineValues(left_values, right_values: list, operation: str, low, high, integer_only, only_positive):
+        """
+        Pairs of sub-expression values whose result is within `low`..`high` and meets the constraints.
+        :param right_values: Sorted values
+        :return: Generator of (left value, right value, result)
+        """
+        for left in left_values:
+            start, stop = 0, len(right_values)
+            if operation == '+':
+                start, stop = bisect_left(right_values, low - left), bisect_right(right_values, high - left)
+            elif operation == '-':
+                start, stop = bisect_left(right_values, left - high), bisect_right(right_values, left - low)
+            elif operation == '*' and only_positive and left > 0 and high != math.inf:
+                stop = bisect_right(right_values, high // left)
+            for index in range(start, stop):
+                right = right_values[index]
+                if operation == '+':
+                    result = left + right
+                elif operation == '-':
+                    result = left - right
+                elif operation == '*':
+                    result = left * right
+                else:
+                    if right == 0 or (integer_only and left % right):
+                        continue
+                    result = left // right if integer_only else left / right
+                if low <= result <= high:
+                    yield left, right, result
 
     # There was an idea of teaching to read simple syllables, but it cannot be implemented without the teacher present.
+    # The syllables and the drill engine are in `syllables.py`.
+    @timed('GenerateTasks.russian_syllables')
     def russian_syllables(self, shuffle=True, skip_censored=True):
         """
-        Source:
-        https://traditio.wiki/Список_слогов
-        https://traditio.wiki/%D0%A1%D0%BF%D0%B8%D1%81%D0%BE%D0%BA_%D1%81%D0%BB%D0%BE%D0%B3%D0%BE%D0%B2
-
         :param shuffle: True - will shuffle list randomly, False - the list will be ordered
         :param skip_censored: True - will skip some syllables like 'хуй', False - will return all syllables
         :return: List of russian syllables.
         """
-
-        censored_list = ['ебь', 'ёб', 'еб', 'ёп', 'ёпть', 'хуй', ]
-        syllables = ['аб', 'абь', 'ав', 'авь', 'аг', 'агь', 'ад', 'адь', 'аж', 'ажь', 'аз', 'азь', 'аи', 'ай', 'ак',
-                     'акь', 'ал', 'аль', 'ам', 'амь', 'ан', 'ань', 'ап', 'апь', 'ар', 'арь', 'ас', 'ась', 'ат', 'ать',
-                     'ау', 'аф', 'афь', 'ах', 'ахь', 'ац', 'аць', 'ач', 'ачь', 'аш', 'ашь', 'ащ', 'ащь', 'аю', 'ая',
-                     'ба', 'баб', 'баг', 'бар', 'бат', 'бе', 'бё', 'бер', 'берж', 'би', 'бир', 'бо', 'бор', 'борь',
-                     'бра', 'бре', 'брит', 'брь', 'бу', 'бъ', 'бы', 'бык', 'бырь', 'бь', 'бэ', 'бю', 'бюст', 'бя', 'ва',
-                     'ват', 'вать', 'ве', 'вё', 'век', 'вель', 'вен', 'ви', 'виль', 'во', 'воль', 'все', 'ву', 'въ',
-                     'вы', 'выд', 'вый', 'вь', 'вэ', 'вю', 'вя', 'га', 'гад', 'гар', 'гард', 'гат', 'ге', 'гё', 'ги',
-                     'гим', 'гин', 'го', 'год', 'горд', 'гу', 'гум', 'гус', 'гусь', 'гъ', 'гы', 'гь', 'гэ', 'гю', 'гюс',
-                     'гя', 'да', 'дам', 'дар', 'де', 'дё', 'ди', 'до', 'доз', 'ду', 'дъ', 'ды', 'дыб', 'дым', 'дыр',
-                     'дь', 'дэ', 'дю', 'дя', 'еа', 'еб', 'ёб', 'ебь', 'ев', 'ёв', 'евь', 'ег', 'ёг', 'егь', 'ед', 'ёд',
-                     'едь', 'ее', 'её', 'еж', 'ёж', 'ежь', 'ез', 'ёз', 'езь', 'еи', 'ей', 'ёй', 'ек', 'ёк', 'екь', 'ел',
-                     'ёл', 'ель', 'ем', 'ём', 'емь', 'ен', 'ён', 'ень', 'ео', 'еп', 'ёп', 'ёпть', 'епь', 'ер', 'ёр',
-                     'ерь', 'ес', 'ёс', 'есь', 'ет', 'ёт', 'еть', 'еу', 'еф', 'ёф', 'ефь', 'ех', 'ёх', 'ехь', 'ец',
-                     'ёц', 'ець', 'еч', 'ёч', 'ечь', 'еш', 'ёш', 'ешь', 'ещ', 'ёщ', 'ещь', 'ею', 'ея', 'жа', 'же', 'жё',
-                     'жест', 'жи', 'жо', 'жу', 'жъ', 'жы', 'жь', 'жэ', 'жю', 'жя', 'за', 'зе', 'зё', 'зи', 'зо', 'зу',
-                     'зъ', 'зы', 'зь', 'зэ', 'зю', 'зя', 'иб', 'ив', 'иг', 'ид', 'иж', 'из', 'ии', 'ий', 'ик', 'ил',
-                     'им', 'ин', 'ип', 'ир', 'ис', 'ит', 'ить', 'иф', 'их', 'иц', 'ич', 'иш', 'ищ', 'ия', 'йод', 'ка',
-                     'кар', 'ке', 'кё', 'ки', 'ко', 'ком', 'коч', 'ку', 'къ', 'кы', 'кь', 'кэ', 'кю', 'кя', 'ла', 'ле',
-                     'лё', 'лен', 'ли', 'ло', 'лов', 'лон', 'лу', 'лъ', 'лы', 'ль', 'лэ', 'лю', 'люк', 'ля', 'ляж',
-                     'ляжь', 'ма', 'мат', 'ме', 'мё', 'мед', 'мёд', 'ми', 'мн', 'мо', 'мод', 'мож', 'мон', 'монт',
-                     'мор', 'му', 'муж', 'мъ', 'мы', 'мыт', 'мь', 'мэ', 'мю', 'мя', 'мят', 'на', 'нг', 'не', 'нё', 'ни',
-                     'но', 'нов', 'ной', 'ну', 'нъ', 'ны', 'ный', 'нь', 'нэ', 'ню', 'ня', 'об', 'ов', 'ог', 'од', 'ое',
-                     'ож', 'оз', 'ой', 'ок', 'ол', 'ом', 'он', 'оо', 'оп', 'ор', 'ос', 'от', 'оу', 'оф', 'ох', 'оц',
-                     'оч', 'ош', 'ощ', 'па', 'пас', 'пе', 'пё', 'пёр', 'пёс', 'печь', 'пи', 'по', 'пол', 'порт', 'пру',
-                     'прус', 'прусь', 'прян', 'пси', 'пу', 'пъ', 'пы', 'пь', 'пьян', 'пэ', 'пю', 'пя', 'ра', 'раб',
-                     'раж', 'раз', 'рап', 'рас', 'рат', 'ре', 'рё', 'реп', 'ри', 'ро', 'роч', 'ру', 'руль', 'рус',
-                     'русь', 'ръ', 'ры', 'рь', 'рэ', 'рэп', 'рю', 'ря', 'са', 'свеж', 'се', 'сё', 'сен', 'си', 'ска',
-                     'сказ', 'ский', 'ской', 'ску', 'скуй', 'сло', 'сме', 'сне', 'снег', 'со', 'сол', 'солн', 'степ',
-                     'степь', 'стэп', 'су', 'суп', 'съ', 'сы', 'сын', 'сь', 'сэ', 'сю', 'ся', 'та', 'тать', 'таю', 'те',
-                     'тё', 'тес', 'ти', 'то', 'тор', 'ту', 'тъ', 'ты', 'ть', 'тэ', 'тю', 'тя', 'уб', 'ув', 'уг', 'уд',
-                     'уж', 'уз', 'уй', 'ук', 'ул', 'ум', 'ун', 'уп', 'ур', 'ус', 'ут', 'уу', 'уф', 'ух', 'уц', 'уч',
-                     'уш', 'ущ', 'ф', 'фа', 'фе', 'фё', 'фи', 'фит', 'фо', 'фу', 'фъ', 'фы', 'фь', 'фэ', 'фю', 'фя',
-                     'ха', 'хе', 'хё', 'хи', 'хит', 'хо', 'ху', 'хуй', 'хъ', 'хы', 'хь', 'хэ', 'хю', 'хя', 'ца', 'цап',
-                     'це', 'цё', 'ци', 'цип', 'цо', 'цу', 'цъ', 'цы', 'ць', 'цэ', 'цю', 'ця', 'ча', 'че', 'чё', 'чел',
-                     'чи', 'чист', 'чка', 'чо', 'чу', 'чъ', 'чы', 'чь', 'чэ', 'чю', 'чя', 'ша', 'ше', 'шё', 'ши', 'шо',
-                     'шу', 'шъ', 'шы', 'шь', 'шэ', 'шю', 'шя', 'ща', 'ще', 'щё', 'щёт', 'щи', 'що', 'щу', 'щъ', 'щы',
-                     'щь', 'щэ', 'щю', 'щя', 'ъ', 'ыб', 'ыв', 'ыг', 'ыд', 'ыж', 'ыз', 'ый', 'ык', 'ыл', 'ым', 'ын',
-                     'ып', 'ыр', 'ыс', 'ыт', 'ыф', 'ых', 'ыц', 'ыч', 'ыш', 'ыщ', 'ь', 'эб', 'эв', 'эвр', 'эг', 'эд',
-                     'эж', 'эз', 'эи', 'эй', 'эк', 'эл', 'эм', 'эн', 'эп', 'эр', 'эс', 'эт', 'эф', 'эх', 'эц', 'эч',
-                     'эш', 'эщ', 'юб', 'юв', 'юг', 'юд', 'юж', 'юз', 'юй', 'юк', 'юл', 'юм', 'юн', 'юп', 'юр', 'юс',
-                     'ют', 'юф', 'юх', 'юц', 'юч', 'юш', 'ющ', 'юя', 'яб', 'яв', 'яг', 'яд', 'яж', 'яз', 'яй', 'як',
-                     'ял', 'ям', 'ян', 'яп', 'яр', 'яс', 'ят', 'яу', 'яф', 'ях', 'яц', 'яч', 'яш', 'ящ', 'яю', 'яя',
-                     ]
-
-        syllables = list(set(syllables))  # removal of duplicates (if any)
-        syllables.sort()
-
-        if skip_censored:
-            for syllable in censored_list:
-                syllables.remove(syllable)
+        syllables = list(SYLLABLE_INDEX.select(skip_censored=skip_censored))
 
         if shuffle:
-            random.shuffle(syllables)
+            self.rng.shuffle(syllables)
 
         return syllables
@@ -1,19 +1,26 @@
+import argparse
 import math
 import random
-from functools import partial
+import sys
+from functools import partial, lru_cache
 import logging
 from datetime import datetime
 from collections import OrderedDict
 
-from PySide6.QtGui import QMouseEvent, QFont, QKeyEvent
-from PySide6.QtWidgets import QApplication, QMainWindow, QLabel, QWidget, QTableWidgetItem, QTableWidget, QGridLayout, \
-    QVBoxLayout, QSpacerItem, QSizePolicy, QAbstractItemView, QSpinBox, QAbstractSpinBox, QPushButton
-from PySide6.QtCore import Qt
-
-from screeninfo import get_monitors  # custom library https://github.com/rr-/screeninfo
+from PySide6.QtGui import QMouseEvent, QFont, QKeyEvent, QFontMetrics, QColor, QPalette, QPixmap, QPainter
+from PySide6.QtWidgets import QApplication, QMainWindow, QLabel, QWidget, QTableView, QGridLayout, QVBoxLayout, \
+    QSpacerItem, QSizePolicy, QAbstractItemView, QSpinBox, QAbstractSpinBox, QPushButton, QHeaderView, QStyle, \
+    QListView, QStyledItemDelegate, QFrame
+from PySide6.QtCore import Qt, QAbstractTableModel, QAbstractListModel, QModelIndex, QRect, QSize, \
+    QSortFilterProxyModel, QPoint, QTimer
 
 from task import Task
-from generate import GenerateTasks
+from generate import generatePool, randomSource, unseenFirst
+from task_index import TaskIndex
+from exam import ExamSession, AdaptiveExamSession, TIME_RANGES, timeRange, summarize
+from answer_log import AnswerLogPipeline, flushLogs
+from fact_matrix import getFactMatrix, useFactMatrix, defaultCacheFile
+from instrumentation import timed, profiled
 
 
 def findMainWindow() -> QMainWindow or None:
@@ -29,7 +36,10 @@ def findMainWindow() -> QMainWindow or None:
     return None
 
 
+@lru_cache(maxsize=None)
 def getMonitorResolution():
+    """Resolution of the primary monitor. The monitors are enumerated only once per run."""
+    from screeninfo import get_monitors  # custom library https://github.com/rr-/screeninfo, imported on first use
     for monitor in get_monitors():
         if monitor.is_primary:
             return monitor.width, monitor.height
@@ -43,10 +53,28 @@ def adjustFontSize(current_font_size):
     return resized_font_size
 
 
+def taskLabelText(task: Task) -> str:
+    """Text of the exam task label, e.g. '2,5 × 4 = '."""
+    task.dot2comma = True
+    return str(task).replace('*', '×')
+
+
 class MainWindow(QMainWindow):
 
-    def __init__(self):
+    def __init__(self, adaptive=False, rng=random, learner_store=None, pixmap_labels=False):
+        """
+        :param adaptive: True - tasks are chosen by the spaced repetition scheduler, its state is kept in
+        `scheduler_<pool>.json` files between runs
+        :param rng: Source of randomness of the pools and the task order, see `generate.randomSource`
+        :param learner_store: `LearnerStore` that keeps the answers of every exam, None - answers are only logged
+        :param pixmap_labels: True - the exam task labels are rendered to pixmaps before the exam, see `ExamWindow`
+        """
         super().__init__()
+        self.adaptive = adaptive
+        self.pixmap_labels = pixmap_labels
+        self.rng = randomSource(rng)
+        self.learner_store = learner_store
+        self.task_pools = {}  # pools are generated on the first click, see `taskPool`
         self.multiplication_table_window = None
         self.exam_window = None
         self.setWindowTitle(' ')
@@ -96,20 +124,29 @@ class MainWindow(QMainWindow):
     def configureButtons(self):
         self.memorizeLabel.mousePressEvent = self.showMultiplicationTable
 
-        tasks_summ = GenerateTasks().sum(list(range(1, 11)), limit=10)  # summing in range 0-10 max answer 10
-        tasks_difference = GenerateTasks().difference(list(range(10, 1, -1)))  # difference in rng 10-1, max minuend 10
-        tasks_multiply = GenerateTasks().multiplication(list(range(2, 10)))  # multiplying in range 2-9
-        tasks_division = GenerateTasks().division(list(range(9, 1, -1)))  # division in range 9-2
+        self.sum_label.mousePressEvent = partial(self.startTheTest, 'sum', '? + ? = ')
+        self.difference_label.mousePressEvent = partial(self.startTheTest, 'difference', '? - ? = ')
+        self.multiply_label.mousePressEvent = partial(self.startTheTest, 'multiplication', '? × ? = ')
+        self.devision_label.mousePressEvent = partial(self.startTheTest, 'division', '? ÷ ? = ')
 
-        self.sum_label.mousePressEvent = partial(self.startTheTest, tasks_summ, '? + ? = ')
-        self.difference_label.mousePressEvent = partial(self.startTheTest, tasks_difference, '? - ? = ')
-        self.multiply_label.mousePressEvent = partial(self.startTheTest, tasks_multiply, '? × ? = ')
-        self.devision_label.mousePressEvent = partial(self.startTheTest, tasks_division, '? ÷ ? = ')
+    def taskPool(self, pool_name) -> [Task]:
+        """The pool of tasks, generated on the first request and reused afterwards."""
+        if pool_name not in self.task_pools:
+            self.task_pools[pool_name] = generatePool(pool_name, rng=self.rng)
+        return self.task_pools[pool_name]
 
     # noinspection PyUnusedLocal
-    def startTheTest(self, tasks: [Task], start_label_text, event: QMouseEvent):
-        random.shuffle(tasks)
-        self.exam_window = ExamWindow(tasks, start_label_text)
+    def startTheTest(self, pool_name, start_label_text, event: QMouseEvent):
+        tasks = self.taskPool(pool_name)
+        session = None
+        if self.adaptive:
+            from scheduler import SpacedRepetitionScheduler  # only needed in the adaptive mode
+            scheduler = SpacedRepetitionScheduler(tasks, state_file=f'scheduler_{pool_name}.json', rng=self.rng)
+            session = AdaptiveExamSession(scheduler, max_tasks=2 * len(tasks))
+        self.rng.shuffle(tasks)
+        if self.learner_store is not None:
+            unseenFirst(tasks, self.learner_store.coverage())
+        self.exam_window = ExamWindow(tasks, start_label_text, session, self.learner_store, self.pixmap_labels)
         self.exam_window.showMaximized()
         self.hide()
 
@@ -124,15 +161,83 @@ class MainWindow(QMainWindow):
             self.close()
 
 
+class MultiplicationTableModel(QAbstractTableModel):
+    """
+    Read-only model of the multiplication table. Every cell is a group of tasks with the same first multiplier,
+    its text is computed on demand (only for the cells the view paints) and cached.
+    """
+    NO_BREAK_SPACE = '\u00a0'
+    NEW_LINE = '\n'
+
+    def __init__(self, min_multiplier, max_multiplier, columns, parent=None):
+        """
+        :param min_multiplier: First multiplier of the first cell
+        :param max_multiplier: First multiplier of the last cell
+        :param columns: Number of cells in one row
+        """
+        super().__init__(parent)
+        self.min_multiplier = min_multiplier
+        self.max_multiplier = max_multiplier
+        # second multipliers go up to 9 at least, like in `GenerateTasks.multiplication`
+        self.last_multiplier = max(max_multiplier, 9)
+        self.groups_count = max_multiplier - min_multiplier + 1
+        self.columns = max(1, min(columns, self.groups_count))
+        self._texts = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return math.ceil(self.groups_count / self.columns)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.columns
+
+    def multiplierAt(self, row, column):
+        """First multiplier of the cell or None for empty cells in the last row."""
+        multiplier = self.min_multiplier + row * self.columns + column
+        if multiplier > self.max_multiplier:
+            return None
+        return multiplier
+
+    def cellText(self, multiplier):
+        text = self._texts.get(multiplier)
+        if text is None:
+            suffix = self.NO_BREAK_SPACE * 3 + self.NEW_LINE
+            facts = getFactMatrix()
+
+            def product(second):
+                result = None if facts is None else facts.result(multiplier, '*', second)
+                return multiplier * second if result is None else result  # None - bigger than the matrix range
+
+            text = ''.join(f'{multiplier} × {second} = {product(second)}{suffix}'
+                           for second in range(max(multiplier, 2), self.last_multiplier + 1))
+            self._texts[multiplier] = text
+        return text
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            multiplier = self.multiplierAt(index.row(), index.column())
+            if multiplier is None:
+                return None
+            return self.cellText(multiplier)
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignBottom)
+        return None
+
+
 # noinspection PyUnresolvedReferences
 # noinspection PyMethodMayBeStatic
 class MultiplicationTableWindow(QWidget):
     def __init__(self, min_multiplier, max_multiplier):
 
         super().__init__()
-        self.table = QTableWidget(self)
+        self.table = QTableView(self)
         # noinspection PyUnresolvedReferences
-        self.table.setSizeAdjustPolicy(QTableWidget.AdjustToContents)
+        self.table.setSizeAdjustPolicy(QTableView.AdjustToContents)
         self.table.setShowGrid(False)
         self.table.verticalHeader().hide()
         self.table.horizontalHeader().hide()
@@ -148,7 +253,7 @@ class MultiplicationTableWindow(QWidget):
         self.table.setFont(QFont('Arial', resized_font_size))
 
         self.showMaximized()
-        self.initUI(min_multiplier, max_multiplier + 1)
+        self.initUI(min_multiplier, max_multiplier)
 
     def closeEvent(self, event):
         """
@@ -163,11 +268,10 @@ class MultiplicationTableWindow(QWidget):
 
     def initUI(self, min_multiplier, max_multiplier):
         maximum_columns_in_the_row = 8
-        max_rows = math.ceil((max_multiplier - min_multiplier) / maximum_columns_in_the_row)
 
         self.setWindowTitle(" ")
-        self.generateTableSize(min_multiplier, max_multiplier, max_rows)
-        self.fill_table(min_multiplier, max_multiplier)
+        self.model = MultiplicationTableModel(min_multiplier, max_multiplier, maximum_columns_in_the_row, self)
+        self.table.setModel(self.model)
 
         # create layout
         vbox = QVBoxLayout()
@@ -182,63 +286,25 @@ class MultiplicationTableWindow(QWidget):
         vbox.addStretch()
 
         # auto sizing
-        self.setAlignment()
-        self.table.resizeColumnsToContents()
-        self.table.resizeRowsToContents()
+        self.generateTableSize()
         self.adjustSize()
 
-    def generateTableSize(self, min_multiplier, max_multiplier, rows_number):
-        columns_number = (max_multiplier - min_multiplier) / rows_number
-        remainder = (max_multiplier - min_multiplier) % rows_number
-        if remainder != 0:
-            rows_number += 1
-        self.table.setColumnCount(columns_number)
-        self.table.setRowCount(rows_number)
-
-    def groupTasksByMultiplier(self, tasks: [Task], reverse_tasks=False):
-        groups = {}
-        SPACE = ' '
-        if reverse_tasks:
-            tasks.reverse()
-        for num, task in enumerate(tasks):
-            multiplier1 = str(task).split(SPACE)[0]
-            if multiplier1 not in groups:
-                groups[multiplier1] = []
-            groups[multiplier1].append(task)
-            # print(str(task) + str(task.solve()))
-        return groups
-
-    def fill_table(self, min_multiplier, max_multiplier):
-        NO_BREAK_SPACE = ' '
-        NEW_LINE = '\n'
-        column_max, row_max = self.table.columnCount(), self.table.rowCount()
-        multipliers = list(range(2, max_multiplier))
-        generate = GenerateTasks()
-        tasks = generate.multiplication(multipliers, shuffle=False)
-        groups = self.groupTasksByMultiplier(tasks)
-
-        row, column = 0, 0
-        for group_number in range(min_multiplier, max_multiplier):
-            tasks_list = groups[str(group_number)]
-            text = ''
-            for task in tasks_list:
-                text += str(task) + str(task.solve()) + NO_BREAK_SPACE * 3 + NEW_LINE
-            text = text.replace('*', '×')
-            item = QTableWidgetItem(text)
-            self.table.setItem(row, column, item)
-
-            if column < column_max - 1:
-                column += 1
-            else:
-                row += 1
-                column = 0
-
-    def setAlignment(self):
-        for i in range(self.table.rowCount()):
-            for j in range(self.table.columnCount()):
-                item = self.table.item(i, j)
-                if item is not None:
-                    item.setTextAlignment(Qt.AlignLeft | Qt.AlignBottom)
+    def generateTableSize(self):
+        """
+        Give all cells the size of the biggest one. The size is measured on two cells only, so it does not depend
+        on the size of the table (unlike `resizeColumnsToContents()`).
+        """
+        metrics = QFontMetrics(self.table.font())
+        margin = 2 * self.table.style().pixelMetric(QStyle.PM_FocusFrameHMargin, None, self.table) + 2
+        widest_line = self.model.cellText(self.model.max_multiplier).split(self.model.NEW_LINE)[-2]
+        tallest_cell = self.model.cellText(self.model.min_multiplier)
+        width = metrics.horizontalAdvance(widest_line) + margin
+        height = metrics.boundingRect(QRect(0, 0, width, 0), Qt.AlignLeft, tallest_cell).height() + margin
+
+        for header, size in ((self.table.horizontalHeader(), width), (self.table.verticalHeader(), height)):
+            header.setMinimumSectionSize(1)
+            header.setSectionResizeMode(QHeaderView.Fixed)
+            header.setDefaultSectionSize(size)
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
@@ -249,15 +315,25 @@ class MultiplicationTableWindow(QWidget):
 # noinspection PyMethodMayBeStatic
 class ExamWindow(QWidget):
 
-    def __init__(self, tasks: [Task], start_label_text):
+    def __init__(self, tasks: [Task], start_label_text, session: ExamSession = None, learner_store=None,
+                 pixmap_labels=False):
+        """
+        :param tasks: Tasks in the order they will be asked (all tasks the session can ask)
+        :param start_label_text: Text shown before the exam starts
+        :param session: Exam state, None - a plain `ExamSession` over `tasks`
+        :param learner_store: `LearnerStore` to save the answers to, None - answers are only logged
+        :param pixmap_labels: True - the task texts are drawn to pixmaps before the exam, a task switch only shows
+        a ready pixmap instead of laying out the 80 pt text
+        """
         super().__init__()
         self.results_window = None
+        self.learner_store = learner_store
+        self.stored_answers = 0  # `session.answered` already saved to the learner store
         self.setWindowTitle(' ')
         self.main_widget = QWidget()
 
-        self.tasks = tasks
-        self.current_task_number = None
-        self.current_task = None
+        self.session = ExamSession(tasks) if session is None else session
+        self.tasks = self.session.tasks
 
         # create layout
         self.vbox = QGridLayout(self.main_widget)
@@ -272,11 +348,13 @@ class ExamWindow(QWidget):
         self.answer.setSpecialValueText(' ')
         self.answer.setButtonSymbols(QAbstractSpinBox.NoButtons)  # hide spinbox arrows
         self.answer.setMaximum(1000)
+        # only edits made by the user, not `setValue()`
+        self.answer.lineEdit().textEdited.connect(self.session.keyPressed)
 
         self.nextTaskLabel = QLabel()
         self.stopLabel = QLabel()
         self.tasks_left_label = QLabel()
-        self.tasks_left_label.setText(f'0/{len(self.tasks)}')
+        self.tasks_left_label.setText(f'0/{self.session.total}')
 
         # add items
         self.adjustSize()
@@ -292,6 +370,39 @@ class ExamWindow(QWidget):
             widget.setAlignment(Qt.AlignCenter)
             widget.setFont(QFont('Arial', 80))
 
+        # The texts of all tasks are formatted before the exam and the changing labels get fixed sizes that fit every
+        # text, so a task switch only repaints the labels and does not lay out the window again
+        self.task_texts = {task.task_string: taskLabelText(task) for task in tasks}
+        self.fixLabelSize(self.task_label, [start_label_text, *self.task_texts.values()])
+        self.fixLabelSize(self.tasks_left_label, [f'{self.session.total}/{self.session.total}'])
+        self.task_pixmaps = {}
+        if pixmap_labels:
+            self.task_pixmaps = {task_string: self.renderLabel(self.task_label, text)
+                                 for task_string, text in self.task_texts.items()}
+
+    def fixLabelSize(self, label: QLabel, texts: list[str]):
+        """Fix the size of the label to the size of its longest text."""
+        current_text = label.text()
+        sizes = []
+        for text in texts:
+            label.setText(text)
+            sizes.append(label.sizeHint())
+        label.setText(current_text)
+        label.setFixedSize(max(size.width() for size in sizes), max(size.height() for size in sizes))
+
+    def renderLabel(self, label: QLabel, text: str) -> QPixmap:
+        """The text drawn like the label draws it, in the size of the label."""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(label.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setFont(label.font())
+        painter.setPen(label.palette().color(QPalette.WindowText))
+        painter.drawText(QRect(QPoint(), label.size()), label.alignment(), text)
+        painter.end()
+        return pixmap
+
     def configureIcons(self):
         self.nextTaskLabel.setText('⏩')
         self.stopLabel.setText('⏹')
@@ -299,26 +410,30 @@ class ExamWindow(QWidget):
         self.nextTaskLabel.mousePressEvent = self.nextTaskPressed
         self.stopLabel.mousePressEvent = self.stopPressed
 
+    @property
+    def current_task(self):
+        return self.session.current_task
+
+    @property
+    def current_task_number(self):
+        return self.session.current_task_number
+
+    @timed('ExamWindow.updateTaskLabel')
     def updateTaskLabel(self):
-        self.current_task.dot2comma = True
-        task_string = str(self.current_task).replace('*', '×')
-        self.task_label.setText(task_string)
-
-    def nextTask(self):
-        if self.current_task_number is None:
-            self.current_task_number = 0
-            self.current_task = self.tasks[self.current_task_number]
+        task_string = self.current_task.task_string
+        pixmap = self.task_pixmaps.get(task_string)
+        if pixmap is not None:
+            self.task_label.setPixmap(pixmap)
         else:
-            max_number = len(self.tasks) - 1
-            if self.current_task_number < max_number:
-                self.current_task_number += 1
-                self.current_task = self.tasks[self.current_task_number]
+            self.task_label.setText(self.task_texts.get(task_string) or taskLabelText(self.current_task))
 
     # noinspection PyUnusedLocal
+    @timed('ExamWindow.nextTaskPressed')
     def nextTaskPressed(self, event: QMouseEvent | QKeyEvent):
-        if self.current_task is None:  # If the exam has just begun
+        if not self.session.started:  # If the exam has just begun
             self.answer.setEnabled(True)
             self.answer.setFocus()
+            self.session.start()
         else:
 
             # do nothing if no new value is entered
@@ -328,30 +443,28 @@ class ExamWindow(QWidget):
                 else:
                     return
 
-            self.current_task.stopTimer()
-            self.current_task.user_answer = self.answer.value()
-            logging.info(' '.join(str(x) for x in [self.current_task,
-                                                   self.current_task.solve(),
-                                                   self.current_task.user_answer,
-                                                   self.current_task.isCorrect(),
-                                                   self.current_task.time_elapsed,
-                                                   ]))
+            self.session.answer(self.answer.value())
 
             # If it was the last task - show results
-            if self.current_task_number + 1 == len(self.tasks):
-                sorted_tasks = self.tasks.copy()
-                sorted_tasks.sort()
-                self.results_window = ResultsWindow(sorted_tasks, self)
-                self.results_window.show()
+            if self.session.finished:
+                self.storeAnswers()
+                self.task_pixmaps = {}  # about 8 MiB at 80 pt, not needed any more
+                self.results_window = ResultsWindow(self.session.taskIndex(), self)
+                self.results_window.showMaximized()
                 self.hide()
+                return
 
-        self.nextTask()
         self.updateTaskLabel()
-        self.tasks_left_label.setText(f'{self.current_task_number + 1}/{len(self.tasks)}')
+        self.tasks_left_label.setText(f'{self.current_task_number + 1}/{self.session.total}')
         self.answer.setValue(0)
         self.answer.selectAll()
         self.answer.setFocus()
-        self.current_task.startTimer()
+
+    def storeAnswers(self):
+        """Save the answers given since the last call to the learner store in one batch."""
+        if self.learner_store is not None and self.stored_answers < len(self.session.answered):
+            self.learner_store.recordAnswers(self.session.answered[self.stored_answers:])
+            self.stored_answers = len(self.session.answered)
 
     def cycleSymbols(self, qlabel: QLabel, symbols: str):
         """
@@ -385,50 +498,171 @@ class ExamWindow(QWidget):
         :param event:
         :return:
         """
+        flushLogs()
+        self.storeAnswers()  # an interrupted exam
+        self.session.save()
+        self.task_pixmaps = {}
         main_window = findMainWindow()
         if main_window is not None:
             main_window.show()
         event.accept()
 
 
+class ResultsModel(QAbstractListModel):
+    """
+    One row per answered task. The row texts are built on demand (only for the rows the view paints) and cached.
+    """
+    SegmentsRole = Qt.UserRole  # [(text, color name or None), ...] painted by `ResultsDelegate`
+    CorrectRole = Qt.UserRole + 1
+    TimeRangeRole = Qt.UserRole + 2
+    TimeRole = Qt.UserRole + 3
+    OrderRole = Qt.UserRole + 4
+    FirstKeyRole = Qt.UserRole + 5
+    ThinkTimeRole = Qt.UserRole + 6
+
+    def __init__(self, tasks: [Task], parent=None):
+        super().__init__(parent)
+        self.tasks = tasks
+        self._segments = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.tasks)
+
+    def segments(self, row):
+        segments = self._segments.get(row)
+        if segments is None:
+            task = self.tasks[row]
+            results_color = 'green' if task.isCorrect() else 'red'
+            time_color = TIME_RANGES[timeRange(task.time_elapsed)][2]
+            segments = [(f'{task}{task.solve()} ', None),
+                        (f'({task.user_answer})', results_color),
+                        (f'⌛ {task.time_elapsed:.2f}', time_color),
+                        ]
+            self._segments[row] = segments
+        return segments
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        task = self.tasks[index.row()]
+        if role == Qt.DisplayRole:
+            return ''.join(text for text, _ in self.segments(index.row()))
+        if role == self.SegmentsRole:
+            return self.segments(index.row())
+        if role == self.CorrectRole:
+            return task.isCorrect()
+        if role == self.TimeRangeRole:
+            return timeRange(task.time_elapsed)
+        if role == self.TimeRole:
+            return task.time_elapsed
+        if role == self.OrderRole:
+            return index.row()
+        if role == self.FirstKeyRole:
+            return task.first_key_latency
+        if role == self.ThinkTimeRole:
+            return task.think_time
+        if role == Qt.ToolTipRole:
+            return '\n'.join(f'{name}: {value:.3f} s' for name, value in (('⌨', task.first_key_latency),
+                                                                          ('✎', task.think_time),
+                                                                          ('⏎', task.time_elapsed))
+                             if value is not None)
+        return None
+
+
+class ResultsFilterModel(QSortFilterProxyModel):
+    """Filters ('all', 'errors', 'slow') and sorting of the results without rebuilding any widgets."""
+    FILTERS = ('all', 'errors', 'slow')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.filter_name = 'all'
+
+    def setFilterName(self, filter_name):
+        self.filter_name = filter_name
+        self.invalidateFilter()
+
+    def nextFilter(self):
+        self.setFilterName(self.FILTERS[(self.FILTERS.index(self.filter_name) + 1) % len(self.FILTERS)])
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.filter_name == 'all':
+            return True
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        if self.filter_name == 'errors':
+            return not index.data(ResultsModel.CorrectRole)
+        return index.data(ResultsModel.TimeRangeRole) == 'slow'
+
+
+class ResultsDelegate(QStyledItemDelegate):
+    """Paints the colored parts of a results row, all rows have the same size."""
+
+    def __init__(self, font: QFont, row_size: QSize, parent=None):
+        super().__init__(parent)
+        self.font = font
+        self.row_size = row_size
+        self.metrics = QFontMetrics(font)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setFont(self.font)
+        x = option.rect.x()
+        baseline = option.rect.y() + (option.rect.height() + self.metrics.ascent() - self.metrics.descent()) // 2
+        for text, color in index.data(ResultsModel.SegmentsRole):
+            painter.setPen(option.palette.color(QPalette.Text) if color is None else QColor(color))
+            painter.drawText(x, baseline, text)
+            x += self.metrics.horizontalAdvance(text)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return self.row_size
+
+
 class ResultsWindow(QWidget):
+    """
+    Results of the exam. Click the summary line or press A / E / S to show all results, only errors or only slow
+    answers, press T to sort by time and O to restore the original order.
+    """
 
-    def __init__(self, tasks: [Task], exam_window_class: QWidget):
+    @timed('ResultsWindow.__init__')
+    def __init__(self, task_index: TaskIndex, exam_window_class: QWidget):
+        """
+        :param task_index: Index of the tasks of the exam, see `ExamSession.taskIndex`
+        :param exam_window_class: Exam window
+        """
         super().__init__()
         self.setWindowTitle(' ')
         self.main_widget = QWidget()
 
-        self.tasks = tasks
+        self.task_index = task_index
+        tasks = self.tasks = task_index.ordered
         self.exam_window_class = exam_window_class
-        self.time_ranges = {'fast': [0, 5, 'green'],
-                            'medium': [5, 10, 'orange'],
-                            'slow': [10, float('inf'), 'red'],
-                            }
-
-        self.results_summary_count = {'correct': 0,
-                                      'incorrect': 0,
-                                      'fast': 0,
-                                      'medium': 0,
-                                      'slow': 0,
-                                      }
+        self.time_ranges = TIME_RANGES
+        self.results_summary_count = summarize(tasks)
 
         # create layout
         self.vbox = QGridLayout(self.main_widget)
         self.setLayout(self.vbox)
         self.vbox.setAlignment(Qt.AlignCenter)
 
-        # create widgets
-        results = self.generateResultsStrings()
-
-        column = 0
-        for num, line in enumerate(results, start=1):
-            column = math.ceil(num / 10) - 1
-            row = 2 + num - column * 10
-            self.results_label = QLabel()
-            self.results_label.setText(line)
-            self.vbox.addWidget(self.results_label, row, column)
-            self.results_label.setAlignment(Qt.AlignLeft)
-            self.results_label.setFont(QFont('Arial', 16))
+        # create models and the view, results flow in columns like the previous grid of labels
+        font = QFont('Arial', 16)
+        self.results_model = ResultsModel(tasks, self)
+        self.filter_model = ResultsFilterModel(self)
+        self.filter_model.setSourceModel(self.results_model)
+        self.results_view = QListView()
+        self.results_view.setModel(self.filter_model)
+        self.results_view.setItemDelegate(ResultsDelegate(font, self.resultsRowSize(font), self.results_view))
+        self.results_view.setUniformItemSizes(True)
+        self.results_view.setFlow(QListView.TopToBottom)
+        self.results_view.setWrapping(True)
+        self.results_view.setResizeMode(QListView.Adjust)
+        self.results_view.setSpacing(4)
+        self.results_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.results_view.setFocusPolicy(Qt.NoFocus)
+        self.results_view.setFrameShape(QFrame.NoFrame)
+        self.vbox.addWidget(self.results_view, 1, 0)
 
         # summary label
         SEPARATOR = '&nbsp;' * 3
@@ -441,41 +675,42 @@ class ResultsWindow(QWidget):
             f"⌛ <span style='color: {'red'};'> {self.results_summary_count['slow']} </span>{SEPARATOR}"
 
         )
-        self.vbox.addWidget(self.summary_results_label, 0, 0, 1, column + 1)
+        self.vbox.addWidget(self.summary_results_label, 0, 0)
         self.summary_results_label.setAlignment(Qt.AlignTop | Qt.AlignHCenter)
-        self.summary_results_label.setFont(QFont('Arial', 16))
-
-    def generateResultsStrings(self):
-        lines = []
-
-        for task in self.tasks:
-
-            # colorizing results
-            if task.isCorrect():
-                results_color = 'green'
-                self.results_summary_count['correct'] += 1
-            else:
-                results_color = 'red'
-                self.results_summary_count['incorrect'] += 1
-
-            # colorizing elapsed time
-            time_color = None
-            for key in self.time_ranges.keys():
-                if self.time_ranges[key][0] <= task.time_elapsed <= self.time_ranges[key][1]:
-                    time_color = self.time_ranges[key][2]
-                    self.results_summary_count[key] += 1
-                    break
-            assert time_color is not None
-
-            task_line = f'{str(task)}{task.solve()}'
-            user_anser_line = f"({str(task.user_answer)})"
-            colored_line = f"{task_line} <span style='color: {results_color};'>{user_anser_line}</span>"
-            colored_time = f"<span style='color: {time_color};'>⌛ {task.time_elapsed}</span>"
-
-            lines.append(colored_line + colored_time)
-        return lines
+        self.summary_results_label.setFont(font)
+        self.summary_results_label.mousePressEvent = self.summaryPressed
+        errors = task_index.errorsByFirstOperand()
+        if errors:
+            self.summary_results_label.setToolTip('❌ ' + ', '.join(f'{operand}: {count}' for
+                                                                   operand, count in errors.items()))
+
+    def resultsRowSize(self, font: QFont) -> QSize:
+        """Size of the longest possible row, measured without building the rows."""
+        metrics = QFontMetrics(font)
+        longest_task = max(self.tasks, key=lambda task: len(task.task_string), default=None)
+        answered = [task for task in self.tasks if task.time_elapsed is not None]
+        widest_answer = max((len(str(task.user_answer)) for task in answered), default=1)
+        slowest = max((task.time_elapsed for task in answered), default=0.0)
+        sample = '' if longest_task is None else \
+            f'{longest_task}{longest_task.solve()} ({"0" * widest_answer})⌛ {slowest:.2f}'
+        return QSize(metrics.horizontalAdvance(sample) + metrics.averageCharWidth() * 2, metrics.height())
+
+    # noinspection PyUnusedLocal
+    def summaryPressed(self, event: QMouseEvent):
+        self.filter_model.nextFilter()
+
+    def sortResults(self, role):
+        self.filter_model.setSortRole(role)
+        self.filter_model.sort(0, Qt.DescendingOrder if role == ResultsModel.TimeRole else Qt.AscendingOrder)
 
     def keyPressEvent(self, event):
+        filters = {Qt.Key_A: 'all', Qt.Key_E: 'errors', Qt.Key_S: 'slow'}
+        if event.key() in filters:
+            self.filter_model.setFilterName(filters[event.key()])
+        if event.key() == Qt.Key_T:
+            self.sortResults(ResultsModel.TimeRole)
+        if event.key() == Qt.Key_O:
+            self.sortResults(ResultsModel.OrderRole)
         if event.key() == Qt.Key_Escape:
             self.close()
 
@@ -488,16 +723,38 @@ class ResultsWindow(QWidget):
         main_window = findMainWindow()
         if main_window is not None:
             main_window.show()
-        self.exam_window_class.close()
+        self.exam_window_class.close()  # flushes the answer log
         event.accept()
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Multiplication table for children',
+                                     epilog='Set TASKS_METRICS=metrics.prom (or .json) to collect timing metrics.')
+    parser.add_argument('--adaptive', action='store_true', help='let a spaced repetition scheduler choose the tasks')
+    parser.add_argument('--seed', type=int, help='seed of the task order, the same seed gives the same exams')
+    parser.add_argument('--learner', help='keep the answers of the learner (see learner_store.py)')
+    parser.add_argument('--store', default='learner.db', help='SQLite database with the answers of all learners')
+    parser.add_argument('--pixmap-labels', action='store_true', help='draw the exam tasks to pixmaps before the exam')
+    parser.add_argument('--profile', choices=('cprofile', 'sample'), help='profile the whole session')
+    parser.add_argument('--profile-output', help='profiler output file (default: gui.prof or gui.stacks)')
+    args, qt_args = parser.parse_known_args()
+    profile_output = args.profile_output or ('gui.prof' if args.profile == 'cprofile' else 'gui.stacks')
+
     current_time = datetime.now()
     time_stamp = datetime.now().strftime('%Y.%m.%d_%H-%M-%S')
-    logging.basicConfig(level=logging.DEBUG, filename=f"py_log_{time_stamp}.log", filemode="w",
-                        format="%(asctime)s %(levelname)s %(message)s")
-    app = QApplication([])
-    window = MainWindow()
-    window.show()
-    app.exec()
+    log_pipeline = AnswerLogPipeline(f"py_log_{time_stamp}.log").start(level=logging.DEBUG)
+    learner_store = None
+    if args.learner is not None:
+        from learner_store import LearnerStore  # sqlite3 is imported only when the answers are kept
+        learner_store = LearnerStore(args.store, args.learner)
+    with profiled(args.profile, profile_output):
+        app = QApplication(sys.argv[:1] + qt_args)
+        window = MainWindow(adaptive=args.adaptive, rng=random if args.seed is None else args.seed,
+                            learner_store=learner_store, pixmap_labels=args.pixmap_labels)
+        window.show()
+        # built after the first paint, memory-mapped from ~/.cache/multiplication_table after the first run
+        QTimer.singleShot(0, partial(useFactMatrix, defaultCacheFile()))
+        app.exec()
+    log_pipeline.stop()
+    if learner_store is not None:
+        learner_store.close()
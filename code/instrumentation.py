@@ -0,0 +1,201 @@
+"""
+Opt-in runtime instrumentation: timing spans feeding counters and histograms, metrics export and profiling.
+
+Instrumentation is switched on by the `TASKS_METRICS` environment variable, it is read once at import time:
+
+    TASKS_METRICS=metrics.prom python gui.py    # Prometheus text format
+    TASKS_METRICS=metrics.json python gui.py    # JSON
+
+The metrics are written to that file when the process exits. With the variable unset `timed()` returns the decorated
+function itself, so the instrumented code runs exactly as if it was not instrumented.
+
+`profiled()` wraps a session in `cProfile` or in a small sampling profiler (see `python gui.py --help`).
+"""
+import atexit
+import bisect
+import collections
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+METRICS_FILE = os.environ.get('TASKS_METRICS') or None
+ENABLED = METRICS_FILE is not None
+
+# Upper bounds of the duration histogram buckets, seconds
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class SpanMetrics:
+    """Counters and the duration histogram of one span."""
+    __slots__ = ('calls', 'errors', 'total_seconds', 'max_seconds', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # the last one is +Inf
+
+    def observe(self, seconds: float, failed=False):
+        self.calls += 1
+        self.errors += failed
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def asDict(self) -> dict:
+        return {'calls': self.calls,
+                'errors': self.errors,
+                'total_seconds': self.total_seconds,
+                'max_seconds': self.max_seconds,
+                'buckets': dict(zip([*map(str, BUCKETS), '+Inf'], self.buckets)),
+                }
+
+
+_spans = collections.defaultdict(SpanMetrics)
+_lock = threading.Lock()  # spans are recorded both by the GUI thread and by the log writer thread
+
+
+def observe(name: str, seconds: float, failed=False):
+    """Record one execution of the span `name`."""
+    with _lock:
+        _spans[name].observe(seconds, failed)
+
+
+def timed(name: str):
+    """
+    Decorator: measure every call of the function as the span `name`.
+    If instrumentation is disabled the function is returned unchanged.
+    """
+    def decorator(function):
+        if not ENABLED:
+            return function
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            failed = True
+            try:
+                result = function(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                observe(name, (time.perf_counter_ns() - start) / 1e9, failed)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> dict:
+    """{span name: counters and histogram}"""
+    with _lock:
+        return {name: metrics.asDict() for name, metrics in sorted(_spans.items())}
+
+
+def prometheusText() -> str:
+    """All spans in the Prometheus text exposition format."""
+    lines = ['# HELP span_duration_seconds Duration of instrumented code spans.',
+             '# TYPE span_duration_seconds histogram']
+    errors = ['# HELP span_errors_total Instrumented spans that raised an exception.',
+              '# TYPE span_errors_total counter']
+    for name, metrics in snapshot().items():
+        label = name.replace('\\', '\\\\').replace('"', '\\"')
+        cumulative = 0
+        for bound, count in metrics['buckets'].items():
+            cumulative += count
+            lines.append(f'span_duration_seconds_bucket{{span="{label}",le="{bound}"}} {cumulative}')
+        lines.append(f'span_duration_seconds_sum{{span="{label}"}} {metrics["total_seconds"]}')
+        lines.append(f'span_duration_seconds_count{{span="{label}"}} {metrics["calls"]}')
+        errors.append(f'span_errors_total{{span="{label}"}} {metrics["errors"]}')
+    return '\n'.join(lines + errors) + '\n'
+
+
+def dump(filename: str):
+    """Write the metrics to a file: Prometheus text for `.prom`/`.txt`, JSON otherwise."""
+    if filename.endswith(('.prom', '.txt')):
+        text = prometheusText()
+    else:
+        import json
+        text = json.dumps(snapshot(), indent=1)
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write(text)
+
+
+if ENABLED:
+    atexit.register(dump, METRICS_FILE)
+
+
+class SamplingProfiler:
+    """
+    Samples the call stack of one thread at a fixed interval from a background thread.
+    The result is written in the collapsed stack format ('module:function;module:function count' per line), which is
+    accepted by flame graph tools.
+    """
+
+    def __init__(self, interval=0.005, thread_id=None):
+        """
+        :param interval: Seconds between two samples
+        :param thread_id: Thread to sample, None - the calling thread
+        """
+        self.interval = interval
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def dump(self, filename: str):
+        with open(filename, 'w', encoding='utf-8') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f'{stack} {count}\n')
+
+
+@contextmanager
+def profiled(mode: str | None, filename: str):
+    """
+    Profile the body of the `with` statement.
+    :param mode: 'cprofile' - deterministic profiler, the stats are saved for `pstats`/snakeviz,
+    'sample' - `SamplingProfiler`, None - no profiling
+    :param filename: Output file
+    """
+    if mode is None:
+        yield
+    elif mode == 'cprofile':
+        import cProfile  # not imported at startup, most runs are not profiled
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(filename)
+    elif mode == 'sample':
+        profiler = SamplingProfiler().start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            profiler.dump(filename)
+    else:
+        raise ValueError(f'Unknown profiler: {mode}')
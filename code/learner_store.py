@@ -0,0 +1,210 @@
+"""
+Persistent learner profiles: every answered task of every learner in one SQLite database.
+
+The database runs in WAL mode, so the history views can read while answers are written. The answers of one exam are
+written in one transaction (`recordAnswers`), not row by row, together with the per-fact and per-day totals, so the
+statistics queries read a few hundred aggregate rows instead of the whole history. The (learner, fact, time) and
+(learner, day) indexes serve the queries of single answers. The same transaction marks the answered facts in the
+`FactCoverage` bitmap of the learner.
+"""
+import sqlite3
+import time
+
+from fact_matrix import FactMatrix, FactCoverage, getFactMatrix
+from task import Task
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS learners (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS facts (
+    id INTEGER PRIMARY KEY,
+    fact TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    learner_id INTEGER NOT NULL REFERENCES learners (id),
+    fact_id INTEGER NOT NULL REFERENCES facts (id),
+    user_answer REAL,
+    correct INTEGER NOT NULL,
+    time_elapsed REAL NOT NULL,
+    first_key_latency REAL,
+    think_time REAL,
+    answered_at REAL NOT NULL,
+    day TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_by_fact ON answers (learner_id, fact_id, answered_at);
+CREATE INDEX IF NOT EXISTS answers_by_day ON answers (learner_id, day);
+CREATE TABLE IF NOT EXISTS fact_totals (
+    learner_id INTEGER NOT NULL,
+    fact_id INTEGER NOT NULL,
+    answers INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    total_time REAL NOT NULL,
+    last_answered_at REAL NOT NULL,
+    PRIMARY KEY (learner_id, fact_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS day_totals (
+    learner_id INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    answers INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    total_time REAL NOT NULL,
+    PRIMARY KEY (learner_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    learner_id INTEGER NOT NULL,
+    min_operand INTEGER NOT NULL,
+    max_operand INTEGER NOT NULL,
+    bits BLOB NOT NULL,
+    PRIMARY KEY (learner_id, min_operand, max_operand)
+) WITHOUT ROWID;
+'''
+
+
+class LearnerStore:
+    """History of one learner, stored in a shared SQLite database."""
+
+    def __init__(self, path='learner.db', learner='default'):
+        """
+        :param path: Database file, created if it does not exist
+        :param learner: Name of the learner, the profile is created on the first use
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')  # durable on commit in WAL mode except on power loss
+        self.connection.executescript(SCHEMA)
+        with self.connection:
+            self.connection.execute('INSERT OR IGNORE INTO learners (name) VALUES (?)', (learner,))
+        self.learner = learner
+        self.learner_id = self.connection.execute('SELECT id FROM learners WHERE name = ?', (learner,)).fetchone()[0]
+        self._fact_ids = dict(self.connection.execute('SELECT fact, id FROM facts'))
+        self._fact_matrix = None
+
+    @property
+    def fact_matrix(self) -> FactMatrix:
+        """The shared matrix if a frontend enabled it, otherwise an in-memory one, it defines the coverage bits."""
+        if self._fact_matrix is None:
+            self._fact_matrix = getFactMatrix() or FactMatrix()
+        return self._fact_matrix
+
+    def coverage(self) -> FactCoverage:
+        """Bitmap of the facts the learner has answered."""
+        matrix = self.fact_matrix
+        row = self.connection.execute('SELECT bits FROM coverage WHERE learner_id = ? AND min_operand = ? '
+                                      'AND max_operand = ?',
+                                      (self.learner_id, matrix.min_operand, matrix.max_operand)).fetchone()
+        return FactCoverage(matrix, None if row is None else row[0])
+
+    def _markCoverage(self, tasks):
+        """Mark the facts as seen, in the current transaction."""
+        coverage = self.coverage()
+        before = bytes(coverage)
+        for task in tasks:
+            coverage.markTask(task)
+        if bytes(coverage) != before:
+            self.connection.execute('INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?)',
+                                    (self.learner_id, coverage.matrix.min_operand, coverage.matrix.max_operand,
+                                     bytes(coverage)))
+
+    def _factId(self, fact: str) -> int:
+        """Id of the fact, it is added to the `facts` table in the current transaction if it is new."""
+        fact_id = self._fact_ids.get(fact)
+        if fact_id is None:  # new, or added by another connection
+            self.connection.execute('INSERT OR IGNORE INTO facts (fact) VALUES (?)', (fact,))
+            fact_id = self.connection.execute('SELECT id FROM facts WHERE fact = ?', (fact,)).fetchone()[0]
+            self._fact_ids[fact] = fact_id
+        return fact_id
+
+    def recordAnswers(self, answers: list[tuple[Task, float]]):
+        """
+        Store the answers of one exam and update the totals in one transaction.
+        :param answers: [(answered task, unix time of the answer)], e.g. `ExamSession.answered`
+        """
+        rows, fact_totals, day_totals = [], {}, {}
+        try:
+            with self.connection:
+                for task, answered_at in answers:
+                    fact_id = self._factId(task.task_string)
+                    correct = task.isCorrect()
+                    day = time.strftime('%Y-%m-%d', time.localtime(answered_at))
+                    rows.append((self.learner_id, fact_id, task.user_answer, correct, task.time_elapsed,
+                                 task.first_key_latency, task.think_time, answered_at, day))
+                    for totals, key in ((fact_totals, fact_id), (day_totals, day)):
+                        count, correct_count, total_time, last = totals.get(key, (0, 0, 0.0, answered_at))
+                        totals[key] = (count + 1, correct_count + correct, total_time + task.time_elapsed,
+                                       max(last, answered_at))
+
+                self.connection.executemany(
+                    'INSERT INTO answers (learner_id, fact_id, user_answer, correct, time_elapsed, first_key_latency, '
+                    'think_time, answered_at, day) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+                self.connection.executemany(
+                    'INSERT INTO fact_totals VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT DO UPDATE SET '
+                    'answers = answers + excluded.answers, correct = correct + excluded.correct, '
+                    'total_time = total_time + excluded.total_time, '
+                    'last_answered_at = max(last_answered_at, excluded.last_answered_at)',
+                    [(self.learner_id, fact_id, *totals) for fact_id, totals in fact_totals.items()])
+                self.connection.executemany(
+                    'INSERT INTO day_totals VALUES (?, ?, ?, ?, ?) ON CONFLICT DO UPDATE SET '
+                    'answers = answers + excluded.answers, correct = correct + excluded.correct, '
+                    'total_time = total_time + excluded.total_time',
+                    [(self.learner_id, day, *totals[:3]) for day, totals in day_totals.items()])
+                self._markCoverage(task for task, _ in answers)
+        except sqlite3.Error:
+            self._fact_ids = dict(self.connection.execute('SELECT fact, id FROM facts'))  # new ids were rolled back
+            raise
+
+    def factStatistics(self) -> dict:
+        """
+        :return: {fact: (answers, correct answers, mean elapsed time, unix time of the last answer)}
+        """
+        rows = self.connection.execute('SELECT fact, answers, correct, total_time / answers, last_answered_at '
+                                       'FROM fact_totals JOIN facts ON facts.id = fact_id WHERE learner_id = ?',
+                                       (self.learner_id,))
+        return {fact: (count, correct, mean_time, last) for fact, count, correct, mean_time, last in rows}
+
+    def factHistory(self, fact: str, limit=20) -> list[tuple]:
+        """
+        The latest answers to one fact, the newest first.
+        :param fact: `Task.task_string`, e.g. '7 * 8'
+        :return: [(unix time, user answer, correct, elapsed time)]
+        """
+        return self.connection.execute('SELECT answered_at, user_answer, correct, time_elapsed FROM answers '
+                                       'WHERE learner_id = ? AND fact_id = (SELECT id FROM facts WHERE fact = ?) '
+                                       'ORDER BY answered_at DESC LIMIT ?', (self.learner_id, fact, limit)).fetchall()
+
+    def dailySummary(self, first_day: str = None, last_day: str = None) -> list[tuple]:
+        """
+        :param first_day: 'YYYY-MM-DD', None - from the first answer
+        :param last_day: 'YYYY-MM-DD', None - up to the last answer
+        :return: [(day, answers, correct answers, mean elapsed time)] ordered by day
+        """
+        return self.connection.execute('SELECT day, answers, correct, total_time / answers FROM day_totals '
+                                       'WHERE learner_id = ? AND day BETWEEN ? AND ? ORDER BY day',
+                                       (self.learner_id, first_day or '', last_day or '9999')).fetchall()
+
+    def answersOfDay(self, day: str) -> list[tuple]:
+        """
+        :param day: 'YYYY-MM-DD'
+        :return: [(unix time, fact, user answer, correct, elapsed time)] in the order of the answers
+        """
+        return self.connection.execute('SELECT answered_at, fact, user_answer, correct, time_elapsed FROM answers '
+                                       'JOIN facts ON facts.id = fact_id WHERE learner_id = ? AND day = ? '
+                                       'ORDER BY answered_at', (self.learner_id, day)).fetchall()
+
+    def weakFacts(self, limit=10, min_answers=1) -> list[str]:
+        """
+        Facts to practice first: the lowest share of correct answers, then the slowest.
+        :param limit: Maximum number of facts
+        :param min_answers: Ignore facts answered fewer times
+        """
+        rows = self.connection.execute('SELECT fact FROM fact_totals JOIN facts ON facts.id = fact_id '
+                                       'WHERE learner_id = ? AND answers >= ? '
+                                       'ORDER BY 1.0 * correct / answers, total_time / answers DESC LIMIT ?',
+                                       (self.learner_id, min_answers, limit))
+        return [fact for fact, in rows]
+
+    def close(self):
+        self.connection.close()
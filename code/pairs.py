@@ -0,0 +1,102 @@
+import bisect
+import random
+from array import array
+
+
+class UniqPairs:
+    """
+    Lazy space of unique unordered pairs `(x, y)`, `x <= y`, where one value is taken from the first list
+    and the other from the second one.
+
+    Pairs are produced in canonical (lexicographic) order without building the cartesian product. Only the sorted
+    distinct input values and one prefix-count per value are kept, so memory does not depend on the number of pairs.
+    Every pair has a rank (its position in canonical order), which allows random access and random sampling.
+
+    Constraints are pushed down into the enumeration: the pairs allowed for one smaller value are a contiguous run
+    of the sorted candidates, so excluded pairs are neither produced nor ranked.
+    """
+
+    def __init__(self, list1: list, list2: list, max_sum=None, distinct=False):
+        """
+        :param list1: First list of values
+        :param list2: Second list of values
+        :param max_sum: Only pairs with `x + y <= max_sum`, None - no limit
+        :param distinct: True - only pairs with `x != y`
+        """
+        self.max_sum = max_sum
+        self.distinct = distinct
+        self._first = sorted(set(list1))
+        self._second = sorted(set(list2))
+        self._first_set = set(self._first)
+        self._second_set = set(self._second)
+        self._values = sorted(self._first_set | self._second_set)
+
+        # _offsets[i] - rank of the first pair whose smaller value is self._values[i]
+        self._offsets = array('q', [0])
+        for value in self._values:
+            start, stop = self._range(value, self._candidates(value))
+            self._offsets.append(self._offsets[-1] + max(0, stop - start))
+
+    def _candidates(self, value) -> list:
+        """Sorted list of values that can be paired with `value`."""
+        in_first, in_second = value in self._first_set, value in self._second_set
+        if in_first and in_second:
+            return self._values
+        if in_first:
+            return self._second
+        return self._first
+
+    def _range(self, value, candidates: list) -> tuple[int, int]:
+        """Slice of `candidates` that can be the bigger value of a pair with the smaller `value`."""
+        start = (bisect.bisect_right if self.distinct else bisect.bisect_left)(candidates, value)
+        stop = len(candidates) if self.max_sum is None else bisect.bisect_right(candidates, self.max_sum - value)
+        return start, stop
+
+    def __len__(self):
+        return self._offsets[-1]
+
+    def __iter__(self):
+        for value in self._values:
+            candidates = self._candidates(value)
+            for index in range(*self._range(value, candidates)):
+                yield value, candidates[index]
+
+    def __getitem__(self, rank: int):
+        """Return the pair with the given rank in O(log n)."""
+        if not 0 <= rank < len(self):
+            raise IndexError('Pair rank out of range')
+        value_index = bisect.bisect_right(self._offsets, rank) - 1
+        value = self._values[value_index]
+        candidates = self._candidates(value)
+        return value, candidates[self._range(value, candidates)[0] + rank - self._offsets[value_index]]
+
+    def randomRanks(self, rng=random):
+        """
+        Yield the ranks of all pairs in uniformly random order, lazily.
+
+        A sparse Fisher-Yates shuffle is used: memory grows only with the number of ranks already drawn.
+        :param rng: Source of randomness (the `random` module or a `random.Random` instance)
+        """
+        total = len(self)
+        swaps = {}
+        for position in range(total):
+            chosen = rng.randrange(position, total)
+            current = swaps.pop(position, position)
+            if chosen == position:
+                yield current
+            else:
+                yield swaps.get(chosen, chosen)
+                swaps[chosen] = current
+
+    def sample(self, k: int, rng=random):
+        """
+        Yield exactly `k` distinct pairs chosen uniformly at random from the pairs meeting the constraints (or all of
+        them if there are fewer than `k`). Nothing is rejected, so the cost does not depend on how many pairs the
+        constraints exclude.
+        :param k: Sample size
+        :param rng: Source of randomness (the `random` module or a `random.Random` instance)
+        """
+        for number, rank in enumerate(self.randomRanks(rng)):
+            if number >= k:
+                return
+            yield self[rank]
@@ -0,0 +1,146 @@
+"""
+Replay of recorded exams from the `py_log_*.log` files through `ExamSession`.
+
+Every log file is one recorded session: its answer lines are turned back into the tasks, the keystrokes and the given
+answers, and a new session gets them in the same order, either at full speed or at the recorded pace (`--speed 1` -
+real time, `--speed 10` - ten times faster). Many copies of the sessions can run concurrently (`--copies`) to load
+the exam pipeline. The replay is deterministic: the correctness of every replayed answer is compared with the
+recorded one, so changed grading shows up as mismatches (and exit code 1). With `--log FILE` the replayed answers
+are written through `AnswerLogPipeline` and the file can be compared with the recorded one.
+
+Usage: python replay.py LOG_FILE_OR_DIRECTORY... [--speed 0] [--copies 1] [--log replayed.log]
+"""
+import argparse
+import asyncio
+import logging
+import re
+import statistics
+import sys
+import time
+
+from analytics import findLogFiles
+from answer_log import AnswerLogPipeline
+from exam import ExamSession
+from task import Task
+
+# '2024-01-31 10:00:00,123 INFO 7 × 8 =  56 54 False 3.214562 1.030114 2.870412', the last two values are optional
+ANSWER_LINE = re.compile(r'^\d{4}-\d\d-\d\d [\d:,]+ INFO (.+?) = +(\S+) (\S+) (True|False) (\S+?)(?: (\S+) (\S+))?$')
+
+
+class RecordedAnswer:
+    """One answer line of a log file."""
+    __slots__ = ('task_string', 'user_answer', 'correct', 'time_elapsed', 'first_key_latency', 'think_time')
+
+    def __init__(self, task_string, user_answer, correct, time_elapsed, first_key_latency=None, think_time=None):
+        self.task_string = task_string
+        self.user_answer = user_answer
+        self.correct = correct
+        self.time_elapsed = time_elapsed
+        self.first_key_latency = first_key_latency
+        self.think_time = think_time
+
+
+def parseNumber(text: str | None):
+    if text is None or text == 'None':
+        return None
+    value = float(text.replace(',', '.'))
+    return int(value) if value == int(value) else value
+
+
+def readSession(path: str) -> list[RecordedAnswer]:
+    """Answers of one log file in the recorded order, lines of other formats are skipped."""
+    answers = []
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            match = ANSWER_LINE.match(line.rstrip('\r\n'))
+            if match is None:
+                continue
+            task, _, user_answer, correct, time_elapsed, first_key_latency, think_time = match.groups()
+            try:
+                answers.append(RecordedAnswer(task.replace('×', '*').replace('÷', '/'), parseNumber(user_answer),
+                                              correct == 'True', parseNumber(time_elapsed),
+                                              parseNumber(first_key_latency), parseNumber(think_time)))
+            except ValueError:
+                continue
+    return answers
+
+
+async def replaySession(answers: list[RecordedAnswer], speed: float, latencies: list) -> int:
+    """
+    Answer the recorded tasks with a new `ExamSession`.
+    :param speed: 0 - full speed, otherwise the recorded pauses are divided by `speed`
+    :param latencies: `ExamSession.answer()` durations in ns are appended to it
+    :return: Number of answers whose correctness differs from the recorded one
+    """
+    async def wait(until: float | None, elapsed: float) -> float:
+        if speed and until is not None and until > elapsed:
+            await asyncio.sleep((until - elapsed) / speed)
+            return until
+        return elapsed
+
+    session = ExamSession([Task(answer.task_string) for answer in answers])
+    session.start()
+    mismatches = 0
+    for answer in answers:
+        elapsed = 0.0
+        for keystroke in (answer.first_key_latency, answer.think_time):
+            if keystroke is not None:
+                elapsed = await wait(keystroke, elapsed)
+                session.keyPressed()
+        await wait(answer.time_elapsed, elapsed)
+
+        task = session.current_task
+        start = time.perf_counter_ns()
+        session.answer(answer.user_answer)
+        latencies.append(time.perf_counter_ns() - start)
+        mismatches += task.isCorrect() != answer.correct
+    return mismatches
+
+
+async def replayAll(sessions: list[list[RecordedAnswer]], speed: float, copies: int, latencies: list) -> int:
+    results = await asyncio.gather(*(replaySession(answers, speed, latencies) for
+                                     answers in sessions for _ in range(copies)))
+    return sum(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay recorded exams through the exam logic')
+    parser.add_argument('paths', nargs='+', help='py_log_*.log files or directories with them')
+    parser.add_argument('--speed', type=float, default=0, help='0 - full speed, 1 - recorded pace, 10 - 10x faster')
+    parser.add_argument('--copies', type=int, default=1, help='concurrent replays of every session')
+    parser.add_argument('--log', help='write the replayed answers to this log file')
+    args = parser.parse_args(argv)
+
+    sessions = [answers for answers in map(readSession, findLogFiles(args.paths)) if answers]
+    if not sessions:
+        print('No recorded answers found')
+        return 1
+
+    root = logging.getLogger()
+    null_handler = logging.NullHandler()  # without a handler `logging.info()` would configure a stderr handler
+    root.addHandler(null_handler)
+    pipeline = AnswerLogPipeline(args.log).start(logging.INFO) if args.log else None
+    latencies = []
+    start = time.perf_counter()
+    try:
+        mismatches = asyncio.run(replayAll(sessions, args.speed, args.copies, latencies))
+    finally:
+        if pipeline is not None:
+            pipeline.stop()
+        root.removeHandler(null_handler)
+    seconds = time.perf_counter() - start
+
+    latencies_us = [latency / 1000 for latency in latencies]
+    if len(latencies_us) > 1:
+        quantiles = statistics.quantiles(latencies_us, n=100, method='inclusive')
+    else:
+        quantiles = latencies_us * 99
+    print(f'{len(sessions) * args.copies} sessions, {len(latencies)} answers in {seconds:.3f} s '
+          f'({len(latencies) / seconds:,.0f} answers/s)')
+    print(f'ExamSession.answer, µs: p50 {quantiles[49]:.1f}  p99 {quantiles[98]:.1f}  max {max(latencies_us):.1f}')
+    print(f'correctness mismatches: {mismatches}')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+import heapq
+import json
+import os
+import random
+
+from task import Task
+
+MASTERED_STRENGTH = 2  # facts with this strength are considered learned
+BASE_INTERVAL = 2  # answers before a freshly failed fact is asked again
+# strength gained by a correct answer for every `Task.measureAnsweringSpeed()` value
+STRENGTH_GAIN = {'fast': 1, 'medium': 0.5, 'slow': 0}
+
+
+def factKey(task: Task) -> str:
+    """
+    Key of the fact in the scheduler state. Both variants of a division fact ('18 / 3' and '18 / 6', the pool picks one
+    of them at random) and both orders of + and * share one key, so the progress is kept whichever variant is asked.
+    """
+    fact = task.expression.fact()
+    if fact is None:
+        return task.task_string
+    first, operation, second = fact
+    if operation in '+*':
+        first, second = sorted((first, second))
+    elif operation == '/' and second and first % second == 0:
+        second = min(second, first // second)
+    return f'{first} {operation} {second}'
+
+
+class FactState:
+    """Learning state of one fact."""
+    __slots__ = ('strength', 'due', 'reviews', 'lapses', 'version')
+
+    def __init__(self, strength=0.0, due=0, reviews=0, lapses=0):
+        self.strength = strength
+        self.due = due
+        self.reviews = reviews
+        self.lapses = lapses
+        self.version = 0  # increases on every update, older heap entries become stale
+
+
+class SpacedRepetitionScheduler:
+    """
+    Adaptive order of tasks driven by correctness and response time.
+
+    Every fact has a strength estimate and a due time measured in answers (the scheduler clock). Facts wait in a heap
+    ordered by due time, so the next task is picked in O(log n). Wrong or slow answers bring a fact back soon,
+    fast correct answers push it further away. A fact answered fast and correctly on the first try is learned at once,
+    so known facts are asked only once.
+    """
+
+    def __init__(self, tasks: list[Task], state_file=None, rng=random):
+        """
+        :param tasks: Fact pool (e.g. `generatePool('multiplication')`)
+        :param state_file: JSON file to load the state from and to `save()` it to, None - no persistence
+        :param rng: Source of randomness for the order of new facts
+        """
+        self.state_file = state_file
+        self.clock = 0
+        self.facts = {}  # {`factKey`: FactState}
+        self.task_strings = {}  # {`factKey`: the variant of the fact in `tasks`}
+        self._heap = []
+        self._pending = None  # fact handed out by `nextTask()` and not answered yet
+
+        saved_facts = {}
+        if state_file is not None and os.path.exists(state_file):
+            with open(state_file, encoding='utf-8') as file:
+                saved = json.load(file)
+            self.clock = saved['clock']
+            saved_facts = {factKey(Task(fact)): values for fact, values in saved['facts'].items()}
+
+        for task in tasks:
+            self.task_strings[factKey(task)] = task.task_string
+        new_facts = [fact for fact in self.task_strings if fact not in saved_facts]
+        rng.shuffle(new_facts)
+        for order, fact in enumerate(new_facts):
+            self.facts[fact] = FactState(due=self.clock + order)
+        for fact in self.task_strings:
+            if fact in saved_facts:
+                self.facts[fact] = FactState(*saved_facts[fact])
+        # facts of the state file that are not in this pool are written back unchanged by `save()`
+        self._other_facts = {fact: values for fact, values in saved_facts.items() if fact not in self.facts}
+
+        self._mastered = sum(state.strength >= MASTERED_STRENGTH for state in self.facts.values())
+        self._heap = [(state.due, order, fact, state.version) for order, (fact, state) in enumerate(self.facts.items())]
+        heapq.heapify(self._heap)
+        self._order = len(self._heap)
+
+    def _push(self, fact: str, state: FactState):
+        self._order += 1
+        heapq.heappush(self._heap, (state.due, self._order, fact, state.version))
+
+    def nextTask(self) -> Task:
+        """The fact with the earliest due time as a new `Task`."""
+        if self._pending is not None:  # the previous task was skipped, put it back
+            self._push(self._pending, self.facts[self._pending])
+        while True:
+            _, _, fact, version = heapq.heappop(self._heap)
+            if self.facts[fact].version == version:
+                self._pending = fact
+                return Task(self.task_strings[fact])
+
+    def record(self, task: Task):
+        """
+        Update the strength and due time of the answered fact.
+        :param task: Answered task (with `user_answer` and `time_elapsed`)
+        """
+        fact = factKey(task)
+        state = self.facts[fact]
+        was_mastered = state.strength >= MASTERED_STRENGTH
+        self.clock += 1
+        state.reviews += 1
+
+        if task.isCorrect():
+            if state.reviews == 1 and task.measureAnsweringSpeed() == 'fast':
+                state.strength = MASTERED_STRENGTH
+            else:
+                state.strength += STRENGTH_GAIN[task.measureAnsweringSpeed()]
+            interval = round(BASE_INTERVAL * 2 ** (state.strength + 1))
+        else:
+            state.lapses += 1
+            state.strength = 0.0
+            interval = BASE_INTERVAL
+
+        state.due = self.clock + interval
+        state.version += 1
+        self._mastered += (state.strength >= MASTERED_STRENGTH) - was_mastered
+        if self._pending == fact:
+            self._pending = None
+        self._push(fact, state)
+
+    def isMastered(self) -> bool:
+        """True - every fact of the pool is learned."""
+        return self._mastered == len(self.facts)
+
+    def save(self):
+        if self.state_file is None:
+            return
+        facts = dict(self._other_facts)
+        facts.update((fact, [state.strength, state.due, state.reviews, state.lapses]) for
+                     fact, state in self.facts.items())
+        state = {'clock': self.clock, 'facts': facts}
+        with open(self.state_file, 'w', encoding='utf-8') as file:
+            json.dump(state, file, ensure_ascii=False)
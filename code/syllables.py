@@ -0,0 +1,154 @@
+"""
+Syllable drills for reading practice.
+
+The syllable set is frozen and indexed once at import time: by the first letter, by the length and by the
+vowel/consonant pattern ('C' - consonant, 'V' - vowel, 'S' - ъ/ь sign, e.g. 'ба' -> 'CV', 'ать' -> 'VCS').
+Censored syllables are kept in a frozenset, so filtering them out is a set lookup per syllable, and the filtered
+selections are cached. Drills of any size are sampled from the selections without rebuilding anything.
+
+Source:
+https://traditio.wiki/Список_слогов
+https://traditio.wiki/%D0%A1%D0%BF%D0%B8%D1%81%D0%BE%D0%BA_%D1%81%D0%BB%D0%BE%D0%B3%D0%BE%D0%B2
+
+Usage: python syllables.py [--pattern CV] [--first-letter б] [--length 2] [--count 20]
+"""
+import argparse
+import random
+
+VOWELS = frozenset('аеёиоуыэюя')
+SIGNS = frozenset('ъь')
+CENSORED = frozenset(['ебь', 'ёб', 'еб', 'ёп', 'ёпть', 'хуй'])
+
+_SOURCE_SYLLABLES = ['аб', 'абь', 'ав', 'авь', 'аг', 'агь', 'ад', 'адь', 'аж', 'ажь', 'аз', 'азь', 'аи', 'ай', 'ак',
+                     'акь', 'ал', 'аль', 'ам', 'амь', 'ан', 'ань', 'ап', 'апь', 'ар', 'арь', 'ас', 'ась', 'ат', 'ать',
+                     'ау', 'аф', 'афь', 'ах', 'ахь', 'ац', 'аць', 'ач', 'ачь', 'аш', 'ашь', 'ащ', 'ащь', 'аю', 'ая',
+                     'ба', 'баб', 'баг', 'бар', 'бат', 'бе', 'бё', 'бер', 'берж', 'би', 'бир', 'бо', 'бор', 'борь',
+                     'бра', 'бре', 'брит', 'брь', 'бу', 'бъ', 'бы', 'бык', 'бырь', 'бь', 'бэ', 'бю', 'бюст', 'бя', 'ва',
+                     'ват', 'вать', 'ве', 'вё', 'век', 'вель', 'вен', 'ви', 'виль', 'во', 'воль', 'все', 'ву', 'въ',
+                     'вы', 'выд', 'вый', 'вь', 'вэ', 'вю', 'вя', 'га', 'гад', 'гар', 'гард', 'гат', 'ге', 'гё', 'ги',
+                     'гим', 'гин', 'го', 'год', 'горд', 'гу', 'гум', 'гус', 'гусь', 'гъ', 'гы', 'гь', 'гэ', 'гю', 'гюс',
+                     'гя', 'да', 'дам', 'дар', 'де', 'дё', 'ди', 'до', 'доз', 'ду', 'дъ', 'ды', 'дыб', 'дым', 'дыр',
+                     'дь', 'дэ', 'дю', 'дя', 'еа', 'еб', 'ёб', 'ебь', 'ев', 'ёв', 'евь', 'ег', 'ёг', 'егь', 'ед', 'ёд',
+                     'едь', 'ее', 'её', 'еж', 'ёж', 'ежь', 'ез', 'ёз', 'езь', 'еи', 'ей', 'ёй', 'ек', 'ёк', 'екь', 'ел',
+                     'ёл', 'ель', 'ем', 'ём', 'емь', 'ен', 'ён', 'ень', 'ео', 'еп', 'ёп', 'ёпть', 'епь', 'ер', 'ёр',
+                     'ерь', 'ес', 'ёс', 'есь', 'ет', 'ёт', 'еть', 'еу', 'еф', 'ёф', 'ефь', 'ех', 'ёх', 'ехь', 'ец',
+                     'ёц', 'ець', 'еч', 'ёч', 'ечь', 'еш', 'ёш', 'ешь', 'ещ', 'ёщ', 'ещь', 'ею', 'ея', 'жа', 'же', 'жё',
+                     'жест', 'жи', 'жо', 'жу', 'жъ', 'жы', 'жь', 'жэ', 'жю', 'жя', 'за', 'зе', 'зё', 'зи', 'зо', 'зу',
+                     'зъ', 'зы', 'зь', 'зэ', 'зю', 'зя', 'иб', 'ив', 'иг', 'ид', 'иж', 'из', 'ии', 'ий', 'ик', 'ил',
+                     'им', 'ин', 'ип', 'ир', 'ис', 'ит', 'ить', 'иф', 'их', 'иц', 'ич', 'иш', 'ищ', 'ия', 'йод', 'ка',
+                     'кар', 'ке', 'кё', 'ки', 'ко', 'ком', 'коч', 'ку', 'къ', 'кы', 'кь', 'кэ', 'кю', 'кя', 'ла', 'ле',
+                     'лё', 'лен', 'ли', 'ло', 'лов', 'лон', 'лу', 'лъ', 'лы', 'ль', 'лэ', 'лю', 'люк', 'ля', 'ляж',
+                     'ляжь', 'ма', 'мат', 'ме', 'мё', 'мед', 'мёд', 'ми', 'мн', 'мо', 'мод', 'мож', 'мон', 'монт',
+                     'мор', 'му', 'муж', 'мъ', 'мы', 'мыт', 'мь', 'мэ', 'мю', 'мя', 'мят', 'на', 'нг', 'не', 'нё', 'ни',
+                     'но', 'нов', 'ной', 'ну', 'нъ', 'ны', 'ный', 'нь', 'нэ', 'ню', 'ня', 'об', 'ов', 'ог', 'од', 'ое',
+                     'ож', 'оз', 'ой', 'ок', 'ол', 'ом', 'он', 'оо', 'оп', 'ор', 'ос', 'от', 'оу', 'оф', 'ох', 'оц',
+                     'оч', 'ош', 'ощ', 'па', 'пас', 'пе', 'пё', 'пёр', 'пёс', 'печь', 'пи', 'по', 'пол', 'порт', 'пру',
+                     'прус', 'прусь', 'прян', 'пси', 'пу', 'пъ', 'пы', 'пь', 'пьян', 'пэ', 'пю', 'пя', 'ра', 'раб',
+                     'раж', 'раз', 'рап', 'рас', 'рат', 'ре', 'рё', 'реп', 'ри', 'ро', 'роч', 'ру', 'руль', 'рус',
+                     'русь', 'ръ', 'ры', 'рь', 'рэ', 'рэп', 'рю', 'ря', 'са', 'свеж', 'се', 'сё', 'сен', 'си', 'ска',
+                     'сказ', 'ский', 'ской', 'ску', 'скуй', 'сло', 'сме', 'сне', 'снег', 'со', 'сол', 'солн', 'степ',
+                     'степь', 'стэп', 'су', 'суп', 'съ', 'сы', 'сын', 'сь', 'сэ', 'сю', 'ся', 'та', 'тать', 'таю', 'те',
+                     'тё', 'тес', 'ти', 'то', 'тор', 'ту', 'тъ', 'ты', 'ть', 'тэ', 'тю', 'тя', 'уб', 'ув', 'уг', 'уд',
+                     'уж', 'уз', 'уй', 'ук', 'ул', 'ум', 'ун', 'уп', 'ур', 'ус', 'ут', 'уу', 'уф', 'ух', 'уц', 'уч',
+                     'уш', 'ущ', 'ф', 'фа', 'фе', 'фё', 'фи', 'фит', 'фо', 'фу', 'фъ', 'фы', 'фь', 'фэ', 'фю', 'фя',
+                     'ха', 'хе', 'хё', 'хи', 'хит', 'хо', 'ху', 'хуй', 'хъ', 'хы', 'хь', 'хэ', 'хю', 'хя', 'ца', 'цап',
+                     'це', 'цё', 'ци', 'цип', 'цо', 'цу', 'цъ', 'цы', 'ць', 'цэ', 'цю', 'ця', 'ча', 'че', 'чё', 'чел',
+                     'чи', 'чист', 'чка', 'чо', 'чу', 'чъ', 'чы', 'чь', 'чэ', 'чю', 'чя', 'ша', 'ше', 'шё', 'ши', 'шо',
+                     'шу', 'шъ', 'шы', 'шь', 'шэ', 'шю', 'шя', 'ща', 'ще', 'щё', 'щёт', 'щи', 'що', 'щу', 'щъ', 'щы',
+                     'щь', 'щэ', 'щю', 'щя', 'ъ', 'ыб', 'ыв', 'ыг', 'ыд', 'ыж', 'ыз', 'ый', 'ык', 'ыл', 'ым', 'ын',
+                     'ып', 'ыр', 'ыс', 'ыт', 'ыф', 'ых', 'ыц', 'ыч', 'ыш', 'ыщ', 'ь', 'эб', 'эв', 'эвр', 'эг', 'эд',
+                     'эж', 'эз', 'эи', 'эй', 'эк', 'эл', 'эм', 'эн', 'эп', 'эр', 'эс', 'эт', 'эф', 'эх', 'эц', 'эч',
+                     'эш', 'эщ', 'юб', 'юв', 'юг', 'юд', 'юж', 'юз', 'юй', 'юк', 'юл', 'юм', 'юн', 'юп', 'юр', 'юс',
+                     'ют', 'юф', 'юх', 'юц', 'юч', 'юш', 'ющ', 'юя', 'яб', 'яв', 'яг', 'яд', 'яж', 'яз', 'яй', 'як',
+                     'ял', 'ям', 'ян', 'яп', 'яр', 'яс', 'ят', 'яу', 'яф', 'ях', 'яц', 'яч', 'яш', 'ящ', 'яю', 'яя',
+                     ]
+
+
+def letterPattern(syllable: str) -> str:
+    """Vowel/consonant pattern of the syllable, see the module docstring."""
+    return ''.join('V' if letter in VOWELS else 'S' if letter in SIGNS else 'C' for letter in syllable)
+
+
+class SyllableIndex:
+    """
+    Sorted syllables with lookup tables {key: tuple of syllables in sorted order} for `select()`.
+    """
+
+    def __init__(self, syllables, censored=frozenset()):
+        """
+        :param syllables: Syllables, duplicates are removed
+        :param censored: Syllables skipped by `select(skip_censored=True)`
+        """
+        self.syllables = tuple(sorted(set(syllables)))
+        self.censored = frozenset(censored)
+        self.by_first_letter = self._group(lambda syllable: syllable[0])
+        self.by_length = self._group(len)
+        self.by_pattern = self._group(letterPattern)
+        self._selections = {}
+
+    def _group(self, key) -> dict:
+        groups = {}
+        for syllable in self.syllables:
+            groups.setdefault(key(syllable), []).append(syllable)
+        return {value: tuple(group) for value, group in groups.items()}
+
+    def select(self, first_letter=None, length=None, pattern=None, skip_censored=True) -> tuple:
+        """
+        Syllables matching all given filters, in sorted order. The smallest index is scanned, the results are cached.
+        :param first_letter: e.g. 'б', None - any
+        :param length: Number of letters, None - any
+        :param pattern: e.g. 'CV', see `letterPattern`, None - any
+        :param skip_censored: True - skip the `censored` syllables
+        """
+        key = (first_letter, length, pattern, skip_censored)
+        selection = self._selections.get(key)
+        if selection is not None:
+            return selection
+
+        candidates = [self.syllables]
+        if first_letter is not None:
+            candidates.append(self.by_first_letter.get(first_letter, ()))
+        if length is not None:
+            candidates.append(self.by_length.get(length, ()))
+        if pattern is not None:
+            candidates.append(self.by_pattern.get(pattern, ()))
+        selection = tuple(syllable for syllable in min(candidates, key=len) if
+                          (first_letter is None or syllable[0] == first_letter) and
+                          (length is None or len(syllable) == length) and
+                          (pattern is None or letterPattern(syllable) == pattern) and
+                          not (skip_censored and syllable in self.censored))
+        self._selections[key] = selection
+        return selection
+
+    def drill(self, count: int, first_letter=None, length=None, pattern=None, skip_censored=True,
+              rng=random) -> list[str]:
+        """
+        Random drill of `count` syllables matching the filters (see `select`). Every matching syllable is shown
+        once before any of them repeats, so drills longer than the selection are allowed.
+        :param rng: Source of randomness (`random` or a `random.Random`)
+        :return: List of syllables, empty if nothing matches
+        """
+        selection = self.select(first_letter, length, pattern, skip_censored)
+        drill = []
+        while selection and len(drill) < count:
+            drill += rng.sample(selection, min(len(selection), count - len(drill)))
+        return drill
+
+
+SYLLABLE_INDEX = SyllableIndex(_SOURCE_SYLLABLES, CENSORED)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Random syllable drill')
+    parser.add_argument('--first-letter')
+    parser.add_argument('--length', type=int)
+    parser.add_argument('--pattern', help="e.g. CV, VC, CVC ('S' - ъ/ь sign)")
+    parser.add_argument('--count', type=int, default=20)
+    parser.add_argument('--all', action='store_true', help='include the censored syllables')
+    args = parser.parse_args(argv)
+    drill = SYLLABLE_INDEX.drill(args.count, args.first_letter, args.length, args.pattern, not args.all)
+    print(' '.join(drill) if drill else 'No syllables match the filters')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,18 @@
 import string
 import time
 
+from expression import Expression
+from fact_matrix import getFactMatrix
+from instrumentation import timed
+
 
 class Task:
     """Class contains a task that the child will solve."""
-    user_answer = None
-    start_time = None
-    time_elapsed = None
-    response_speed = None
-    dot2comma = True
-    asterisk2multiplication_sign = True
-
-    # is used to limit the execution of `eval()`
+    __slots__ = ('user_answer', 'start_ns', 'first_key_ns', 'last_key_ns', 'elapsed_ns', 'response_speed',
+                 'dot2comma', 'asterisk2multiplication_sign', 'slash2devision_sign', 'expression', '_task_string',
+                 '_result', '_sort_key')
+
+    # is used to validate the task string before parsing
     __supported_operators = '+-*/() '  # the space was added intentionally
     __allowed_characters = string.digits + __supported_operators + '.,'
 
@@ -20,11 +21,31 @@ class Task:
         :param task: The string with the task. Example: '1 + 1'
         :param dot2comma: Replace dot with comma in `print()` function
         """
+        self.user_answer = None
+        # Response timing: `time.perf_counter_ns()` at `startTimer()` and nanoseconds since then of the first and the
+        # last keystroke and of the answer (`stopTimer()`)
+        self.start_ns = None
+        self.first_key_ns = None
+        self.last_key_ns = None
+        self.elapsed_ns = None
+        self.response_speed = None
         self.dot2comma = dot2comma
         self.asterisk2multiplication_sign = asterisk2multiplication_sign
         self.slash2devision_sign = slash2devision_sign
         self.task_string = task
+
+    @property
+    def task_string(self):
+        return self._task_string
+
+    @task_string.setter
+    def task_string(self, task: str):
+        """Validate and parse the task once, the memoized result is reset."""
+        self._task_string = task
         self._checkParameters()
+        self.expression = Expression(task)
+        self._result = None
+        self._sort_key = None
 
     def isCorrect(self):
         if self.user_answer == self.solve():
@@ -51,26 +72,63 @@ class Task:
             raise ValueError(f'Strange `self.time_elapsed` value={self.time_elapsed}')
 
     def _checkParameters(self):
-        """Check parameters to make sure they don't harm us with `eval()` function.
+        """Check parameters to make sure the task contains only supported characters.
         :return:
         """
         unallowed_characters = [task_sub_str for task_sub_str in self.task_string if
                                 task_sub_str not in self.__allowed_characters]
         assert unallowed_characters == [], f'The task contain unallowed characters: {unallowed_characters}'
 
+    @timed('Task.solve')
     def solve(self):
-        """Solve the task and return result"""
-        self._checkParameters()  # check again
-        result = eval(self.task_string)  # Ye, eval() is bad, but input parameters are checked before execution!
-        if float(result) == int(result):
-            return int(result)
-        return result
+        """
+        Solve the task and return result. The result is computed once and memoized, facts of the shared `FactMatrix`
+        (if a frontend enabled it, see `fact_matrix.useFactMatrix`) are looked up instead of computed.
+        """
+        if self._result is None:
+            fact = self.expression.fact()
+            facts = getFactMatrix()
+            result = None if fact is None or facts is None else facts.result(*fact)
+            if result is None:
+                result = self.expression.evaluate()
+                if float(result) == int(result):
+                    result = int(result)
+            self._result = result
+        return self._result
 
     def startTimer(self):
-        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
+        self.first_key_ns = self.last_key_ns = self.elapsed_ns = None
+
+    def keyPressed(self):
+        """Record a keystroke of the answer, the first one marks the end of the reaction time."""
+        if self.start_ns is None or self.elapsed_ns is not None:
+            return
+        self.last_key_ns = time.perf_counter_ns() - self.start_ns
+        if self.first_key_ns is None:
+            self.first_key_ns = self.last_key_ns
 
     def stopTimer(self):
-        self.time_elapsed = round(time.time() - self.start_time, 2)
+        self.elapsed_ns = time.perf_counter_ns() - self.start_ns
+
+    @property
+    def time_elapsed(self):
+        """Seconds from showing the task to the answer, None - not answered yet."""
+        return None if self.elapsed_ns is None else self.elapsed_ns / 1e9
+
+    @time_elapsed.setter
+    def time_elapsed(self, seconds):
+        self.elapsed_ns = None if seconds is None else round(seconds * 1e9)
+
+    @property
+    def first_key_latency(self):
+        """Seconds from showing the task to the first keystroke, None - no keystrokes were recorded."""
+        return None if self.first_key_ns is None else self.first_key_ns / 1e9
+
+    @property
+    def think_time(self):
+        """Seconds from showing the task to the last keystroke before the answer was confirmed."""
+        return None if self.last_key_ns is None else self.last_key_ns / 1e9
 
     def __str__(self):
         """print() overload"""
@@ -85,38 +143,41 @@ class Task:
 
     def __lt__(self, other):
         """overload to implement .sort() in [Task]"""
-        # noinspection PyProtectedMember
-        return self._get_numbers() < other._get_numbers()
-
-    def _get_numbers(self):
-        SPLITTER = '%SPLITTER%'
-        new_task_string = self.task_string
-        for operator in self.__supported_operators:
-            if operator == ' ':
-                continue
-            new_task_string = new_task_string.replace(operator, SPLITTER)
+        return self.sort_key < other.sort_key
 
-        task_numbers = new_task_string.split(SPLITTER)
-        task_numbers = [float(number) for number in task_numbers]
+    @property
+    def sort_key(self):
+        """Numbers of the task as floats, computed once. Use it as `key=` to sort many tasks."""
+        if self._sort_key is None:
+            self._sort_key = self._get_numbers()
+        return self._sort_key
 
-        # print(self.task_string)
-        # print(task_numbers)
-
-        return task_numbers
+    def _get_numbers(self):
+        return [float(number) for number in self.expression.operands]
 
-    def request_answer(self, validate=True):
+    def request_answer(self, validate=True, read=input):
         """
-        Only for command line verison!
+        Command line version (see `drill.py`): show the task and read the answer, until a number is typed.
+        ',' is accepted as the decimal separator. The timer is started unless it is already running.
 
-        :param validate:
-        :return:
+        :param validate: Print whether the answer is correct
+        :param read: Function that shows the prompt and returns the typed line, EOFError ends the input
+        :return: The answer, also stored in `user_answer`
         """
-        print(self, end='')
-        self.startTimer()
-        self.user_answer = float(input())
+        if self.start_ns is None or self.elapsed_ns is not None:
+            self.startTimer()
+        prompt = str(self)
+        while True:
+            try:
+                answer = float(read(prompt).strip().replace(',', '.'))
+            except ValueError:
+                continue
+            break
         self.stopTimer()
+        self.user_answer = int(answer) if answer.is_integer() else answer
         if validate:
             if self.isCorrect():
                 print('Correct!')
             else:
                 print('Error!')
+        return self.user_answer
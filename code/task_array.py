@@ -0,0 +1,188 @@
+import numpy as np  # optional dependency, only needed for batch generation and grading
+
+from task import Task
+from task_pool import OPERATION_CODES, OPERATION_SYMBOLS, DISPLAY_SYMBOLS
+
+
+class TaskArray:
+    """
+    Vectorized engine for generating and grading many two-operand tasks at once.
+
+    The tasks are stored as NumPy arrays (operand A, operand B, operation code, user answer, elapsed time).
+    Generators mirror `GenerateTasks`, filters are applied as boolean masks and shuffling is done with
+    permutation indices. Use `fromTasks`/`toTasks` to exchange tasks with the GUI.
+    """
+
+    def __init__(self, first_operands, operations, second_operands, user_answers=None, times_elapsed=None):
+        """
+        :param first_operands: Left operands
+        :param operations: Operation codes (see `task_pool.OPERATION_CODES`) or a single code for all tasks
+        :param second_operands: Right operands
+        :param user_answers: User answers, NaN - no answer yet
+        :param times_elapsed: Time spent on every task, NaN - not measured yet
+        """
+        self.first_operands = np.asarray(first_operands, dtype=np.int64)
+        self.second_operands = np.asarray(second_operands, dtype=np.int64)
+        self.operations = np.broadcast_to(np.asarray(operations, dtype=np.int8), self.first_operands.shape).copy()
+        size = len(self.first_operands)
+        if user_answers is None:
+            user_answers = np.full(size, np.nan)
+        if times_elapsed is None:
+            times_elapsed = np.full(size, np.nan)
+        self.user_answers = np.asarray(user_answers, dtype=np.float64)
+        self.times_elapsed = np.asarray(times_elapsed, dtype=np.float64)
+
+    @staticmethod
+    def _uniq_permutations(list1: list, list2: list):
+        """
+        Vectorized `GenerateTasks._generate_uniq_permutations`.
+        :return: Two arrays (smaller values, bigger values) in canonical order
+        """
+        first, second = np.meshgrid(np.asarray(list1, dtype=np.int64), np.asarray(list2, dtype=np.int64),
+                                    indexing='ij')
+        pairs = np.stack([np.minimum(first, second).ravel(), np.maximum(first, second).ravel()], axis=1)
+        pairs = np.unique(pairs, axis=0)
+        return pairs[:, 0], pairs[:, 1]
+
+    @classmethod
+    def sum(cls, summands: list[int], limit=None, shuffle=True, rng=None):
+        """
+        Generate sum tasks, see `GenerateTasks.sum`.
+        :param rng: `numpy.random.Generator` used for shuffling, None - a new unseeded one
+        :return: TaskArray
+        """
+        smaller, bigger = cls._uniq_permutations(summands, summands)
+        tasks = cls(smaller, OPERATION_CODES['+'], bigger)
+        if limit is not None:
+            tasks = tasks.filter(tasks.answers() <= limit)
+        return tasks.shuffled(rng) if shuffle else tasks
+
+    @classmethod
+    def difference(cls, values: list[int], only_positive=False, shuffle=True, skip_zero_answer=True, rng=None):
+        """
+        Generate difference tasks, see `GenerateTasks.difference`.
+        :param rng: `numpy.random.Generator` used for shuffling, None - a new unseeded one
+        :return: TaskArray
+        """
+        smaller, bigger = cls._uniq_permutations(values, values)
+        tasks = cls(bigger, OPERATION_CODES['-'], smaller)
+        answers = tasks.answers()
+        mask = np.ones(len(tasks), dtype=bool)
+        if only_positive:
+            mask &= answers >= 0
+        if skip_zero_answer:
+            mask &= answers != 0
+        tasks = tasks.filter(mask)
+        return tasks.shuffled(rng) if shuffle else tasks
+
+    @classmethod
+    def multiplication(cls, multipliers: list[int], shuffle=True, rng=None):
+        """
+        Generate multiplication tasks, see `GenerateTasks.multiplication`.
+        :param rng: `numpy.random.Generator` used for shuffling, None - a new unseeded one
+        :return: TaskArray
+        """
+        constant_multipliers = list(range(2, max(max(multipliers), 9) + 1))
+        smaller, bigger = cls._uniq_permutations(constant_multipliers, multipliers)
+        tasks = cls(smaller, OPERATION_CODES['*'], bigger)
+        return tasks.shuffled(rng) if shuffle else tasks
+
+    @classmethod
+    def division(cls, multipliers: list[int], shuffle=True, rng=None):
+        """
+        Generate division tasks, see `GenerateTasks.division`.
+        :param rng: `numpy.random.Generator` used for shuffling and choosing divisors, None - a new unseeded one
+        :return: TaskArray
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        smaller, bigger = cls._uniq_permutations(multipliers, multipliers)
+        swap = rng.random(len(smaller)) < 0.5  # randomizes divisor and result
+        divisors = np.where(swap, bigger, smaller)
+        tasks = cls(smaller * bigger, OPERATION_CODES['/'], divisors)
+        return tasks.shuffled(rng) if shuffle else tasks
+
+    @classmethod
+    def fromTasks(cls, tasks: list[Task]):
+        """
+        Create the array from two-operand `Task`s.
+        :param tasks: List of Tasks
+        :return: TaskArray
+        """
+        first_operands, operations, second_operands, user_answers, times_elapsed = [], [], [], [], []
+        for task in tasks:
+            operands, operators = task.expression.operands, task.expression.operators
+            if len(operands) != 2 or len(operators) != 1:
+                raise ValueError(f'Only two-operand tasks can be stored in the array, got {task.task_string!r}')
+            first_operands.append(operands[0])
+            operations.append(OPERATION_CODES[operators[0]])
+            second_operands.append(operands[1])
+            user_answers.append(np.nan if task.user_answer is None else task.user_answer)
+            times_elapsed.append(np.nan if task.time_elapsed is None else task.time_elapsed)
+        return cls(first_operands, operations, second_operands, user_answers, times_elapsed)
+
+    def toTasks(self) -> list[Task]:
+        tasks = []
+        for first_operand, operation, second_operand, user_answer, time_elapsed in zip(
+                self.first_operands.tolist(), self.operations.tolist(), self.second_operands.tolist(),
+                self.user_answers.tolist(), self.times_elapsed.tolist()):
+            task = Task(f'{first_operand} {OPERATION_SYMBOLS[operation]} {second_operand}')
+            if user_answer == user_answer:  # not NaN
+                task.user_answer = int(user_answer) if user_answer == int(user_answer) else user_answer
+            if time_elapsed == time_elapsed:
+                task.time_elapsed = time_elapsed
+            tasks.append(task)
+        return tasks
+
+    def answers(self):
+        """Correct answers of all tasks (float array if any division is not exact)."""
+        first, second, operations = self.first_operands, self.second_operands, self.operations
+        answers = np.select([operations == OPERATION_CODES['+'],
+                             operations == OPERATION_CODES['-'],
+                             operations == OPERATION_CODES['*']],
+                            [first + second, first - second, first * second],
+                            default=0)
+        is_division = operations == OPERATION_CODES['/']
+        if not is_division.any():
+            return answers
+        quotients = np.divide(first, second, out=np.full(len(first), np.nan), where=is_division & (second != 0))
+        if np.all(quotients[is_division] == np.floor(quotients[is_division])):
+            return np.where(is_division, quotients, answers).astype(np.int64)
+        return np.where(is_division, quotients, answers)
+
+    def grade(self, user_answers):
+        """
+        Store and grade a whole vector of user answers in one call.
+        :param user_answers: One answer per task
+        :return: Boolean array, True - the answer is correct
+        """
+        user_answers = np.asarray(user_answers, dtype=np.float64)
+        if user_answers.shape != self.user_answers.shape:
+            raise ValueError(f'Expected {len(self)} answers, got {len(user_answers)}')
+        self.user_answers = user_answers
+        return self.isCorrect()
+
+    def isCorrect(self):
+        """Boolean array, True - the stored user answer is correct (NaN answers are incorrect)."""
+        return self.user_answers == self.answers()
+
+    def filter(self, mask):
+        """Return the tasks selected by a boolean mask or an index array."""
+        return TaskArray(self.first_operands[mask], self.operations[mask], self.second_operands[mask],
+                         self.user_answers[mask], self.times_elapsed[mask])
+
+    def shuffled(self, rng=None):
+        """
+        :param rng: `numpy.random.Generator`, None - a new unseeded one
+        :return: The tasks in random order
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        return self.filter(rng.permutation(len(self)))
+
+    def strings(self) -> list[str]:
+        """Tasks formatted like `Task.__str__`."""
+        return [f'{first_operand} {DISPLAY_SYMBOLS[operation]} {second_operand} = ' for
+                first_operand, operation, second_operand in
+                zip(self.first_operands.tolist(), self.operations.tolist(), self.second_operands.tolist())]
+
+    def __len__(self):
+        return len(self.first_operands)
@@ -0,0 +1,57 @@
+from functools import cached_property
+
+from task import Task
+
+
+class TaskIndex:
+    """
+    Ordering and grouping indexes over a list of tasks, every index is built once, on its first use.
+
+    `ordered` - tasks sorted by `Task.sort_key` (the order of `list.sort()`),
+    `by_first_operand`, `by_operation`, `by_answer` - {key: [tasks in `ordered` order]}.
+    """
+
+    def __init__(self, tasks: list[Task]):
+        """
+        :param tasks: Tasks to index, the list itself is not changed
+        """
+        self.tasks = tasks
+
+    @cached_property
+    def ordered(self) -> list[Task]:
+        return sorted(self.tasks, key=sortKey)
+
+    @cached_property
+    def by_first_operand(self) -> dict:
+        return self._group(lambda task: task.expression.operands[0])
+
+    @cached_property
+    def by_operation(self) -> dict:
+        return self._group(lambda task: ''.join(task.expression.operators))
+
+    @cached_property
+    def by_answer(self) -> dict:
+        """Solves every task, so it is built only if it is used."""
+        return self._group(lambda task: task.solve())
+
+    def _group(self, key) -> dict:
+        groups = {}
+        for task in self.ordered:
+            groups.setdefault(key(task), []).append(task)
+        return groups
+
+    def errorsByFirstOperand(self) -> dict:
+        """{first operand: number of wrong answers} of the answered tasks with at least one wrong answer."""
+        errors = {}
+        for operand, tasks in self.by_first_operand.items():
+            count = sum(task.time_elapsed is not None and not task.isCorrect() for task in tasks)
+            if count:
+                errors[operand] = count
+        return errors
+
+    def __len__(self):
+        return len(self.tasks)
+
+
+def sortKey(task: Task):
+    return task.sort_key
@@ -0,0 +1,182 @@
+import math
+import time
+from array import array
+
+from task import Task
+
+# Operation codes stored in `TaskPool.operations`
+OPERATION_CODES = {'+': 0, '-': 1, '*': 2, '/': 3}
+OPERATION_SYMBOLS = '+-*/'
+DISPLAY_SYMBOLS = '+-×÷'
+
+NO_VALUE = math.nan  # marks "no answer yet" / "timer not stopped" in the float arrays
+NO_START = -1  # marks "timer not started" in `TaskPool.start_times`
+
+
+class TaskPool:
+    """
+    Compact storage for a large number of two-operand tasks.
+
+    Tasks are kept in parallel typed arrays (operand A, operand B, operation code, user answer, start time
+    (`time.perf_counter_ns()`), elapsed time, first keystroke latency and think time in seconds), so one task costs
+    a few dozen bytes instead of a full `Task` object.
+    Indexing the pool returns a lightweight `TaskView`.
+    """
+
+    def __init__(self):
+        self.first_operands = array('q')
+        self.second_operands = array('q')
+        self.operations = array('b')
+        self.user_answers = array('d')
+        self.start_times = array('q')
+        self.times_elapsed = array('d')
+        self.first_key_latencies = array('d')
+        self.think_times = array('d')
+
+    @classmethod
+    def fromTasks(cls, tasks: list[Task]):
+        """
+        Create a pool from two-operand `Task`s with integer operands, like the ones made by `GenerateTasks`
+        (ValueError for any other task).
+        :param tasks: List of Tasks
+        :return: TaskPool
+        """
+        pool = cls()
+        for task in tasks:
+            operands, operators = task.expression.operands, task.expression.operators
+            if len(operands) != 2 or len(operators) != 1:
+                raise ValueError(f'Only two-operand tasks can be stored in the pool, got {task.task_string!r}')
+            if not all(isinstance(operand, int) for operand in operands):
+                raise ValueError(f'Only integer operands can be stored in the pool, got {task.task_string!r}')
+            pool.append(operands[0], operators[0], operands[1])
+            if task.user_answer is not None:
+                pool.user_answers[-1] = task.user_answer
+            if task.time_elapsed is not None:
+                pool.times_elapsed[-1] = task.time_elapsed
+            if task.first_key_latency is not None:
+                pool.first_key_latencies[-1] = task.first_key_latency
+                pool.think_times[-1] = task.think_time
+        return pool
+
+    def append(self, first_operand: int, operation: str, second_operand: int):
+        """
+        :param first_operand: Left operand
+        :param operation: One of '+', '-', '*', '/'
+        :param second_operand: Right operand
+        """
+        self.first_operands.append(first_operand)
+        self.second_operands.append(second_operand)
+        self.operations.append(OPERATION_CODES[operation])
+        self.user_answers.append(NO_VALUE)
+        self.start_times.append(NO_START)
+        self.times_elapsed.append(NO_VALUE)
+        self.first_key_latencies.append(NO_VALUE)
+        self.think_times.append(NO_VALUE)
+
+    def toTasks(self) -> list[Task]:
+        return [view.toTask() for view in self]
+
+    def __len__(self):
+        return len(self.operations)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('TaskPool index out of range')
+        return TaskView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield TaskView(self, index)
+
+
+class TaskView:
+    """A `Task`-like view on one row of a `TaskPool`. It owns no data, only the pool and the row index."""
+    __slots__ = ('pool', 'index')
+
+    def __init__(self, pool: TaskPool, index: int):
+        self.pool = pool
+        self.index = index
+
+    @property
+    def task_string(self):
+        pool, index = self.pool, self.index
+        operation = OPERATION_SYMBOLS[pool.operations[index]]
+        return f'{pool.first_operands[index]} {operation} {pool.second_operands[index]}'
+
+    @property
+    def user_answer(self):
+        value = self.pool.user_answers[self.index]
+        if math.isnan(value):
+            return None
+        return int(value) if value == int(value) else value
+
+    @user_answer.setter
+    def user_answer(self, value):
+        self.pool.user_answers[self.index] = NO_VALUE if value is None else value
+
+    @property
+    def time_elapsed(self):
+        value = self.pool.times_elapsed[self.index]
+        return None if math.isnan(value) else value
+
+    @property
+    def first_key_latency(self):
+        value = self.pool.first_key_latencies[self.index]
+        return None if math.isnan(value) else value
+
+    @property
+    def think_time(self):
+        value = self.pool.think_times[self.index]
+        return None if math.isnan(value) else value
+
+    def solve(self):
+        pool, index = self.pool, self.index
+        first_operand, second_operand = pool.first_operands[index], pool.second_operands[index]
+        operation = pool.operations[index]
+        if operation == 0:
+            return first_operand + second_operand
+        if operation == 1:
+            return first_operand - second_operand
+        if operation == 2:
+            return first_operand * second_operand
+        result = first_operand / second_operand
+        if result == int(result):
+            return int(result)
+        return result
+
+    def isCorrect(self):
+        return self.user_answer == self.solve()
+
+    def startTimer(self):
+        pool, index = self.pool, self.index
+        pool.start_times[index] = time.perf_counter_ns()
+        pool.times_elapsed[index] = pool.first_key_latencies[index] = pool.think_times[index] = NO_VALUE
+
+    def keyPressed(self):
+        """Record a keystroke of the answer, see `Task.keyPressed`."""
+        pool, index = self.pool, self.index
+        if pool.start_times[index] == NO_START or not math.isnan(pool.times_elapsed[index]):
+            return
+        pool.think_times[index] = (time.perf_counter_ns() - pool.start_times[index]) / 1e9
+        if math.isnan(pool.first_key_latencies[index]):
+            pool.first_key_latencies[index] = pool.think_times[index]
+
+    def stopTimer(self):
+        self.pool.times_elapsed[self.index] = (time.perf_counter_ns() - self.pool.start_times[self.index]) / 1e9
+
+    def toTask(self) -> Task:
+        """Materialize a full `Task` object, e.g. for the GUI."""
+        task = Task(self.task_string)
+        task.user_answer = self.user_answer
+        task.time_elapsed = self.time_elapsed
+        if self.first_key_latency is not None:
+            task.first_key_ns = round(self.first_key_latency * 1e9)
+            task.last_key_ns = round(self.think_time * 1e9)
+        return task
+
+    def __str__(self):
+        pool, index = self.pool, self.index
+        operation = DISPLAY_SYMBOLS[pool.operations[index]]
+        return f'{pool.first_operands[index]} {operation} {pool.second_operands[index]} = '
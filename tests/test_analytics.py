@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from analytics import FactStatistics, LogAggregate, analyze, parseRange, splitRanges
+
+LINES = ['2024-01-31 10:00:00,123 INFO 7 × 8 =  56 54 False 3.21',
+         '2024-01-31 10:00:05,123 INFO 7 × 8 =  56 56 True 1.5 0.4 1.1',
+         '2024-02-01 09:00:00,000 INFO 3 + 4 =  7 7 True 75.0',
+         '2024-02-01 09:00:01,000 INFO 3 + 4 =  7 7 True 2.0\r',
+         'Traceback (most recent call last):',
+         '',
+         '2024-02-01 09:00:02,000 INFO 3 + 4 =  7 7 True not-a-number',
+         '2024-02-01 09:00:03,000 INFO 6 / 2 =  3 3 True 0.75']
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / 'py_log_2024.02.01_09-00-00.log'
+    path.write_bytes('\n'.join(LINES).encode())
+    return str(path)
+
+
+@pytest.mark.parametrize('q', [0.1, 0.5, 0.9])
+def test_quantile_is_within_half_a_step(q):
+    rng = random.Random(0)
+    times = sorted(rng.uniform(0.5, 20) for _ in range(2001))
+    statistics = FactStatistics()
+    for seconds in times:
+        statistics.add(True, seconds)
+    assert statistics.quantile(q) == pytest.approx(times[round(q * (len(times) - 1))], abs=0.05)
+
+
+def test_quantile_of_a_single_answer_is_not_biased_upward():
+    statistics = FactStatistics()
+    statistics.add(True, 12.5)
+    assert 12.5 <= statistics.quantile(0.5) < 12.6
+
+
+def test_slow_answers_overflow():
+    statistics = FactStatistics()
+    for seconds in (1.0, 61.0, 90.0):
+        statistics.add(True, seconds)
+    assert statistics.overflow == 2
+    assert 1.0 <= statistics.quantile(0.3) < 1.1
+    assert statistics.quantile(0.9) is None
+
+
+def test_parse_log(log_file):
+    aggregate = parseRange(log_file, 0, len(b'\n'.join(line.encode() for line in LINES)))
+    assert aggregate.invalid_lines == 2
+    rows = {row['fact']: row for row in aggregate.factRows()}
+    assert rows['7 × 8']['answers'] == 2 and rows['7 × 8']['errors'] == 1
+    assert rows['3 + 4']['over_limit'] == 1 and rows['3 + 4']['p90_time'] == '>60'
+    assert rows['6 ÷ 2']['operation'] == '÷'
+    assert [(row['operation'], row['day'], row['answers']) for row in aggregate.trendRows()] == \
+           [('+', '2024-02-01', 2), ('×', '2024-01-31', 2), ('÷', '2024-02-01', 1)]
+
+
+def test_ranges_give_the_same_result_as_the_whole_file(log_file):
+    whole = parseRange(*next(splitRanges([log_file])))
+    merged = LogAggregate()
+    for path, start, end in splitRanges([log_file], range_size=7):
+        merged.merge(parseRange(path, start, end))
+    assert merged.factRows() == whole.factRows()
+    assert merged.trendRows() == whole.trendRows()
+    assert merged.invalid_lines == whole.invalid_lines
+
+
+def test_analyze_directory(log_file, tmp_path):
+    aggregate = analyze([str(tmp_path)], workers=2)
+    assert sum(row['answers'] for row in aggregate.factRows()) == 5
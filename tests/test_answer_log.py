@@ -0,0 +1,39 @@
+import logging
+
+import pytest
+
+from answer_log import AnswerLogPipeline, flushLogs
+from exam import ExamSession
+from task import Task
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    root = logging.getLogger()
+    level = root.level
+    pipeline = AnswerLogPipeline(str(tmp_path / 'py_log_test.log'), batch_size=4).start()
+    yield pipeline
+    pipeline.stop()
+    root.setLevel(level)
+
+
+def test_records_are_written_in_order(pipeline):
+    for number in range(10):
+        logging.info('line %s', number)
+    flushLogs()
+    with open(pipeline.filename, encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    assert [line.split(' INFO ')[1] for line in lines] == [f'line {number}' for number in range(10)]
+
+
+def test_exam_answers_are_logged_like_format_log_line(pipeline):
+    session = ExamSession([Task('7 * 8'), Task('3 + 4')])
+    session.start()
+    session.answer(54)
+    session.answer(7)
+    pipeline.stop()
+    with open(pipeline.filename, encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    assert [line.split(' INFO ')[1] for line in lines] == [ExamSession.formatLogLine(task) for task, _ in
+                                                          session.answered]
+    assert ' 56 54 False ' in lines[0]
@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import pytest
+
+from exam_server import STREAM_LIMIT, ExamConnection, ExamProtocolError, handleClient
+
+
+def started(seed=1):
+    connection = ExamConnection()
+    response = connection.handle({'command': 'start', 'operation': 'multiplication', 'seed': seed})
+    return connection, response
+
+
+def test_exam_until_the_summary():
+    connection, response = started()
+    assert response['number'] == 1 and response['total'] == 36
+    while True:
+        task = connection.session.current_task
+        response = connection.handle({'command': 'answer', 'value': task.solve()})
+        assert response['correct']
+        if response.get('finished'):
+            break
+    assert response['summary']['correct'] == 36 and response['summary']['incorrect'] == 0
+
+
+def test_the_same_seed_gives_the_same_tasks():
+    assert started(7)[1]['task'] == started(7)[1]['task']
+
+
+@pytest.mark.parametrize('value', [True, False, None, [56], {'value': 56}, 'abc', 'nan', 'inf'])
+def test_non_numeric_values_are_rejected(value):
+    connection, _ = started()
+    with pytest.raises(ExamProtocolError):
+        connection.handle({'command': 'answer', 'value': value})
+    assert connection.session.current_task_number == 0
+
+
+@pytest.mark.parametrize('value', [56, 56.0, '56'])
+def test_numeric_values(value):
+    connection, _ = started()
+    task = connection.session.current_task
+    connection.handle({'command': 'answer', 'value': value})
+    assert task.user_answer == 56 and type(task.user_answer) is int
+
+
+@pytest.mark.parametrize('request_', [[], {'command': 'answer', 'value': 1}, {'command': 'start', 'operation': 'x'},
+                                      {'command': 'start', 'seed': '1'}, {'command': 'fly'}])
+def test_protocol_errors(request_):
+    with pytest.raises(ExamProtocolError):
+        ExamConnection().handle(request_)
+
+
+async def exchange(payload: bytes) -> list[dict]:
+    """Send the payload to a server on a free port and read all response lines until the server closes."""
+    server = await asyncio.start_server(handleClient, '127.0.0.1', 0, limit=STREAM_LIMIT)
+    async with server:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(payload)
+        writer.write_eof()
+        responses = [json.loads(line) for line in (await reader.read()).splitlines()]
+        writer.close()
+        return responses
+
+
+def test_protocol_over_tcp():
+    responses = asyncio.run(exchange(b'{"command": "start", "seed": 3}\nnot json\n{"command": "summary"}\n'))
+    assert 'task' in responses[0] and 'error' in responses[1] and 'summary' in responses[2]
+
+
+def test_oversized_line_gets_an_error_and_the_connection_is_closed():
+    responses = asyncio.run(exchange(b'{"command": "start"}\n' + b' ' * (STREAM_LIMIT + 1) + b'\n'
+                                     b'{"command": "summary"}\n'))
+    assert len(responses) == 2
+    assert 'task' in responses[0]
+    assert 'longer than' in responses[1]['error']
@@ -0,0 +1,31 @@
+import pytest
+
+from expression import Expression
+
+
+@pytest.mark.parametrize('string', ['1 + 2', '7 * 8', '18 / 4', '10 - 12', '(3 + 4) * 2', '2 * (10 - 3) / 7',
+                                    '-3 + +4', '1.5 + 2.25', '100 / 8 - 3 * 3'])
+def test_evaluates_like_eval(string):
+    assert Expression(string).evaluate() == eval(string)
+
+
+def test_comma_is_a_decimal_separator():
+    assert Expression('1,5 * 2').evaluate() == 3.0
+
+
+def test_operands_and_operators():
+    expression = Expression('(3 + 4) * 2')
+    assert expression.operands == [3, 4, 2]
+    assert expression.operators == ['+', '*']
+
+
+@pytest.mark.parametrize('string, fact', [('7 * 8', (7, '*', 8)), ('18 / 3', (18, '/', 3)),
+                                          ('1 + 2 + 3', None), ('1.5 + 2', None), ('-3', None)])
+def test_fact(string, fact):
+    assert Expression(string).fact() == fact
+
+
+@pytest.mark.parametrize('string', ['1 +', '(1 + 2', '1 + 2)', '1 2'])
+def test_syntax_errors(string):
+    with pytest.raises(SyntaxError):
+        Expression(string)
@@ -0,0 +1,59 @@
+import pytest
+
+import fact_matrix
+from fact_matrix import FactMatrix, FactCoverage
+from task import Task
+
+
+def test_results_match_solve():
+    matrix = FactMatrix(0, 20)
+    for string in ['7 * 8', '12 - 5', '3 + 0', '18 / 4', '12 / 3', '0 - 12']:
+        assert matrix.result(*Task(string).expression.fact()) == Task(string).solve()
+    assert matrix.result(5, '/', 0) is None
+    assert matrix.result(21, '+', 1) is None
+    assert matrix.result(1.5, '+', 1) is None
+    assert matrix.isCorrect(7, '*', 8, 56) and matrix.isCorrect(7, '*', 8, 54) is False
+
+
+def test_index_round_trip():
+    matrix = FactMatrix(2, 9)
+    for index in range(len(matrix)):
+        assert matrix.index(*matrix.fact(index)) == index
+
+
+def test_facts_with_answer():
+    facts = FactMatrix(1, 10).factsWithAnswer(12, '*')
+    assert facts == [(2, '*', 6), (3, '*', 4), (4, '*', 3), (6, '*', 2)]
+
+
+def test_empty_range():
+    with pytest.raises(ValueError):
+        FactMatrix(5, 4)
+
+
+def test_cache_file_is_reused_and_rebuilt_for_another_range(tmp_path):
+    cache_file = str(tmp_path / 'facts.bin')
+    FactMatrix(0, 10, cache_file)
+    assert FactMatrix(0, 10, cache_file).result(9, '*', 9) == 81
+    assert FactMatrix(0, 20, cache_file).result(19, '*', 19) == 361
+
+
+def test_coverage():
+    coverage = FactCoverage(FactMatrix(0, 10))
+    tasks = [Task('7 * 8'), Task('3 + 4'), Task('1.5 + 2')]
+    assert coverage.markTask(tasks[0]) and not coverage.markTask(tasks[2])
+    assert coverage.seenTask(tasks[0]) and not coverage.seenTask(tasks[1])
+    assert coverage.count() == 1
+    assert coverage.coverage(tasks[:2]) == 0.5
+    restored = FactCoverage(coverage.matrix, bytes(coverage))
+    assert restored.seen(7, '*', 8)
+    with pytest.raises(ValueError):
+        FactCoverage(coverage.matrix, b'\x00')
+
+
+def test_shared_matrix_is_used_by_solve(monkeypatch):
+    monkeypatch.setattr(fact_matrix, '_shared_matrix', None)
+    assert fact_matrix.getFactMatrix() is None
+    matrix = fact_matrix.useFactMatrix()
+    assert fact_matrix.getFactMatrix() is matrix
+    assert Task('7 * 8').solve() == 56 and Task('18 / 4').solve() == 4.5
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from bench_expressions import naiveExpressions
+from fact_matrix import FactMatrix, FactCoverage
+from generate import GenerateTasks, TASK_POOLS, generatePool, unseenFirst
+
+
+@pytest.mark.parametrize('operand_count, max_operand, max_result', [(2, 6, 20), (3, 5, 30), (4, 3, 12)])
+def test_pruned_expressions_match_generate_and_filter(operand_count, max_operand, max_result):
+    operands = list(range(1, max_operand + 1))
+    tasks = GenerateTasks().expressions(operands, operand_count, max_result=max_result, shuffle=False)
+    strings = [task.task_string for task in tasks]
+    assert len(strings) == len(set(strings))
+    assert set(strings) == naiveExpressions(operands, operand_count, '+-*/', 0, max_result)
+
+
+def test_sum_limit_matches_filtering():
+    summands = list(range(1, 11))
+    tasks = GenerateTasks().sum(summands, limit=10, shuffle=False)
+    expected = sorted({tuple(sorted((first, second))) for first in summands for second in summands
+                       if first + second <= 10})
+    assert [task.task_string for task in tasks] == [f'{first} + {second}' for first, second in expected]
+
+
+def test_difference_is_never_negative_or_zero():
+    tasks = GenerateTasks().difference(list(range(1, 11)), shuffle=False)
+    assert len(tasks) == 45
+    assert all(task.solve() > 0 for task in tasks)
+
+
+def test_division_is_exact():
+    tasks = GenerateTasks(random.Random(0)).division(list(range(2, 10)), shuffle=False)
+    assert all(type(task.solve()) is int for task in tasks)
+
+
+def test_sample_is_a_subset_of_the_pool():
+    generate = GenerateTasks(random.Random(5))
+    pool = {task.task_string for task in generate.iter_sum(list(range(1, 21)), limit=20)}
+    sample = [task.task_string for task in generate.iter_sum(list(range(1, 21)), limit=20, sample=30)]
+    assert len(sample) == len(set(sample)) == 30
+    assert set(sample) <= pool
+
+
+@pytest.mark.parametrize('name', TASK_POOLS)
+def test_the_same_seed_gives_the_same_pool(name):
+    first = [task.task_string for task in generatePool(name, rng=42)]
+    second = [task.task_string for task in generatePool(name, rng=random.Random(42))]
+    assert first == second
+
+
+def test_unseen_facts_come_first():
+    coverage = FactCoverage(FactMatrix(0, 10))
+    tasks = generatePool('multiplication', rng=1)
+    for task in tasks[:10]:
+        coverage.markTask(task)
+    unseen = [task.task_string for task in tasks[10:]]
+    unseenFirst(tasks, coverage)
+    assert [task.task_string for task in tasks[:len(unseen)]] == unseen
+    assert all(coverage.seenTask(task) for task in tasks[len(unseen):])
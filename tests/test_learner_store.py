@@ -0,0 +1,66 @@
+import sqlite3
+import time
+
+import pytest
+
+from learner_store import LearnerStore
+from task import Task
+
+DAY = time.mktime((2024, 3, 1, 12, 0, 0, 0, 0, -1))
+
+
+def answered(string, user_answer, seconds, at):
+    task = Task(string)
+    task.user_answer = user_answer
+    task.time_elapsed = seconds
+    return task, at
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LearnerStore(str(tmp_path / 'learner.db'), 'Anna')
+    yield store
+    store.close()
+
+
+def test_statistics_and_history(store):
+    store.recordAnswers([answered('7 * 8', 56, 2.0, DAY), answered('7 * 8', 54, 4.0, DAY + 60),
+                         answered('3 + 4', 7, 1.0, DAY + 86400)])
+    store.recordAnswers([answered('7 * 8', 56, 3.0, DAY + 86400 + 60)])
+    assert store.factStatistics()['7 * 8'] == (3, 2, 3.0, DAY + 86400 + 60)
+    assert [row[1:3] for row in store.factHistory('7 * 8')] == [(56, 1), (54, 0), (56, 1)]
+    assert [row[:3] for row in store.dailySummary()] == [('2024-03-01', 2, 1), ('2024-03-02', 2, 2)]
+    assert [row[1] for row in store.answersOfDay('2024-03-02')] == ['3 + 4', '7 * 8']
+    assert store.weakFacts() == ['7 * 8', '3 + 4']
+
+
+def test_learners_are_separated(store, tmp_path):
+    store.recordAnswers([answered('7 * 8', 56, 2.0, DAY)])
+    other = LearnerStore(store.path, 'Boris')
+    try:
+        other.recordAnswers([answered('2 * 2', 4, 1.0, DAY)])
+        assert list(other.factStatistics()) == ['2 * 2']
+        assert list(store.factStatistics()) == ['7 * 8']
+    finally:
+        other.close()
+
+
+def test_coverage_is_persisted(store):
+    assert store.coverage().count() == 0
+    store.recordAnswers([answered('7 * 8', 54, 2.0, DAY), answered('(1 + 2) * 3', 9, 2.0, DAY)])
+    reopened = LearnerStore(store.path, 'Anna')
+    try:
+        coverage = reopened.coverage()
+        assert coverage.seenTask(Task('7 * 8')) and coverage.count() == 1
+    finally:
+        reopened.close()
+
+
+def test_failed_exam_is_rolled_back(store):
+    task, at = answered('7 * 8', 56, 2.0, DAY)
+    task.user_answer = object()  # not a value SQLite can store
+    with pytest.raises(sqlite3.Error):
+        store.recordAnswers([answered('2 * 3', 6, 1.0, DAY), (task, at)])
+    assert store.factStatistics() == {}
+    store.recordAnswers([answered('2 * 3', 6, 1.0, DAY)])
+    assert list(store.factStatistics()) == ['2 * 3']
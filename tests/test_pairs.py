@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from pairs import UniqPairs
+
+
+def naivePairs(list1, list2, max_sum=None, distinct=False):
+    pairs = {tuple(sorted((first, second))) for first in list1 for second in list2}
+    return sorted(pair for pair in pairs
+                  if (max_sum is None or sum(pair) <= max_sum) and not (distinct and pair[0] == pair[1]))
+
+
+@pytest.mark.parametrize('list1, list2', [(range(1, 11), range(1, 11)),
+                                          (range(2, 10), [2, 3, 3, 12]),
+                                          ([5, 1, 9], range(4, 7)),
+                                          ([], range(3))])
+@pytest.mark.parametrize('max_sum', [None, 0, 7, 12])
+@pytest.mark.parametrize('distinct', [False, True])
+def test_pushed_down_constraints_match_filtering(list1, list2, max_sum, distinct):
+    pairs = UniqPairs(list(list1), list(list2), max_sum, distinct)
+    expected = naivePairs(list1, list2, max_sum, distinct)
+    assert list(pairs) == expected
+    assert len(pairs) == len(expected)
+    assert [pairs[rank] for rank in range(len(pairs))] == expected
+
+
+def test_rank_out_of_range():
+    pairs = UniqPairs([1, 2], [3])
+    with pytest.raises(IndexError):
+        pairs[len(pairs)]
+
+
+def test_random_ranks_are_a_permutation():
+    pairs = UniqPairs(range(1, 20), range(1, 20), max_sum=25)
+    assert sorted(pairs.randomRanks(random.Random(1))) == list(range(len(pairs)))
+
+
+def test_sample_is_distinct_and_within_constraints():
+    pairs = UniqPairs(range(1, 30), range(1, 30), max_sum=20, distinct=True)
+    sample = list(pairs.sample(50, random.Random(2)))
+    assert len(sample) == len(set(sample)) == 50
+    assert all(first < second and first + second <= 20 for first, second in sample)
+    assert len(list(pairs.sample(10 ** 6, random.Random(3)))) == len(pairs)
@@ -0,0 +1,57 @@
+import json
+import random
+
+from scheduler import SpacedRepetitionScheduler, factKey
+from task import Task
+
+
+def answer(task, correct=True, seconds=1.0):
+    task.user_answer = task.solve() if correct else -1
+    task.time_elapsed = seconds
+    return task
+
+
+def test_fact_key_is_shared_by_the_variants_of_a_fact():
+    assert factKey(Task('7 * 8')) == factKey(Task('8 * 7'))
+    assert factKey(Task('3 + 4')) == factKey(Task('4 + 3'))
+    assert factKey(Task('18 / 3')) == factKey(Task('18 / 6'))
+    assert factKey(Task('9 - 4')) != factKey(Task('9 - 5'))
+    assert factKey(Task('(1 + 2) * 3')) == '(1 + 2) * 3'
+
+
+def test_fast_correct_answers_master_the_pool():
+    tasks = [Task(f'{first} * {second}') for first in range(2, 5) for second in range(first, 5)]
+    scheduler = SpacedRepetitionScheduler(tasks, rng=random.Random(0))
+    asked = set()
+    while not scheduler.isMastered():
+        task = scheduler.nextTask()
+        asked.add(task.task_string)
+        scheduler.record(answer(task))
+    assert asked == {task.task_string for task in tasks}
+
+
+def test_wrong_answer_brings_the_fact_back_soon():
+    tasks = [Task(f'2 * {second}') for second in range(2, 12)]
+    scheduler = SpacedRepetitionScheduler(tasks, rng=random.Random(0))
+    failed = scheduler.nextTask()
+    scheduler.record(answer(failed, correct=False))
+    following = []
+    for _ in range(4):
+        task = scheduler.nextTask()
+        following.append(task.task_string)
+        scheduler.record(answer(task))
+    assert failed.task_string in following
+
+
+def test_state_is_kept_across_variants_and_pools(tmp_path):
+    state_file = tmp_path / 'state.json'
+    scheduler = SpacedRepetitionScheduler([Task('18 / 3'), Task('2 + 5')], state_file=state_file)
+    while not scheduler.isMastered():
+        scheduler.record(answer(scheduler.nextTask()))
+    scheduler.save()
+
+    # the other variant of the division fact, the sum is not in this pool but must not be lost
+    restored = SpacedRepetitionScheduler([Task('18 / 6')], state_file=state_file)
+    assert restored.isMastered()
+    restored.save()
+    assert set(json.loads(state_file.read_text())['facts']) == {factKey(Task('18 / 3')), factKey(Task('2 + 5'))}
@@ -0,0 +1,33 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from generate import GenerateTasks  # noqa: E402
+from task_array import TaskArray  # noqa: E402
+
+
+@pytest.mark.parametrize('method, args, kwargs', [('sum', [list(range(1, 11))], {'limit': 10}),
+                                                  ('difference', [list(range(1, 11))], {}),
+                                                  ('multiplication', [list(range(2, 10))], {})])
+def test_generators_match_generate_tasks(method, args, kwargs):
+    tasks = getattr(GenerateTasks(), method)(*args, shuffle=False, **kwargs)
+    task_array = getattr(TaskArray, method)(*args, shuffle=False, **kwargs)
+    assert sorted(task_array.strings()) == sorted(str(task) for task in tasks)
+
+
+def test_grading_matches_is_correct():
+    tasks = GenerateTasks().multiplication(list(range(2, 30)))
+    for number, task in enumerate(tasks):
+        task.user_answer = task.solve() + (number % 3 == 0)
+    task_array = TaskArray.fromTasks(tasks)
+    assert task_array.grade([task.user_answer for task in tasks]).tolist() == [task.isCorrect() for task in tasks]
+
+
+def test_division_answers_match_solve():
+    tasks = GenerateTasks().division(list(range(2, 10)))
+    assert TaskArray.fromTasks(tasks).answers().tolist() == [task.solve() for task in tasks]
+
+
+def test_wrong_number_of_answers():
+    with pytest.raises(ValueError):
+        TaskArray.multiplication([2, 3], shuffle=False).grade([1, 2, 3])
@@ -0,0 +1,23 @@
+from generate import generatePool
+from task_index import TaskIndex
+
+
+def test_indexes():
+    tasks = generatePool('multiplication', rng=3)
+    index = TaskIndex(tasks)
+    assert index.ordered == sorted(tasks, key=lambda task: task.sort_key)
+    assert sum(len(group) for group in index.by_first_operand.values()) == len(tasks)
+    assert list(index.by_operation) == ['*']
+    assert all(task.solve() == answer for answer, group in index.by_answer.items() for task in group)
+    assert len(index) == len(tasks)
+
+
+def test_errors_by_first_operand():
+    tasks = generatePool('multiplication', shuffle=False)
+    for task in tasks[:3]:
+        task.user_answer = -1
+        task.time_elapsed = 1.0
+    tasks[3].user_answer = tasks[3].solve()
+    tasks[3].time_elapsed = 1.0
+    first_operand = tasks[0].expression.operands[0]
+    assert TaskIndex(tasks).errorsByFirstOperand() == {first_operand: 3}
@@ -0,0 +1,39 @@
+import pytest
+
+from generate import GenerateTasks
+from task import Task
+from task_pool import TaskPool
+
+
+def test_round_trip():
+    tasks = GenerateTasks().division(list(range(2, 10)), shuffle=False)
+    tasks[0].user_answer = tasks[0].solve()
+    tasks[0].time_elapsed = 1.5
+    pool = TaskPool.fromTasks(tasks)
+    assert len(pool) == len(tasks)
+    assert [view.task_string for view in pool] == [task.task_string for task in tasks]
+    assert [view.solve() for view in pool] == [task.solve() for task in tasks]
+    copy = pool.toTasks()[0]
+    assert (copy.user_answer, copy.time_elapsed, copy.isCorrect()) == (tasks[0].user_answer, 1.5, True)
+    assert pool[-1].task_string == tasks[-1].task_string
+
+
+def test_decimal_operands_are_rejected():
+    with pytest.raises(ValueError, match='integer operands'):
+        TaskPool.fromTasks([Task('2 * 3'), Task('1.5 + 2')])
+
+
+def test_more_than_two_operands_are_rejected():
+    with pytest.raises(ValueError, match='two-operand'):
+        TaskPool.fromTasks([Task('1 + 2 + 3')])
+
+
+def test_answer_of_a_view():
+    pool = TaskPool()
+    pool.append(7, '*', 8)
+    view = pool[0]
+    assert view.user_answer is None and not view.isCorrect()
+    view.user_answer = 56
+    assert view.isCorrect()
+    with pytest.raises(IndexError):
+        pool[1]